@@ -0,0 +1,56 @@
+# app_modes_benchmark.py
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from main_dashboard import EXTRACTOR_APPS
+
+# Runs in a fresh interpreter: render each page once headlessly, report time and RSS
+_RUNNER = """
+import json, sys, time, psutil
+from streamlit.testing.v1 import AppTest
+results = []
+for path in sys.argv[1:]:
+    started = time.perf_counter()
+    app = AppTest.from_file(path, default_timeout=300)
+    app.session_state["hf_api_key"] = "benchmark"
+    app.run()
+    results.append({"page": path, "seconds": time.perf_counter() - started,
+                    "errors": [str(e.value) for e in app.exception]})
+print(json.dumps({"pages": results, "rss_mb": psutil.Process().memory_info().rss / 1024 / 1024}))
+"""
+
+def run_pages(paths):
+    """Render the given pages in one new Python process"""
+    started = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", _RUNNER, *paths], capture_output=True, text=True, check=True)
+    result = json.loads(output.stdout.strip().splitlines()[-1])
+    result["wall_seconds"] = time.perf_counter() - started
+    return result
+
+def measure(paths):
+    """Multi-process: one interpreter per extractor. Single-process: all pages in one interpreter."""
+    children = [run_pages([path]) for path in paths]
+    single = run_pages(paths)
+
+    print(f"{'mode':<16} {'processes':>9} {'startup s':>10} {'RSS MB':>8}")
+    print(f"{'multi-process':<16} {len(children):>9} {sum(c['wall_seconds'] for c in children):>10.1f} "
+          f"{sum(c['rss_mb'] for c in children):>8.0f}")
+    print(f"{'single-process':<16} {1:>9} {single['wall_seconds']:>10.1f} {single['rss_mb']:>8.0f}")
+    print("\nPer page (single-process, in load order):")
+    for page in single["pages"]:
+        errors = f"  ({len(page['errors'])} errors)" if page["errors"] else ""
+        print(f"  {page['page']:<24} {page['seconds']:>6.1f}s{errors}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare startup time and memory of multi-process and multipage modes")
+    parser.add_argument("pages", nargs="*", help="App files (default: the dashboard's extractors)")
+    args = parser.parse_args()
+    paths = args.pages or [app_file for app_file, _ in EXTRACTOR_APPS.values() if os.path.exists(app_file)]
+    measure(paths)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+# app_supervisor.py
+import atexit
+import logging
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+import psutil
+import requests
+
+logger = logging.getLogger(__name__)
+
+READY_TIMEOUT_SECONDS = float(os.environ.get("APP_READY_TIMEOUT", "60"))
+IDLE_TIMEOUT_SECONDS = float(os.environ.get("APP_IDLE_TIMEOUT", "900"))
+MONITOR_INTERVAL_SECONDS = 5.0
+MAX_RESTARTS = 3
+PORT_RANGE_SIZE = int(os.environ.get("APP_PORT_RANGE_SIZE", "50"))
+
+def port_is_free(port: int) -> bool:
+    """Try to bind the port; unlike a connect probe this never waits on a timeout"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        try:
+            s.bind(("", port))
+        except OSError:
+            return False
+    return True
+
+def get_ephemeral_port() -> int:
+    """A port the OS considers free right now"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("", 0))
+        return s.getsockname()[1]
+
+def get_available_port(start_port: int = 8601, skip: Iterable[int] = ()) -> int:
+    """First bindable port in [start_port, start_port + PORT_RANGE_SIZE), else an OS-assigned one"""
+    skip = set(skip)
+    for port in range(start_port, start_port + PORT_RANGE_SIZE):
+        if port not in skip and port_is_free(port):
+            return port
+    port = get_ephemeral_port()
+    while port in skip:
+        port = get_ephemeral_port()
+    return port
+
+class PortRegistry:
+    """Ports handed to children of this process.
+
+    A port stays reserved from allocation until release, so two launches
+    cannot both pick it in the gap before the first child has bound it.
+    """
+    def __init__(self):
+        self._owners: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def allocate(self, owner: str, preferred: int) -> int:
+        with self._lock:
+            port = get_available_port(preferred, skip=self._owners)
+            self._owners[port] = owner
+            return port
+
+    def release(self, port: Optional[int]):
+        with self._lock:
+            self._owners.pop(port, None)
+
+    def allocations(self) -> Dict[int, str]:
+        with self._lock:
+            return dict(self._owners)
+
+PORT_REGISTRY = PortRegistry()
+
+class ManagedApp:
+    """One supervised `streamlit run` child"""
+    def __init__(self, name: str, app_file: str, base_port: int):
+        self.name = name
+        self.app_file = app_file
+        self.base_port = base_port
+        self.port: Optional[int] = None
+        self.process: Optional[subprocess.Popen] = None
+        self.started_at = 0.0
+        self.last_active = 0.0
+        self.restarts = 0
+        self.status = "stopped"  # stopped / starting / running / crashed / idle-stopped
+        self._ps: Optional[psutil.Process] = None
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def mark_running(self):
+        self.status = "running"
+        # A healthy start ends the crash streak: MAX_RESTARTS limits consecutive failed starts
+        self.restarts = 0
+
+    def stats(self) -> dict:
+        stats = {"name": self.name, "status": self.status, "port": self.port, "restarts": self.restarts,
+                 "pid": None, "rss_mb": None, "cpu_percent": None, "uptime_s": None}
+        if not self.is_alive():
+            return stats
+        try:
+            if self._ps is None or self._ps.pid != self.process.pid:
+                self._ps = psutil.Process(self.process.pid)
+                self._ps.cpu_percent(None)  # prime; the next call reports usage since now
+            with self._ps.oneshot():
+                stats.update(pid=self._ps.pid, rss_mb=self._ps.memory_info().rss / 1024 / 1024,
+                             cpu_percent=self._ps.cpu_percent(None), uptime_s=time.time() - self.started_at)
+        except psutil.Error:
+            pass
+        return stats
+
+    def client_connections(self) -> int:
+        """Established browser connections to the child's port"""
+        try:
+            process = psutil.Process(self.process.pid)
+            connections = process.net_connections() if hasattr(process, "net_connections") else process.connections()
+        except (psutil.Error, AttributeError):
+            return 0
+        return sum(1 for c in connections if c.status == psutil.CONN_ESTABLISHED and c.laddr and c.laddr.port == self.port)
+
+class AppSupervisor:
+    """Starts each extractor at most once, restarts crashes and stops idle children.
+
+    Lives for the whole dashboard process (st.cache_resource), so reruns
+    and new sessions reuse running children instead of spawning more.
+    """
+    def __init__(self, apps: Dict[str, tuple], idle_timeout: float = IDLE_TIMEOUT_SECONDS,
+                 ports: Optional[PortRegistry] = None):
+        self.apps = {name: ManagedApp(name, app_file, base_port) for name, (app_file, base_port) in apps.items()}
+        self.idle_timeout = idle_timeout
+        self.ports = ports or PORT_REGISTRY
+        self._lock = threading.RLock()
+        threading.Thread(target=self._monitor, daemon=True, name="app-supervisor").start()
+        atexit.register(self.stop_all)
+
+    def _spawn(self, app: ManagedApp):
+        # Caller holds self._lock. Prefer the previous port so open browser tabs reconnect after a restart;
+        # the registry keeps it reserved until the child exits.
+        app.port = self.ports.allocate(app.name, app.port or app.base_port)
+        app.process = subprocess.Popen([
+            sys.executable, "-m", "streamlit", "run",
+            app.app_file,
+            "--server.port", str(app.port),
+            "--server.headless", "true",
+            "--browser.serverAddress", "localhost"
+        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        app.started_at = app.last_active = time.time()
+        app.status = "starting"
+        logger.info(f"Started {app.name} (pid {app.process.pid}) on port {app.port}")
+
+    def ensure_running(self, name: str) -> ManagedApp:
+        """Reuse the running child or start one; does not wait for readiness"""
+        with self._lock:
+            app = self.apps[name]
+            if not app.is_alive():
+                app.restarts = 0
+                self._spawn(app)
+            app.last_active = time.time()
+            return app
+
+    def wait_ready(self, name: str, timeout: float = READY_TIMEOUT_SECONDS) -> bool:
+        """Poll the child's health endpoint until it answers"""
+        app = self.apps[name]
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if not app.is_alive():
+                return False
+            try:
+                if requests.get(f"http://localhost:{app.port}/_stcore/health", timeout=1).status_code == 200:
+                    app.mark_running()
+                    return True
+            except requests.RequestException:
+                pass
+            time.sleep(0.2)
+        return False
+
+    def stop(self, name: str, status: str = "stopped"):
+        with self._lock:
+            app = self.apps[name]
+            if app.is_alive():
+                app.process.terminate()
+                try:
+                    app.process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    app.process.kill()
+            app.process = None
+            app.status = status
+            self.ports.release(app.port)
+
+    def stop_all(self):
+        for name in self.apps:
+            self.stop(name)
+
+    def stats(self) -> Dict[str, dict]:
+        with self._lock:
+            return {name: app.stats() for name, app in self.apps.items()}
+
+    def _monitor(self):
+        while True:
+            time.sleep(MONITOR_INTERVAL_SECONDS)
+            with self._lock:
+                for app in self.apps.values():
+                    if app.process is None:
+                        continue
+                    if not app.is_alive():
+                        self._handle_crash(app)
+                    elif app.status == "starting":
+                        self._probe(app)
+                    elif app.client_connections():
+                        app.last_active = time.time()
+                    elif time.time() - app.last_active > self.idle_timeout:
+                        logger.info(f"Stopping idle {app.name}")
+                        self.stop(app.name, status="idle-stopped")
+
+    def _probe(self, app: ManagedApp):
+        try:
+            if requests.get(f"http://localhost:{app.port}/_stcore/health", timeout=0.5).status_code == 200:
+                app.mark_running()
+        except requests.RequestException:
+            pass
+
+    def _handle_crash(self, app: ManagedApp):
+        logger.warning(f"{app.name} exited with code {app.process.returncode}")
+        # Exiting right after start usually means something else took the port; _spawn picks another
+        self.ports.release(app.port)
+        if app.restarts >= MAX_RESTARTS:
+            app.process = None
+            app.status = "crashed"
+            return
+        app.restarts += 1
+        self._spawn(app)
@@ -0,0 +1,134 @@
+# chat_memory.py
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from langchain.memory import ConversationBufferMemory
+from langchain.memory.chat_memory import BaseChatMemory
+from langchain_core.messages import BaseMessage, SystemMessage, get_buffer_string
+from pydantic import PrivateAttr
+
+from llm_broker import PRIORITY_BULK, get_broker, llm_model_key
+
+logger = logging.getLogger(__name__)
+
+CHAT_MEMORY_MODE = os.environ.get("CHAT_MEMORY_MODE", "bounded")
+CHAT_MEMORY_WINDOW = int(os.environ.get("CHAT_MEMORY_WINDOW", "4"))
+CHAT_MEMORY_MAX_TOKENS = int(os.environ.get("CHAT_MEMORY_MAX_TOKENS", "600"))
+# Messages awaiting summary; also the most folded into one summary prompt
+CHAT_MEMORY_MAX_PENDING = int(os.environ.get("CHAT_MEMORY_MAX_PENDING", "16"))
+
+SUMMARY_PROMPT = """Progressively summarize the conversation, adding onto the previous summary and returning a new summary of at most five sentences.
+
+Current summary:
+{summary}
+
+New lines of conversation:
+{new_lines}
+
+New summary:"""
+
+# Summaries from every session share a small pool so they never block a turn
+_summary_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="chat-summary")
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) for budget checks"""
+    return len(text) // 4 + 1
+
+class BoundedConversationMemory(BaseChatMemory):
+    """Sliding window of recent turns plus a rolling summary of older ones.
+
+    Turns that fall out of the window are summarised by the LLM on a
+    background thread; until that finishes they are kept verbatim. The
+    history handed to the chain never exceeds max_tokens, so per-turn
+    latency stays flat however long the conversation runs.
+    """
+    llm: Any
+    memory_key: str = "chat_history"
+    window_turns: int = CHAT_MEMORY_WINDOW
+    max_tokens: int = CHAT_MEMORY_MAX_TOKENS
+    summary: str = ""
+    _pending: List[BaseMessage] = PrivateAttr(default_factory=list)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _refreshing: bool = PrivateAttr(default=False)
+    _generation: int = PrivateAttr(default=0)  # bumped by clear() so in-flight refreshes are discarded
+
+    @property
+    def memory_variables(self) -> List[str]:
+        return [self.memory_key]
+
+    def save_context(self, inputs: Dict[str, Any], outputs: Dict[str, str]) -> None:
+        super().save_context(inputs, outputs)
+        with self._lock:
+            messages = self.chat_memory.messages
+            overflow = len(messages) - 2 * self.window_turns
+            if overflow <= 0:
+                return
+            self._pending.extend(messages[:overflow])
+            self.chat_memory.messages = messages[overflow:]
+            if self._refreshing:
+                return
+            self._refreshing = True
+        _summary_executor.submit(self._refresh_summary)
+
+    def _refresh_summary(self):
+        """Fold pending turns into the summary; loops until nothing is pending"""
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._refreshing = False
+                    return
+                batch = self._pending[:CHAT_MEMORY_MAX_PENDING]
+                summary = self.summary
+                generation = self._generation
+            prompt = SUMMARY_PROMPT.format(summary=summary or "(none)", new_lines=get_buffer_string(batch))
+            try:
+                # Queued behind interactive chat for the same model
+                result = get_broker().submit(llm_model_key(self.llm), lambda: self.llm.invoke(prompt),
+                                             priority=PRIORITY_BULK)
+                new_summary = getattr(result, "content", result).strip()
+            except Exception as e:
+                logger.warning(f"Conversation summary refresh failed: {e}")
+                with self._lock:
+                    # Keep the newest turns verbatim for the next attempt; older ones would
+                    # be the first dropped by the token cap anyway
+                    del self._pending[:-CHAT_MEMORY_MAX_PENDING]
+                    self._refreshing = False
+                return
+            with self._lock:
+                if self._generation != generation:
+                    continue  # cleared while summarising
+                self.summary = new_summary
+                del self._pending[:len(batch)]
+
+    def load_memory_variables(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            summary = self.summary
+            messages = list(self._pending) + list(self.chat_memory.messages)
+
+        # Drop the oldest verbatim turns first, then trim the summary itself
+        budget = self.max_tokens - (estimate_tokens(summary) if summary else 0)
+        while messages and sum(estimate_tokens(m.content) for m in messages) > max(budget, 0):
+            messages.pop(0)
+        if summary and estimate_tokens(summary) > self.max_tokens:
+            summary = summary[-self.max_tokens * 4:]
+
+        history = ([SystemMessage(content=f"Summary of earlier conversation: {summary}")] if summary else []) + messages
+        if self.return_messages:
+            return {self.memory_key: history}
+        return {self.memory_key: get_buffer_string(history)}
+
+    def clear(self) -> None:
+        super().clear()
+        with self._lock:
+            self.summary = ""
+            self._pending.clear()
+            self._generation += 1
+
+def make_memory(llm, output_key: str = "answer") -> BaseChatMemory:
+    """Bounded memory by default; CHAT_MEMORY_MODE=buffer restores the unbounded buffer"""
+    if CHAT_MEMORY_MODE == "buffer":
+        return ConversationBufferMemory(memory_key="chat_history", return_messages=True, output_key=output_key)
+    return BoundedConversationMemory(llm=llm, memory_key="chat_history", return_messages=True, output_key=output_key)
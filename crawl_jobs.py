@@ -0,0 +1,165 @@
+# crawl_jobs.py
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+from site_crawler import CrawlEvent
+
+logger = logging.getLogger(__name__)
+
+MAX_FINISHED_JOBS = int(os.environ.get("CRAWL_MAX_FINISHED_JOBS", "20"))
+ACTIVE_STATUSES = ("queued", "running", "paused", "summarizing")
+
+class CrawlCancelled(Exception):
+    """Raised inside the crawl at its next checkpoint after the job is cancelled"""
+
+class CrawlJob:
+    """One background website crawl: live counters, pause/cancel controls and partial results.
+
+    The crawl thread only publishes CrawlEvents to `events`; counters, log
+    and partial pages are built by draining that queue when the UI reads them.
+    """
+    def __init__(self, url: str, max_pages: int, depth: int):
+        self.job_id = uuid.uuid4().hex[:8]
+        self.url = url
+        self.max_pages = max_pages
+        self.depth = depth
+        self.status = "queued"  # queued / running / paused / summarizing / done / cancelled / failed
+        self.counters = {"queued": 0, "fetched": 0, "failed": 0, "bytes": 0}
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.messages = deque(maxlen=50)
+        self.result: Optional[dict] = None
+        self.summary: Optional[str] = None
+        self.error: Optional[str] = None
+        self._main_page: Optional[dict] = None
+        self._links: List[dict] = []
+        self._pages: Dict[str, dict] = {}
+        self.events: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._resume = threading.Event()
+        self._resume.set()
+        self._cancel = threading.Event()
+
+    # Controls, called from the UI
+    def pause(self):
+        if self.status == "running":
+            self._resume.clear()
+            self.status = "paused"
+
+    def resume(self):
+        if self.status == "paused":
+            self.status = "running"
+            self._resume.set()
+
+    def cancel(self):
+        self._cancel.set()
+        self._resume.set()
+
+    # Hooks, called from the crawl
+    def checkpoint(self):
+        """Block while paused; raise CrawlCancelled once cancelled"""
+        self._resume.wait()
+        if self._cancel.is_set():
+            raise CrawlCancelled()
+
+    # Views, called from the UI
+    def drain(self):
+        """Apply the events published since the last call"""
+        with self._lock:
+            while True:
+                try:
+                    event = self.events.get_nowait()
+                except queue.Empty:
+                    return
+                self._apply(event)
+
+    def _apply(self, event: CrawlEvent):
+        # Caller holds self._lock
+        if event.kind in ("main", "page"):
+            self.counters["failed" if event.page["status"] == "error" else "fetched"] += 1
+            self.counters["bytes"] += event.page["bytes"]
+            if event.kind == "main":
+                self._main_page = event.page
+                self._links = event.links
+            elif event.page["content"]:
+                self._pages[event.url] = event.page
+        elif event.kind == "failed":
+            self.counters["failed"] += 1
+        elif event.kind == "queued":
+            self.counters["queued"] = event.queued
+        if event.message:
+            self.messages.append((time.strftime("%H:%M:%S", time.localtime(event.at)), event.message))
+
+    @property
+    def active(self) -> bool:
+        return self.status in ACTIVE_STATUSES
+
+    def pages_per_second(self) -> float:
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        return self.counters["fetched"] / elapsed if elapsed > 0 else 0.0
+
+    def partial(self) -> Optional[dict]:
+        """Main page, links and the pages fetched so far; None until the main page is in"""
+        self.drain()
+        with self._lock:
+            if self._main_page is None:
+                return None
+            return {"main_page": self._main_page, "links": list(self._links), "pages": dict(self._pages)}
+
+    def snapshot(self) -> dict:
+        self.drain()
+        with self._lock:
+            counters = dict(self.counters)
+            messages = list(self.messages)
+        return {"job_id": self.job_id, "url": self.url, "status": self.status, "counters": counters,
+                "pages_per_second": self.pages_per_second(), "max_pages": self.max_pages,
+                "elapsed": (self.finished_at or time.time()) - self.started_at,
+                "messages": messages, "error": self.error}
+
+class CrawlJobManager:
+    """Process-wide registry of crawl jobs, each running on its own daemon thread"""
+    def __init__(self):
+        self._jobs: Dict[str, CrawlJob] = {}
+        self._lock = threading.Lock()
+
+    def start(self, job: CrawlJob, target: Callable[[CrawlJob], None]) -> CrawlJob:
+        with self._lock:
+            self._prune()
+            self._jobs[job.job_id] = job
+        threading.Thread(target=self._run, args=(job, target), daemon=True, name=f"crawl-{job.job_id}").start()
+        return job
+
+    def get(self, job_id: Optional[str]) -> Optional[CrawlJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[CrawlJob]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def _run(self, job: CrawlJob, target: Callable[[CrawlJob], None]):
+        job.status = "running"
+        try:
+            target(job)
+            job.status = "done"
+        except CrawlCancelled:
+            job.status = "cancelled"
+            job.events.put(CrawlEvent("log", message="Cancelled"))
+        except Exception as e:
+            logger.exception(f"Crawl {job.job_id} failed")
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+
+    def _prune(self):
+        # Caller holds self._lock
+        finished = sorted((job for job in self._jobs.values() if not job.active), key=lambda job: job.started_at)
+        for job in finished[:max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+            del self._jobs[job.job_id]
@@ -0,0 +1,136 @@
+# embedding_pipeline.py
+import logging
+import os
+import queue
+import threading
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from langchain_community.vectorstores import FAISS
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_BATCH_SIZE = int(os.environ.get("EMBEDDING_BATCH_SIZE", "64"))
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+_END_OF_STREAM = object()
+
+@lru_cache(maxsize=2)
+def load_embeddings(model_name: str = EMBEDDING_MODEL):
+    """One embedding model per process, shared by every app page and session; failures are not cached"""
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+    embeddings = HuggingFaceEmbeddings(model_name=model_name)
+    # Process-wide setting, so once with the model rather than on every build
+    use_all_cpu_cores()
+    return embeddings
+
+def use_all_cpu_cores():
+    """Let torch-backed encoders use every core for batched inference"""
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(os.cpu_count() or 1)
+
+def _produce_batches(documents: Iterable, batch_size: int, batches: queue.Queue, stop_event: threading.Event):
+    batch = []
+    try:
+        for document in documents:
+            if stop_event.is_set():
+                return
+            batch.append(document)
+            if len(batch) >= batch_size:
+                batches.put(batch)
+                batch = []
+        if batch:
+            batches.put(batch)
+    except Exception as e:
+        batches.put(e)
+    finally:
+        batches.put(_END_OF_STREAM)
+
+def _add_rows(vectorstore: "FAISS", rows: List[tuple]):
+    vectorstore.add_embeddings(
+        [(text, vector) for text, vector, _ in rows],
+        metadatas=[metadata for _, _, metadata in rows]
+    )
+
+def _create_vectorstore(embeddings, rows: List[tuple], index_type: str, n_vectors: int) -> "FAISS":
+    from vector_index import create_index, empty_vectorstore, train_index
+    index = create_index(index_type, len(rows[0][1]), n_vectors)
+    if not index.is_trained:
+        train_index(index, np.array([vector for _, vector, _ in rows], dtype="float32"))
+    vectorstore = empty_vectorstore(embeddings, index)
+    _add_rows(vectorstore, rows)
+    return vectorstore
+
+def build_vectorstore(documents: Iterable, embeddings, batch_size: int = EMBEDDING_BATCH_SIZE,
+                      total_hint: Optional[int] = None,
+                      progress_callback: Optional[Callable[[int, Optional[int], float], None]] = None) -> Tuple[Optional["FAISS"], List[str]]:
+    """Embed documents in batches and grow a FAISS index incrementally.
+
+    Documents are pulled from the (possibly lazy) iterable on a producer
+    thread, so chunking overlaps with encoding. Encoding stays on the calling
+    thread so progress_callback may safely update Streamlit widgets; it
+    receives (embedded, total_hint, chunks_per_second) after each batch.
+    The FAISS index type is picked from total_hint; IVF-PQ holds vectors
+    back until it has a large enough sample to train on.
+    """
+    from vector_index import choose_index_type, ivfpq_training_size
+
+    batches = queue.Queue(maxsize=4)
+    stop_event = threading.Event()
+    producer = threading.Thread(
+        target=_produce_batches, args=(iter(documents), batch_size, batches, stop_event), daemon=True
+    )
+    producer.start()
+
+    n_expected = total_hint or 0
+    index_type = choose_index_type(n_expected)
+    training_size = ivfpq_training_size(n_expected) if index_type == "ivfpq" else 0
+    buffered: List[tuple] = []
+
+    vectorstore = None
+    texts: List[str] = []
+    started = time.time()
+    try:
+        while True:
+            batch = batches.get()
+            if batch is _END_OF_STREAM:
+                break
+            if isinstance(batch, Exception):
+                raise batch
+
+            batch_texts = [document.page_content for document in batch]
+            vectors = embeddings.embed_documents(batch_texts)
+            rows = list(zip(batch_texts, vectors, [document.metadata for document in batch]))
+            if vectorstore is None:
+                buffered.extend(rows)
+                if len(buffered) >= training_size:
+                    vectorstore = _create_vectorstore(embeddings, buffered, index_type, max(n_expected, len(buffered)))
+                    buffered = []
+            else:
+                _add_rows(vectorstore, rows)
+            texts.extend(batch_texts)
+
+            if progress_callback:
+                elapsed = time.time() - started
+                progress_callback(len(texts), total_hint, len(texts) / elapsed if elapsed else 0.0)
+    finally:
+        stop_event.set()
+        # Unblock the producer if it is waiting on a full queue
+        while producer.is_alive():
+            try:
+                batches.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+    if vectorstore is None and buffered:
+        # Corpus turned out too small to train IVF-PQ
+        vectorstore = _create_vectorstore(embeddings, buffered, "hnsw", len(buffered))
+
+    logger.info(f"Embedded {len(texts)} chunks into a {index_type} index in {time.time() - started:.1f}s")
+    return vectorstore, texts
@@ -1,39 +1,61 @@
 import streamlit as st
 import time
-from bs4 import BeautifulSoup
-from langchain.text_splitter import CharacterTextSplitter
-from langchain.embeddings import SentenceTransformerEmbeddings
-from langchain.vectorstores import FAISS
-from langchain.memory import ConversationBufferMemory
-from langchain.chains import ConversationalRetrievalChain
-from langchain.schema import Document
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from langchain_community.llms.ollama import Ollama
 import re
-import requests
 import subprocess
 import os
-import json
 from datetime import datetime
 from typing import List
 import logging
+import psutil
+from facebook_graphql import GraphQLFeedCapture, decode_performance_entries
+from post_store import PostStore, make_group_id, make_post_id
+from post_filter import PostFilter, load_excluded_phrases
+from embedding_pipeline import EMBEDDING_BATCH_SIZE, build_vectorstore
+from import_preloader import render_import_report, start_preloader
+from llm_broker import render_queue_status, submit_chat
+from ollama_models import DEFAULT_MODELS, OLLAMA_KEEP_ALIVE, get_status_service, release_session_model, render_model_lifecycle
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# URL patterns blocked in lean-loading mode (images, media, fonts)
+LEAN_BLOCKED_URL_PATTERNS = [
+    "*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.svg*", "*.ico*",
+    "*.mp4*", "*.webm*", "*.m4a*", "*.mp3*", "*.m3u8*", "*.mpd*",
+    "*.woff*", "*.ttf*", "*.otf*", "*.eot*"
+]
+
+# Navigation and UI text; override per deployment with POST_FILTER_PHRASES
+EXCLUDED_PHRASES = [
+    'facebook', 'login', 'sign up', 'password', 'email',
+    'cookie', 'privacy', 'terms', 'menu', 'navigation',
+    'home', 'search', 'notification', 'messenger', 'watch',
+    'marketplace', 'groups', 'pages', 'events'
+]
+
+# Imported on first use (selenium when extracting, LangChain when building the chatbot),
+# and in the background once the first page has rendered
+HEAVY_MODULES = (
+    "selenium.webdriver", "post_chunker", "vector_index", "langchain.chains", "langchain_community.llms.ollama",
+    "langchain.embeddings", "reranker", "chat_memory", "question_router", "sentence_transformers"
+)
+
 class FacebookGroupExtractor:
-    def __init__(self):
+    def __init__(self, lean_mode: bool = False):
         self.driver = None
         self.wait = None
         self.is_logged_in = False
+        self.lean_mode = lean_mode
+        self.load_metrics = {"bytes_transferred": 0, "pages_loaded": 0, "started_at": None}
+        self.post_filter = PostFilter(load_excluded_phrases(EXCLUDED_PHRASES), min_length=50, min_words=8)
         
     def setup_driver(self):
         """Setup Chrome driver for manual login"""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.support.ui import WebDriverWait
+
         chrome_options = Options()
         chrome_options.add_argument("--start-maximized")
         chrome_options.add_argument("--disable-gpu")
@@ -46,8 +68,23 @@ class FacebookGroupExtractor:
         chrome_options.add_argument("--ignore-certificate-errors")
         chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
         
+        # Performance log feeds the bytes-transferred metric
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        
+        if self.lean_mode:
+            # Only post text is read, so skip images, video and autoplay
+            chrome_options.add_argument("--autoplay-policy=user-gesture-required")
+            chrome_options.add_argument("--mute-audio")
+            chrome_options.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2
+            })
+            chrome_options.page_load_strategy = "eager"
+        
         try:
             self.driver = webdriver.Chrome(options=chrome_options)
+            if self.lean_mode:
+                self.driver.execute_cdp_cmd("Network.enable", {})
+                self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URL_PATTERNS})
             self.wait = WebDriverWait(self.driver, 25)
             return True
         except Exception as e:
@@ -81,6 +118,8 @@ class FacebookGroupExtractor:
     
     def check_login_status(self):
         """Check if user is logged in"""
+        from selenium.webdriver.common.by import By
+
         try:
             # Check for login indicators
             login_indicators = [
@@ -111,7 +150,7 @@ class FacebookGroupExtractor:
             logger.error(f"Login check error: {str(e)}")
             return False
     
-    def extract_group_data(self, group_url: str, max_scrolls: int = 10) -> dict:
+    def extract_group_data(self, group_url: str, max_scrolls: int = 10, capture_mode: str = "dom") -> dict:
         """Extract data from Facebook group after manual login"""
         try:
             if not self.is_logged_in:
@@ -123,7 +162,10 @@ class FacebookGroupExtractor:
             if '?' in group_url:
                 group_url = group_url.split('?')[0]
             
+            self._reset_load_metrics()
+            self.post_filter.rejections.clear()
             self.driver.get(group_url)
+            self.load_metrics["pages_loaded"] += 1
             time.sleep(5)
             
             # Check if we have access to the group
@@ -134,13 +176,23 @@ class FacebookGroupExtractor:
             group_info = self._extract_group_info()
             
             # Scroll and extract posts
-            posts_data = self._scroll_and_extract_posts(max_scrolls)
+            if capture_mode == "network":
+                posts_data = self._scroll_and_capture_graphql(max_scrolls)
+                if not posts_data:
+                    st.warning("⚠️ No GraphQL feed data captured, falling back to DOM extraction")
+                    posts_data = self._scroll_and_extract_posts(max_scrolls)
+            else:
+                posts_data = self._scroll_and_extract_posts(max_scrolls)
             
             return {
                 "group_info": group_info,
+                "group_url": group_url,
+                "group_id": make_group_id(group_url),
                 "posts": posts_data,
                 "extraction_time": datetime.now().isoformat(),
                 "total_posts": len(posts_data),
+                "load_metrics": self.get_load_metrics(),
+                "filter_rejections": self.post_filter.rejection_report(),
                 "status": "success"
             }
             
@@ -150,6 +202,8 @@ class FacebookGroupExtractor:
     
     def _handle_cookies(self):
         """Handle cookie consent"""
+        from selenium.webdriver.common.by import By
+
         try:
             cookie_selectors = [
                 "button[data-testid='cookie-policy-manage-dialog-accept-button']",
@@ -176,6 +230,8 @@ class FacebookGroupExtractor:
     
     def _verify_group_access(self) -> bool:
         """Verify we can access the group"""
+        from selenium.webdriver.common.by import By
+
         try:
             # Check for group-specific elements
             group_indicators = [
@@ -212,6 +268,8 @@ class FacebookGroupExtractor:
     
     def _extract_group_info(self) -> dict:
         """Extract group information"""
+        from selenium.webdriver.common.by import By
+
         group_info = {}
         try:
             # Get group name
@@ -274,6 +332,7 @@ class FacebookGroupExtractor:
     def _scroll_and_extract_posts(self, max_scrolls: int) -> List[dict]:
         """Scroll and extract posts with multiple strategies"""
         all_posts = []
+        seen_ids = set()
         last_height = self.driver.execute_script("return document.body.scrollHeight")
         
         for scroll_iteration in range(max_scrolls):
@@ -282,14 +341,19 @@ class FacebookGroupExtractor:
             # Extract posts from current view
             current_posts = self._extract_posts_from_current_page()
             
-            # Add new posts
+            # Add new posts - exact repeats are an ID lookup, near-duplicates need similarity
             for post in current_posts:
+                if post["post_id"] in seen_ids:
+                    continue
                 if not self._is_duplicate_post(post, all_posts):
                     all_posts.append(post)
+                    seen_ids.add(post["post_id"])
             
             # Scroll down
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            self.load_metrics["pages_loaded"] += 1
             time.sleep(4)
+            self._drain_performance_log()
             
             # Check if we've reached the end
             new_height = self.driver.execute_script("return document.body.scrollHeight")
@@ -300,6 +364,28 @@ class FacebookGroupExtractor:
         
         return all_posts
     
+    def _scroll_and_capture_graphql(self, max_scrolls: int) -> List[dict]:
+        """Scroll the feed and parse posts from intercepted GraphQL responses"""
+        capture = GraphQLFeedCapture(self.driver)
+        capture.process_events(self._drain_performance_log())
+        last_height = self.driver.execute_script("return document.body.scrollHeight")
+        
+        for scroll_iteration in range(max_scrolls):
+            st.info(f"📡 Capturing feed... ({scroll_iteration + 1}/{max_scrolls}, {len(capture.posts)} posts)")
+            
+            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            self.load_metrics["pages_loaded"] += 1
+            time.sleep(4)
+            capture.process_events(self._drain_performance_log())
+            
+            new_height = self.driver.execute_script("return document.body.scrollHeight")
+            if new_height == last_height:
+                st.success("✅ Reached end of content")
+                break
+            last_height = new_height
+        
+        return capture.get_posts()
+    
     def _extract_posts_from_current_page(self) -> List[dict]:
         """Extract posts using multiple strategies"""
         posts = []
@@ -318,24 +404,33 @@ class FacebookGroupExtractor:
         
         return posts
     
+    def _read_valid_elements(self, elements) -> List[tuple]:
+        """Read element texts and filter the whole batch in one pass"""
+        candidates = []
+        for i, element in enumerate(elements):
+            try:
+                candidates.append((element, element.text.strip()))
+            except Exception as e:
+                logger.debug(f"Error reading element {i}: {str(e)}")
+        
+        reasons = self.post_filter.check_batch([text for _, text in candidates])
+        return [candidate for candidate, reason in zip(candidates, reasons) if reason is None]
+    
     def _extract_by_xpath(self, xpath: str, source: str) -> List[dict]:
         """Extract posts using XPath selector"""
+        from selenium.webdriver.common.by import By
+
         posts = []
         try:
             elements = self.driver.find_elements(By.XPATH, xpath)
             
-            for i, element in enumerate(elements):
+            for element, post_text in self._read_valid_elements(elements):
                 try:
-                    # Get the entire post text
-                    post_text = element.text.strip()
-                    
-                    if self._is_valid_post(post_text):
-                        # Try to get more structured data
-                        post_data = self._parse_structured_post(element, post_text, source)
-                        posts.append(post_data)
-                        
+                    # Try to get more structured data
+                    post_data = self._parse_structured_post(element, post_text, source)
+                    posts.append(post_data)
                 except Exception as e:
-                    logger.debug(f"Error extracting element {i}: {str(e)}")
+                    logger.debug(f"Error parsing {source} post: {str(e)}")
                     continue
                     
         except Exception as e:
@@ -345,23 +440,22 @@ class FacebookGroupExtractor:
     
     def _extract_text_rich_elements(self) -> List[dict]:
         """Extract elements with substantial text content"""
+        from selenium.webdriver.common.by import By
+
         posts = []
         try:
             # Look for divs with substantial text
             elements = self.driver.find_elements(By.XPATH, "//div[string-length(text()) > 100]")
             
-            for element in elements:
-                try:
-                    text = element.text.strip()
-                    if self._is_valid_post(text):
-                        posts.append({
-                            "content": text,
-                            "source": "text_rich",
-                            "timestamp": datetime.now().isoformat(),
-                            "has_comments": "comment" in text.lower()[:200]
-                        })
-                except:
-                    continue
+            for element, text in self._read_valid_elements(elements):
+                post_data = {
+                    "content": text,
+                    "source": "text_rich",
+                    "timestamp": datetime.now().isoformat(),
+                    "has_comments": "comment" in text.lower()[:200]
+                }
+                post_data["post_id"] = make_post_id(post_data)
+                posts.append(post_data)
                     
         except Exception as e:
             logger.warning(f"Text-rich extraction failed: {str(e)}")
@@ -370,6 +464,8 @@ class FacebookGroupExtractor:
     
     def _parse_structured_post(self, element, text: str, source: str) -> dict:
         """Parse post with structured data"""
+        from selenium.webdriver.common.by import By
+
         post_data = {
             "content": text,
             "source": source,
@@ -378,6 +474,14 @@ class FacebookGroupExtractor:
             "reactions": 0
         }
         
+        try:
+            # Permalink gives a stable post ID across re-scrapes
+            links = element.find_elements(By.XPATH, ".//a[contains(@href, '/posts/') or contains(@href, '/permalink/')]")
+            if links:
+                post_data["permalink"] = links[0].get_attribute("href").split('?')[0]
+        except Exception as e:
+            logger.debug(f"Permalink lookup failed: {str(e)}")
+        
         try:
             # Check for comments
             comment_indicators = [
@@ -411,31 +515,12 @@ class FacebookGroupExtractor:
         except Exception as e:
             logger.debug(f"Structured parsing failed: {str(e)}")
         
+        post_data["post_id"] = make_post_id(post_data)
         return post_data
     
     def _is_valid_post(self, text: str) -> bool:
         """Check if text is a valid post"""
-        if not text or len(text) < 50:
-            return False
-        
-        # Exclude navigation and UI text
-        excluded_phrases = [
-            'facebook', 'login', 'sign up', 'password', 'email',
-            'cookie', 'privacy', 'terms', 'menu', 'navigation',
-            'home', 'search', 'notification', 'messenger', 'watch',
-            'marketplace', 'groups', 'pages', 'events'
-        ]
-        
-        text_lower = text.lower()
-        if any(phrase in text_lower for phrase in excluded_phrases):
-            return False
-        
-        # Check for reasonable word count
-        words = text.split()
-        if len(words) < 8:
-            return False
-        
-        return True
+        return self.post_filter.is_valid(text)
     
     def _is_duplicate_post(self, new_post: dict, existing_posts: List[dict]) -> bool:
         """Check if post is duplicate"""
@@ -462,18 +547,65 @@ class FacebookGroupExtractor:
         
         return len(intersection) / len(union) if union else 0.0
     
+    def _reset_load_metrics(self):
+        """Start a fresh measurement window, discarding traffic from login"""
+        self._drain_performance_log()
+        self.load_metrics = {"bytes_transferred": 0, "pages_loaded": 0, "started_at": time.time()}
+    
+    def _drain_performance_log(self) -> List[dict]:
+        """Read pending CDP events from the performance log and count transferred bytes"""
+        try:
+            entries = self.driver.get_log("performance")
+        except Exception as e:
+            logger.debug(f"Performance log unavailable: {str(e)}")
+            return []
+        
+        events = decode_performance_entries(entries)
+        for message in events:
+            if message.get("method") == "Network.loadingFinished":
+                self.load_metrics["bytes_transferred"] += int(message.get("params", {}).get("encodedDataLength", 0))
+        
+        return events
+    
+    def _get_chrome_rss(self) -> int:
+        """Resident memory of chromedriver and all Chrome processes in bytes"""
+        try:
+            root = psutil.Process(self.driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+        except Exception:
+            return 0
+        
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                continue
+        return total
+    
+    def get_load_metrics(self) -> dict:
+        """Page weight and throughput of the current extraction"""
+        self._drain_performance_log()
+        started_at = self.load_metrics["started_at"]
+        elapsed_minutes = (time.time() - started_at) / 60 if started_at else 0
+        pages_loaded = self.load_metrics["pages_loaded"]
+        
+        return {
+            "mode": "lean" if self.lean_mode else "full",
+            "bytes_transferred": self.load_metrics["bytes_transferred"],
+            "pages_loaded": pages_loaded,
+            "pages_per_minute": round(pages_loaded / elapsed_minutes, 2) if elapsed_minutes else 0.0,
+            "chrome_rss_mb": round(self._get_chrome_rss() / (1024 * 1024), 1)
+        }
+    
     def close(self):
         """Close the browser"""
         if self.driver:
             self.driver.quit()
 
 def check_ollama_running():
-    """Check if Ollama is running"""
-    try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=5)
-        return response.status_code == 200
-    except:
-        return False
+    """Check if Ollama is running (cached snapshot, refreshed in the background)"""
+    return get_status_service().snapshot()["running"]
 
 def start_ollama():
     """Start Ollama service"""
@@ -482,87 +614,88 @@ def start_ollama():
             subprocess.Popen(['ollama', 'serve'], creationflags=subprocess.CREATE_NO_WINDOW)
         else:  # Linux/Mac
             subprocess.Popen(['ollama', 'serve'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        time.sleep(5)
-        return check_ollama_running()
+        # Poll until the server answers instead of a fixed wait
+        for _ in range(10):
+            time.sleep(1)
+            if get_status_service().refresh()["running"]:
+                return True
+        return False
     except Exception as e:
         st.error(f"Failed to start Ollama: {e}")
         return False
 
 def get_available_models():
     """Get list of available Ollama models"""
-    try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=5)
-        if response.status_code == 200:
-            models = response.json().get('models', [])
-            return [model['name'] for model in models]
-    except:
-        return ["llama2", "mistral", "gemma", "llama3"]
+    return list(get_status_service().snapshot()["models"]) or DEFAULT_MODELS
 
-def process_group_data(group_data: dict):
+@st.cache_resource
+def get_post_store():
+    """Process-wide persistent store of extracted posts"""
+    return PostStore()
+
+def make_embedding_progress():
+    """Sidebar progress bar reporting embedding progress and throughput"""
+    progress_bar = st.sidebar.progress(0.0, text="🧮 Embedding posts...")
+    
+    def report(done: int, total_hint, rate: float):
+        fraction = min(done / total_hint, 1.0) if total_hint else 0.0
+        progress_bar.progress(fraction, text=f"🧮 Embedded {done} chunks · {rate:.1f} chunks/s")
+    
+    return report
+
+def process_group_data(group_data: dict, batch_size: int = EMBEDDING_BATCH_SIZE):
     """Process extracted group data for chatbot"""
     if not group_data or "posts" not in group_data or not group_data["posts"]:
         return None, []
     
-    # Combine all posts into a single text
-    all_text = f"Group: {group_data.get('group_info', {}).get('name', 'Unknown')}\n\n"
-    all_text += f"Total Posts Extracted: {len(group_data['posts'])}\n\n"
-    
-    for i, post in enumerate(group_data["posts"]):
-        content = post.get("content", "")
-        source = post.get("source", "unknown")
-        has_comments = post.get("has_comments", False)
-        reactions = post.get("reactions", 0)
-        
-        all_text += f"--- Post {i+1} ---\n"
-        all_text += f"Source: {source}\n"
-        all_text += f"Reactions: {reactions}\n"
-        all_text += f"Has Comments: {has_comments}\n"
-        all_text += f"Content: {content}\n\n"
-    
-    # Split into chunks
-    splitter = CharacterTextSplitter(
-        separator="\n",
-        chunk_size=1000,
-        chunk_overlap=200,
-        length_function=len
-    )
-    
-    chunks = splitter.split_text(all_text)
-    documents = [Document(page_content=chunk) for chunk in chunks]
+    from langchain.embeddings import SentenceTransformerEmbeddings
+    from post_chunker import iter_post_documents
+
+    # One document per post (long posts split on their own), no cross-post overlap
+    documents = iter_post_documents(group_data, chunk_size=1000)
     
-    # Create vector store
+    # Create vector store in batches, chunking on a background thread
     embeddings = SentenceTransformerEmbeddings(model_name="all-MiniLM-L6-v2")
-    vectorstore = FAISS.from_documents(documents, embeddings)
+    total_hint = len(group_data["posts"]) + 1
+    vectorstore, chunks = build_vectorstore(
+        documents, embeddings,
+        batch_size=batch_size,
+        total_hint=total_hint,
+        progress_callback=make_embedding_progress()
+    )
     
     return vectorstore, chunks
 
 def create_chatbot(vectorstore, model_name: str):
     """Create conversational chatbot"""
     try:
+        from langchain.chains import ConversationalRetrievalChain
+        from langchain_community.llms.ollama import Ollama
+        from chat_memory import make_memory
+        from question_router import route_question_condensing
+        from reranker import make_retriever
+
         llm = Ollama(
             model=model_name,
             base_url="http://localhost:11434",
             temperature=0.7,
             top_k=40,
             top_p=0.9,
-            num_predict=512
+            num_predict=512,
+            keep_alive=OLLAMA_KEEP_ALIVE
         )
         
-        memory = ConversationBufferMemory(
-            memory_key="chat_history",
-            return_messages=True,
-            output_key="answer"
-        )
+        memory = make_memory(llm, output_key="answer")
         
         chain = ConversationalRetrievalChain.from_llm(
             llm=llm,
-            retriever=vectorstore.as_retriever(search_kwargs={"k": 3}),
+            retriever=make_retriever(vectorstore, k=3),
             memory=memory,
             return_source_documents=True,
             output_key="answer"
         )
         
-        return chain
+        return route_question_condensing(chain)
     except Exception as e:
         st.error(f"Failed to create chatbot: {str(e)}")
         return None
@@ -578,6 +711,38 @@ def clear_chat_history():
     else:
         st.error("❌ No extracted data found. Please extract group data first.")
 
+def render_post_history():
+    """Browse and chat with stored post history without re-scraping"""
+    store = get_post_store()
+    groups = store.list_groups()
+    if not groups:
+        return
+    
+    with st.expander(f"📚 Stored Post History ({sum(g['posts'] for g in groups)} posts)"):
+        group_ids = [g["group_id"] for g in groups]
+        group_id = st.selectbox("Group", group_ids, key="history_group")
+        group_stats = groups[group_ids.index(group_id)]
+        st.caption(f"{group_stats['posts']} posts | {group_stats['oldest'][:10]} → {group_stats['newest'][:10]}")
+        
+        query = st.text_input("Search stored posts", key="history_query")
+        if query:
+            results = store.search(query, group_id=group_id, limit=20)
+            st.write(f"**{len(results)} matches**")
+            for post in results:
+                st.caption(f"{post['posted_at'][:10]} | {post.get('author') or 'unknown'} | Reactions: {post['reactions']}")
+                st.write(post["content"][:300])
+        
+        if st.button("💬 Chat with stored history", key="history_chat"):
+            posts = list(store.iter_posts(group_id))
+            group_data = {"group_info": {"name": group_id}, "group_id": group_id, "posts": posts, "status": "success"}
+            vectorstore, chunks = process_group_data(group_data)
+            if vectorstore:
+                st.session_state.group_data = group_data
+                st.session_state.vectorstore = vectorstore
+                st.session_state.chatbot = create_chatbot(vectorstore, st.session_state.current_model)
+                st.session_state.chat_history = []
+                st.success(f"✅ Loaded {len(posts)} stored posts")
+
 def main():
     st.set_page_config(
         page_title="Facebook Group Analyzer with Manual Login",
@@ -587,6 +752,7 @@ def main():
     
     st.title("📘 Facebook Group Data Extractor & Chatbot")
     st.markdown("Manual login required for private groups - Works with both public and private groups")
+    preloader = start_preloader(HEAVY_MODULES)
     
     # Initialize session state
     if "extractor" not in st.session_state:
@@ -603,6 +769,8 @@ def main():
         st.session_state.chat_history = []
     if "current_model" not in st.session_state:
         st.session_state.current_model = "llama2"
+    if "load_metrics_history" not in st.session_state:
+        st.session_state.load_metrics_history = []
     
     # Sidebar
     with st.sidebar:
@@ -610,7 +778,10 @@ def main():
         
         # Ollama status
         st.subheader("🤖 Ollama Status")
-        if check_ollama_running():
+        ollama_running = check_ollama_running()
+        if ollama_running is None:
+            st.info("⏳ Checking Ollama...")
+        elif ollama_running:
             st.success("✅ Ollama is running")
         else:
             st.error("❌ Ollama is not running")
@@ -632,13 +803,21 @@ def main():
         
         # Store current model
         st.session_state.current_model = model_name
+        render_model_lifecycle(model_name)
+        render_queue_status()
+        render_import_report(preloader, __file__)
         
         # Login section
         st.subheader("🔐 Facebook Login")
         
         if st.session_state.login_status == "not_started":
+            lean_mode = st.checkbox(
+                "⚡ Lean loading",
+                value=False,
+                help="Block images, video and fonts - only post text is extracted"
+            )
             if st.button("🚪 Start Manual Login", type="primary", use_container_width=True):
-                extractor = FacebookGroupExtractor()
+                extractor = FacebookGroupExtractor(lean_mode=lean_mode)
                 if extractor.setup_driver():
                     st.session_state.extractor = extractor
                     if extractor.manual_login():
@@ -674,6 +853,7 @@ def main():
                 st.session_state.vectorstore = None
                 st.session_state.chatbot = None
                 st.session_state.chat_history = []
+                release_session_model()
                 st.rerun()
         
         # Group extraction section
@@ -687,6 +867,17 @@ def main():
         # Extraction settings
         st.subheader("⚙️ Extraction Settings")
         max_scrolls = st.slider("Number of scrolls", 5, 20, 10)
+        capture_label = st.radio(
+            "Capture mode",
+            ["DOM", "Network (GraphQL)"],
+            help="Network mode parses the feed's GraphQL responses for real post IDs, authors, timestamps and counts"
+        )
+        capture_mode = "network" if capture_label == "Network (GraphQL)" else "dom"
+        embedding_batch_size = st.select_slider(
+            "Embedding batch size",
+            options=[16, 32, 64, 128, 256],
+            value=EMBEDDING_BATCH_SIZE if EMBEDDING_BATCH_SIZE in (16, 32, 64, 128, 256) else 64
+        )
         
         if st.button("🚀 Extract Group Data", type="primary", use_container_width=True):
             if st.session_state.login_status != "completed":
@@ -697,13 +888,21 @@ def main():
                 st.error("❌ Ollama is not running")
             else:
                 with st.spinner("🌐 Extracting group data... This may take a few minutes."):
-                    group_data = st.session_state.extractor.extract_group_data(group_url, max_scrolls)
+                    group_data = st.session_state.extractor.extract_group_data(group_url, max_scrolls, capture_mode)
                     
                     if group_data.get("status") == "success" and group_data.get("posts"):
                         st.session_state.group_data = group_data
+                        st.session_state.load_metrics_history.append(group_data["load_metrics"])
+                        
+                        # Persist for later queries without re-scraping
+                        try:
+                            inserted, updated = get_post_store().upsert_posts(group_data["group_id"], group_data["posts"])
+                            st.info(f"💾 Post history: {inserted} new, {updated} updated")
+                        except Exception as e:
+                            st.warning(f"⚠️ Could not save posts to history: {e}")
                         
                         # Process for chatbot
-                        vectorstore, chunks = process_group_data(group_data)
+                        vectorstore, chunks = process_group_data(group_data, embedding_batch_size)
                         if vectorstore:
                             st.session_state.vectorstore = vectorstore
                             st.session_state.chatbot = create_chatbot(vectorstore, model_name)
@@ -718,6 +917,10 @@ def main():
         # Chat management section
         if st.session_state.chatbot and st.session_state.group_data:
             st.subheader("💬 Chat Management")
+            from question_router import CONDENSE_STATS, condense_skip_rate
+            if CONDENSE_STATS["condensed"] or CONDENSE_STATS["skipped"]:
+                st.caption(f"⚡ {condense_skip_rate():.0%} of questions after the first were self-contained "
+                           f"and skipped the condensing call")
             if st.button("🗑️ Clear Chat History", type="secondary", use_container_width=True):
                 clear_chat_history()
                 st.rerun()
@@ -726,6 +929,7 @@ def main():
     col1, col2 = st.columns([1, 1])
     
     with col1:
+        render_post_history()
         st.header("📊 Login & Extraction Status")
         
         if st.session_state.login_status == "not_started":
@@ -784,12 +988,38 @@ def main():
                             st.write(f"**{key.replace('_', ' ').title()}:** {value}")
                 
                 st.subheader(f"📝 Posts Extracted: {len(posts)}")
+                if st.session_state.vectorstore:
+                    from vector_index import describe_index
+                    st.caption(f"Vector index: {describe_index(st.session_state.vectorstore)} "
+                               f"({st.session_state.vectorstore.index.ntotal} chunks)")
                 
                 for i, post in enumerate(posts[:3]):
                     with st.expander(f"Post {i+1}"):
                         content = post.get("content", "")
                         st.text_area(f"Content {i+1}", content, height=150, key=f"post_{i}")
-                        st.caption(f"Source: {post.get('source', 'unknown')} | Reactions: {post.get('reactions', 0)}")
+                        caption = f"Source: {post.get('source', 'unknown')} | Reactions: {post.get('reactions', 0)}"
+                        if post.get("author"):
+                            caption += f" | Author: {post['author']} | Posted: {post.get('created_at') or 'unknown'}"
+                        st.caption(caption)
+            
+            if st.session_state.load_metrics_history:
+                st.subheader("⚡ Load Metrics")
+                latest = st.session_state.load_metrics_history[-1]
+                metric_col1, metric_col2, metric_col3 = st.columns(3)
+                with metric_col1:
+                    st.metric("Transferred", f"{latest['bytes_transferred'] / (1024 * 1024):.1f} MB")
+                with metric_col2:
+                    st.metric("Pages / min", latest["pages_per_minute"])
+                with metric_col3:
+                    st.metric("Chrome RSS", f"{latest['chrome_rss_mb']} MB")
+                # Runs from both modes side by side for comparison
+                st.table(st.session_state.load_metrics_history)
+            
+            rejections = st.session_state.group_data.get("filter_rejections") if st.session_state.group_data else None
+            if rejections:
+                with st.expander("🧹 Filter Rejections"):
+                    st.caption("Candidates dropped by the post filter - tune with POST_FILTER_PHRASES")
+                    st.table([{"reason": reason, "count": count} for reason, count in rejections.items()])
     
     with col2:
         st.header("💬 Chat with Group Data")
@@ -822,7 +1052,8 @@ def main():
                 with st.chat_message("assistant"):
                     with st.spinner("🤔 Analyzing..."):
                         try:
-                            response = st.session_state.chatbot.invoke({"question": user_question})
+                            response = submit_chat(st.session_state.current_model, st.session_state.chatbot,
+                                                   {"question": user_question})
                             answer = response.get("answer", "I couldn't generate a response.")
                             st.write(answer)
                             
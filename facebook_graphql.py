@@ -0,0 +1,184 @@
+# facebook_graphql.py
+import base64
+import json
+import logging
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+GRAPHQL_URL_MARKER = "/api/graphql"
+STORY_TYPENAMES = {"Story"}
+
+def decode_performance_entries(entries: List[dict]) -> List[dict]:
+    """Decode raw chromedriver performance log entries into CDP messages"""
+    messages = []
+    for entry in entries:
+        try:
+            messages.append(json.loads(entry["message"])["message"])
+        except (KeyError, TypeError, ValueError):
+            continue
+    return messages
+
+def iter_json_documents(text: str) -> Iterator[dict]:
+    """Yield every JSON document in a GraphQL response body.
+
+    Feed responses are streamed as newline-delimited JSON and may carry
+    the 'for (;;);' anti-hijacking prefix.
+    """
+    if not text:
+        return
+    if text.startswith("for (;;);"):
+        text = text[len("for (;;);"):]
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            continue
+
+def _iter_story_nodes(node) -> Iterator[dict]:
+    """Walk a JSON tree and yield top-level Story nodes (not stories nested in stories) in feed order"""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            if current.get("__typename") in STORY_TYPENAMES and (current.get("post_id") or current.get("id")):
+                yield current
+                continue
+            # Pushed in reverse so children pop in document order
+            stack.extend(reversed(list(current.values())))
+        elif isinstance(current, list):
+            stack.extend(reversed(current))
+
+def _find_first(node, key: str):
+    """Breadth-first lookup of a key inside a story, skipping nested stories"""
+    queue = [node]
+    while queue:
+        current = queue.pop(0)
+        if isinstance(current, dict):
+            if key in current and current[key] not in (None, "", [], {}):
+                return current[key]
+            for value in current.values():
+                if isinstance(value, dict) and value.get("__typename") in STORY_TYPENAMES:
+                    continue
+                if isinstance(value, (dict, list)):
+                    queue.append(value)
+        elif isinstance(current, list):
+            queue.extend(item for item in current if isinstance(item, (dict, list)))
+    return None
+
+def _count(value) -> int:
+    if isinstance(value, dict):
+        value = value.get("count", value.get("total_count", 0))
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+def _iso_timestamp(value) -> Optional[str]:
+    try:
+        return datetime.fromtimestamp(int(value)).isoformat()
+    except (TypeError, ValueError, OverflowError, OSError):
+        return None
+
+def parse_story(story: dict) -> Optional[dict]:
+    """Convert a GraphQL Story node into a post record"""
+    message = _find_first(story, "message")
+    content = message.get("text", "") if isinstance(message, dict) else ""
+    if not content:
+        return None
+
+    actors = _find_first(story, "actors") or []
+    author = actors[0] if actors and isinstance(actors[0], dict) else {}
+    creation_time = _find_first(story, "creation_time")
+    created_at = _iso_timestamp(creation_time) if creation_time else None
+    comments = _count(_find_first(story, "comment_count") or _find_first(story, "total_comment_count"))
+
+    return {
+        "post_id": str(story.get("post_id") or story.get("id")),
+        "content": content,
+        "author": author.get("name", ""),
+        "author_id": author.get("id", ""),
+        "created_at": created_at,
+        "permalink": _find_first(story, "permalink_url") or _find_first(story, "url") or "",
+        "reactions": _count(_find_first(story, "reaction_count")),
+        "comments": comments,
+        "shares": _count(_find_first(story, "share_count")),
+        "has_comments": comments > 0,
+        "source": "graphql",
+        "timestamp": created_at or datetime.now().isoformat()
+    }
+
+def parse_graphql_payload(text: str) -> List[dict]:
+    """Parse all post records out of one GraphQL response body"""
+    posts = []
+    for document in iter_json_documents(text):
+        for story in _iter_story_nodes(document):
+            try:
+                post = parse_story(story)
+            except Exception as e:
+                # One malformed story must not abort the rest of the capture
+                logger.debug(f"Skipping unparseable story {story.get('id')}: {str(e)}")
+                continue
+            if post:
+                posts.append(post)
+    return posts
+
+def parse_har_file(path: str) -> List[dict]:
+    """Parse post records from a saved HAR capture, for offline testing"""
+    with open(path, encoding="utf-8") as f:
+        har = json.load(f)
+
+    posts: Dict[str, dict] = {}
+    for entry in har.get("log", {}).get("entries", []):
+        if GRAPHQL_URL_MARKER not in entry.get("request", {}).get("url", ""):
+            continue
+        content = entry.get("response", {}).get("content", {})
+        text = content.get("text", "")
+        if content.get("encoding") == "base64":
+            text = base64.b64decode(text).decode("utf-8", errors="replace")
+        for post in parse_graphql_payload(text):
+            posts[post["post_id"]] = post
+    return list(posts.values())
+
+class GraphQLFeedCapture:
+    """Collect feed posts from GraphQL responses seen in CDP network events"""
+    def __init__(self, driver):
+        self.driver = driver
+        self.posts: Dict[str, dict] = {}
+        self._pending_requests = set()
+        self.responses_parsed = 0
+
+    def process_events(self, messages: List[dict]) -> int:
+        """Handle decoded CDP messages; returns the number of new posts"""
+        before = len(self.posts)
+        for message in messages:
+            method = message.get("method")
+            params = message.get("params", {})
+            if method == "Network.responseReceived":
+                if GRAPHQL_URL_MARKER in params.get("response", {}).get("url", ""):
+                    self._pending_requests.add(params.get("requestId"))
+            elif method == "Network.loadingFinished" and params.get("requestId") in self._pending_requests:
+                request_id = params["requestId"]
+                self._pending_requests.discard(request_id)
+                self._read_response(request_id)
+        return len(self.posts) - before
+
+    def _read_response(self, request_id: str):
+        try:
+            body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        except Exception as e:
+            logger.debug(f"GraphQL body unavailable for {request_id}: {str(e)}")
+            return
+        text = body.get("body", "")
+        if body.get("base64Encoded"):
+            text = base64.b64decode(text).decode("utf-8", errors="replace")
+        self.responses_parsed += 1
+        for post in parse_graphql_payload(text):
+            self.posts[post["post_id"]] = post
+
+    def get_posts(self) -> List[dict]:
+        return list(self.posts.values())
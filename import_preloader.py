@@ -0,0 +1,116 @@
+# import_preloader.py
+import ast
+import importlib
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Tuple
+
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+IMPORT_BUDGET_SECONDS = float(os.environ.get("IMPORT_BUDGET_SECONDS", "0"))  # 0 = no regression warning
+REPORT_TOP_N = 15
+
+class ModulePreloader:
+    """Imports an app's heavy modules on a daemon thread after the first render.
+
+    Extraction and chat import the same modules lazily; Python's import lock
+    makes them wait for (or reuse) the preloader's import instead of repeating it.
+    """
+    def __init__(self, modules: Tuple[str, ...]):
+        self.modules = modules
+        self.timings: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self.done = threading.Event()
+        threading.Thread(target=self._run, daemon=True, name="module-preloader").start()
+
+    def _run(self):
+        for name in self.modules:
+            started = time.perf_counter()
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                # Optional backends (selenium, sentence_transformers...) may be missing
+                self.errors[name] = f"{type(e).__name__}: {e}"
+            self.timings[name] = time.perf_counter() - started
+        self.done.set()
+        logger.info(f"Preloaded {len(self.modules) - len(self.errors)}/{len(self.modules)} modules "
+                    f"in {sum(self.timings.values()):.1f}s")
+
+    def status(self) -> dict:
+        return {"loaded": len(self.timings), "total": len(self.modules), "done": self.done.is_set(),
+                "seconds": sum(self.timings.values()), "errors": dict(self.errors)}
+
+@st.cache_resource
+def start_preloader(modules: Tuple[str, ...]) -> ModulePreloader:
+    """One preloader per app process, started on the first script run"""
+    return ModulePreloader(modules)
+
+def parse_importtime(stderr: str) -> List[dict]:
+    """Rows of `python -X importtime` output: self and cumulative microseconds per module"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            # One space after the bar, then two more per nesting level
+            rows.append({"module": name.strip(), "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+                         "self_ms": int(self_us) / 1000, "cumulative_ms": int(cumulative_us) / 1000})
+        except ValueError:
+            continue
+    return rows
+
+def module_level_imports(path: str) -> Tuple[str, ...]:
+    """Modules a script imports at top level, i.e. before its first render"""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.append(node.module)
+    return tuple(dict.fromkeys(names))
+
+def import_time_report(modules: Tuple[str, ...]) -> dict:
+    """Cold import cost of the given modules, measured in a fresh interpreter"""
+    code = "".join(f"\ntry:\n    import {name}\nexcept Exception:\n    pass" for name in modules)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, timeout=300)
+    rows = parse_importtime(result.stderr)
+    top_level = [row for row in rows if row["depth"] == 0]
+    return {"total_seconds": sum(row["cumulative_ms"] for row in top_level) / 1000,
+            "modules": sorted(top_level, key=lambda row: row["cumulative_ms"], reverse=True)[:REPORT_TOP_N],
+            "measured_at": time.strftime("%H:%M:%S")}
+
+def render_import_report(preloader: ModulePreloader, app_file: str):
+    """Sidebar panel: preload progress and an on-demand -X importtime measurement of the app's eager imports"""
+    status = preloader.status()
+    with st.sidebar.expander("⏱️ Import Times", expanded=False):
+        if status["done"]:
+            st.caption(f"Heavy modules preloaded in {status['seconds']:.1f}s")
+        else:
+            st.caption(f"Preloading modules... {status['loaded']}/{status['total']}")
+        for name, error in status["errors"].items():
+            st.caption(f"⚠️ {name}: {error}")
+
+        # Keyed per app: in multipage mode every page shares one session_state
+        report_key = f"import_report_{os.path.basename(app_file)}"
+        if st.button("Measure startup imports", key=f"measure_{report_key}"):
+            with st.spinner("Running python -X importtime..."):
+                st.session_state[report_key] = import_time_report(module_level_imports(app_file))
+        report = st.session_state.get(report_key)
+        if report:
+            st.metric("Imports before first render", f"{report['total_seconds']:.2f}s")
+            if IMPORT_BUDGET_SECONDS and report["total_seconds"] > IMPORT_BUDGET_SECONDS:
+                st.warning(f"Over the {IMPORT_BUDGET_SECONDS:.1f}s import budget")
+            st.dataframe([{"module": row["module"], "cumulative ms": round(row["cumulative_ms"]),
+                           "self ms": round(row["self_ms"])} for row in report["modules"]],
+                         hide_index=True, use_container_width=True)
+            st.caption(f"python -X importtime, measured {report['measured_at']}")
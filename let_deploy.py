@@ -1,24 +1,18 @@
 # let_deploy.py
 import streamlit as st
 import time
-from bs4 import BeautifulSoup
-from langchain_text_splitters import CharacterTextSplitter
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain.vectorstores import FAISS
-from langchain.memory import ConversationBufferMemory
-from langchain.chains import ConversationalRetrievalChain
-from langchain.schema import Document
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from langchain_community.llms import HuggingFaceHub
-import re
-import requests
+from llm_backends import BACKEND_MODELS, LLM_BACKEND, LLM_BACKENDS, create_llm
+from llm_broker import render_queue_status, submit_chat
+from facebook_graphql import GraphQLFeedCapture, decode_performance_entries
+from post_store import PostStore, make_group_id, make_post_id
+from post_filter import PostFilter, load_excluded_phrases
+from embedding_pipeline import build_vectorstore, load_embeddings
+from import_preloader import render_import_report, start_preloader
 import os
+import json
+import atexit
+import queue
+import threading
 from datetime import datetime
 from typing import List
 import logging
@@ -38,60 +32,235 @@ st.markdown("""
 
 def get_embeddings():
     try:
-        embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
-        return embeddings
+        return load_embeddings()
     except Exception as e:
         st.error(f"❌ Failed to load embeddings: {e}")
         return None
 
 def get_llm():
+    backend = st.session_state.get('llm_backend', LLM_BACKEND)
     api_key = st.session_state.get('hf_api_key')
-    if not api_key:
+    if backend == "hub" and not api_key:
         st.error("❌ HuggingFace API Key not found")
         return None
     
     try:
-        llm = HuggingFaceHub(
-            repo_id="google/flan-t5-large",
-            huggingfacehub_api_token=api_key,
-            model_kwargs={"temperature": 0.7, "max_length": 512}
-        )
-        return llm
+        return create_llm(backend, api_key=api_key, max_length=512)
     except Exception as e:
-        st.error(f"❌ HuggingFace error: {e}")
+        st.error(f"❌ {LLM_BACKENDS.get(backend, backend)} error: {e}")
+        return None
+
+DRIVER_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "social_extractor", "chromedriver.json")
+WARM_BROWSER_COUNT = int(os.environ.get("WARM_BROWSER_COUNT", "1"))
+CHROME_HEADLESS = os.environ.get("CHROME_HEADLESS", "0") == "1"
+EXCLUDED_PHRASES = ['facebook', 'login', 'sign up', 'password', 'menu', 'navigation']
+# Imported on first use and in the background once the first page has rendered
+HEAVY_MODULES = (
+    "selenium.webdriver", "selenium.webdriver.support.expected_conditions", "webdriver_manager.chrome",
+    "post_chunker", "vector_index", "langchain.chains", "langchain_community.embeddings",
+    "reranker", "chat_memory", "question_router", "sentence_transformers"
+)
+
+def _load_cached_driver_path():
+    try:
+        with open(DRIVER_CACHE_FILE) as f:
+            driver_path = json.load(f).get("driver_path")
+    except (OSError, ValueError):
         return None
+    return driver_path if driver_path and os.path.exists(driver_path) else None
+
+def _save_cached_driver_path(driver_path: str):
+    try:
+        os.makedirs(os.path.dirname(DRIVER_CACHE_FILE), exist_ok=True)
+        with open(DRIVER_CACHE_FILE, "w") as f:
+            json.dump({"driver_path": driver_path, "resolved_at": datetime.now().isoformat()}, f)
+    except OSError as e:
+        logger.warning(f"Could not cache chromedriver path: {e}")
+
+def invalidate_chromedriver_cache():
+    try:
+        os.remove(DRIVER_CACHE_FILE)
+    except OSError:
+        pass
+
+def resolve_chromedriver_path():
+    """Cached chromedriver path from disk, else a fresh ChromeDriverManager install; safe off the script thread"""
+    driver_path = _load_cached_driver_path()
+    if driver_path:
+        return driver_path
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+        driver_path = ChromeDriverManager().install()
+    except Exception as e:
+        logger.warning(f"ChromeDriverManager install failed: {e}")
+        return None
+    _save_cached_driver_path(driver_path)
+    return driver_path
+
+@st.cache_resource
+def get_chromedriver_path():
+    return resolve_chromedriver_path()
+
+def _driver_matches_browser(driver) -> bool:
+    capabilities = driver.capabilities
+    browser_major = capabilities.get("browserVersion", "").split(".")[0]
+    driver_major = capabilities.get("chrome", {}).get("chromedriverVersion", "").split(".")[0]
+    return not browser_major or not driver_major or browser_major == driver_major
+
+def build_chrome_options(headless: bool = CHROME_HEADLESS):
+    from selenium.webdriver.chrome.options import Options
+
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--start-maximized")
+    chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
+    # Performance log carries the network events used by GraphQL capture
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return chrome_options
+
+def launch_chrome(driver_path, headless: bool = CHROME_HEADLESS):
+    """Start Chrome with the given chromedriver, re-resolving it if stale.
+
+    Returns (driver, driver_path actually used).
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+
+    if driver_path:
+        try:
+            driver = webdriver.Chrome(service=Service(driver_path), options=build_chrome_options(headless))
+            if _driver_matches_browser(driver):
+                return driver, driver_path
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Cached chromedriver failed to start: {e}")
+        invalidate_chromedriver_cache()
+        driver_path = resolve_chromedriver_path()
+        if driver_path:
+            return webdriver.Chrome(service=Service(driver_path), options=build_chrome_options(headless)), driver_path
+    return webdriver.Chrome(options=build_chrome_options(headless)), None
+
+class WarmBrowserPool:
+    """Chrome instances for login, launched ahead of the first request.
+
+    The pool keeps `size` idle windows ready for the next login, started
+    with the same headless setting as on-demand ones. Browsers still open
+    when the server process exits are quit.
+    """
+    def __init__(self, size: int = 1, driver_path=None, headless: bool = CHROME_HEADLESS):
+        self.driver_path = driver_path  # updated if it goes stale
+        self.size = size
+        self.headless = headless
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._spawning = 0
+        self._launched = set()
+        atexit.register(self.shutdown)
+    
+    def _launch(self):
+        driver, self.driver_path = launch_chrome(self.driver_path, self.headless)
+        with self._lock:
+            self._launched.add(driver)
+        return driver
+    
+    def _quit(self, driver):
+        with self._lock:
+            self._launched.discard(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+    
+    def _spawn(self):
+        try:
+            self._idle.put(self._launch())
+        except Exception as e:
+            logger.warning(f"Warm browser spawn failed: {e}")
+        finally:
+            with self._lock:
+                self._spawning -= 1
+    
+    def refill(self):
+        with self._lock:
+            missing = max(self.size - self._idle.qsize() - self._spawning, 0)
+            self._spawning += missing
+        for _ in range(missing):
+            threading.Thread(target=self._spawn, daemon=True).start()
+    
+    def acquire(self, driver_path):
+        """An idle browser if one is ready, else one launched with driver_path"""
+        with self._lock:
+            self.driver_path = self.driver_path or driver_path
+        driver = None
+        while driver is None:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                # Window may have been closed while idle
+                driver.window_handles
+            except Exception:
+                self._quit(driver)
+                driver = None
+        if driver is None:
+            driver = self._launch()
+        self.refill()
+        return driver
+    
+    def release(self, driver):
+        """Quit a browser handed out by acquire()"""
+        self._quit(driver)
+    
+    def shutdown(self):
+        with self._lock:
+            drivers = list(self._launched)
+        for driver in drivers:
+            self._quit(driver)
+
+@st.cache_resource
+def get_browser_pool():
+    # Warm instances start with the pool, so the first login finds one ready
+    pool = WarmBrowserPool(size=WARM_BROWSER_COUNT, driver_path=get_chromedriver_path())
+    pool.refill()
+    return pool
 
 class FacebookGroupExtractor:
     def __init__(self):
         self.driver = None
         self.wait = None
         self.is_logged_in = False
+        self.post_filter = PostFilter(load_excluded_phrases(EXCLUDED_PHRASES), min_length=30, min_words=5)
         
     def setup_driver(self):
+        from selenium.webdriver.support.ui import WebDriverWait
+
         try:
-            chrome_options = Options()
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--start-maximized")
-            chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
-            
             st.info("🔄 Setting up Chrome browser...")
-            try:
-                service = Service(ChromeDriverManager().install())
-                self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            except Exception as e:
-                self.driver = webdriver.Chrome(options=chrome_options)
+            start = time.time()
+            # Resolved here: the pool's threads must not call st.cache_resource functions
+            driver_path = get_chromedriver_path()
+            pool = get_browser_pool()
+            self.driver = pool.acquire(driver_path)
+            if pool.driver_path != driver_path:
+                get_chromedriver_path.clear()
             
             self.driver.set_page_load_timeout(30)
             self.wait = WebDriverWait(self.driver, 25)
-            st.success("✅ Chrome browser setup completed!")
+            st.success(f"✅ Chrome browser setup completed in {time.time() - start:.2f}s!")
             return True
         except Exception as e:
             st.error(f"❌ Failed to setup Chrome: {str(e)}")
             return False
     
     def manual_login(self):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+
         try:
             st.info("🔓 Opening Facebook for manual login...")
             self.driver.get("https://www.facebook.com")
@@ -111,6 +280,8 @@ class FacebookGroupExtractor:
             return False
     
     def check_login_status(self):
+        from selenium.webdriver.common.by import By
+
         try:
             current_url = self.driver.current_url.lower()
             login_success_urls = ["facebook.com/home", "facebook.com/groups", "facebook.com/marketplace"]
@@ -133,24 +304,34 @@ class FacebookGroupExtractor:
             logger.error(f"Login check error: {str(e)}")
             return False
     
-    def extract_group_data(self, group_url: str, max_scrolls: int = 10) -> dict:
+    def extract_group_data(self, group_url: str, max_scrolls: int = 10, capture_mode: str = "dom") -> dict:
         try:
             if not self.is_logged_in:
                 return {"error": "Not logged in. Please login first.", "status": "error"}
             
             st.info(f"🌐 Accessing group: {group_url}")
+            self.post_filter.rejections.clear()
             self.driver.get(group_url)
             time.sleep(5)
             
             # Extract group info
             group_info = self._extract_group_info()
-            posts_data = self._scroll_and_extract_posts(max_scrolls)
+            if capture_mode == "network":
+                posts_data = self._scroll_and_capture_graphql(max_scrolls)
+                if not posts_data:
+                    st.warning("⚠️ No GraphQL feed data captured, falling back to DOM extraction")
+                    posts_data = self._scroll_and_extract_posts(max_scrolls)
+            else:
+                posts_data = self._scroll_and_extract_posts(max_scrolls)
             
             return {
                 "group_info": group_info,
+                "group_url": group_url,
+                "group_id": make_group_id(group_url),
                 "posts": posts_data,
                 "extraction_time": datetime.now().isoformat(),
                 "total_posts": len(posts_data),
+                "filter_rejections": self.post_filter.rejection_report(),
                 "status": "success"
             }
         except Exception as e:
@@ -158,6 +339,8 @@ class FacebookGroupExtractor:
             return {"error": f"Extraction failed: {str(e)}", "status": "error"}
     
     def _extract_group_info(self) -> dict:
+        from selenium.webdriver.common.by import By
+
         group_info = {}
         try:
             name_selectors = ["//h1", "//h2", "//h3", "//title"]
@@ -179,13 +362,17 @@ class FacebookGroupExtractor:
     
     def _scroll_and_extract_posts(self, max_scrolls: int) -> List[dict]:
         all_posts = []
+        seen_ids = set()
         last_height = self.driver.execute_script("return document.body.scrollHeight")
         
         for scroll_iteration in range(max_scrolls):
             current_posts = self._extract_posts_from_current_page()
             for post in current_posts:
+                if post["post_id"] in seen_ids:
+                    continue
                 if not self._is_duplicate_post(post, all_posts):
                     all_posts.append(post)
+                    seen_ids.add(post["post_id"])
             
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
             time.sleep(3)
@@ -197,6 +384,30 @@ class FacebookGroupExtractor:
         
         return all_posts
     
+    def _read_network_events(self) -> List[dict]:
+        try:
+            return decode_performance_entries(self.driver.get_log("performance"))
+        except Exception as e:
+            logger.debug(f"Performance log unavailable: {str(e)}")
+            return []
+    
+    def _scroll_and_capture_graphql(self, max_scrolls: int) -> List[dict]:
+        capture = GraphQLFeedCapture(self.driver)
+        capture.process_events(self._read_network_events())
+        last_height = self.driver.execute_script("return document.body.scrollHeight")
+        
+        for scroll_iteration in range(max_scrolls):
+            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            time.sleep(3)
+            capture.process_events(self._read_network_events())
+            
+            new_height = self.driver.execute_script("return document.body.scrollHeight")
+            if new_height == last_height:
+                break
+            last_height = new_height
+        
+        return capture.get_posts()
+    
     def _extract_posts_from_current_page(self) -> List[dict]:
         posts = []
         strategies = [
@@ -211,36 +422,34 @@ class FacebookGroupExtractor:
         return posts
     
     def _extract_by_xpath(self, xpath: str, source: str) -> List[dict]:
+        from selenium.webdriver.common.by import By
+
         posts = []
         try:
             elements = self.driver.find_elements(By.XPATH, xpath)
+            texts = []
             for element in elements:
                 try:
-                    post_text = element.text.strip()
-                    if self._is_valid_post(post_text):
-                        post_data = {
-                            "content": post_text,
-                            "source": source,
-                            "timestamp": datetime.now().isoformat(),
-                            "has_comments": False,
-                            "reactions": 0
-                        }
-                        posts.append(post_data)
+                    texts.append(element.text.strip())
                 except:
                     continue
+            for post_text, reason in zip(texts, self.post_filter.check_batch(texts)):
+                if reason is None:
+                    post_data = {
+                        "content": post_text,
+                        "source": source,
+                        "timestamp": datetime.now().isoformat(),
+                        "has_comments": False,
+                        "reactions": 0
+                    }
+                    post_data["post_id"] = make_post_id(post_data)
+                    posts.append(post_data)
         except:
             pass
         return posts
     
     def _is_valid_post(self, text: str) -> bool:
-        if not text or len(text) < 30:
-            return False
-        excluded_phrases = ['facebook', 'login', 'sign up', 'password', 'menu', 'navigation']
-        text_lower = text.lower()
-        if any(phrase in text_lower for phrase in excluded_phrases):
-            return False
-        words = text.split()
-        return len(words) >= 5
+        return self.post_filter.is_valid(text)
     
     def _is_duplicate_post(self, new_post: dict, existing_posts: List[dict]) -> bool:
         new_content = new_post.get("content", "")[:100]
@@ -264,32 +473,31 @@ class FacebookGroupExtractor:
     
     def close(self):
         if self.driver:
-            try:
-                self.driver.quit()
-            except:
-                pass
+            get_browser_pool().release(self.driver)
+            self.driver = None
+
+@st.cache_resource
+def get_post_store():
+    return PostStore()
 
 def process_group_data(group_data: dict):
     if not group_data or "posts" not in group_data or not group_data["posts"]:
         return None, []
     
-    all_text = f"Group: {group_data.get('group_info', {}).get('name', 'Unknown')}\n\n"
-    all_text += f"Total Posts: {len(group_data['posts'])}\n\n"
-    
-    for i, post in enumerate(group_data["posts"]):
-        content = post.get("content", "")
-        all_text += f"--- Post {i+1} ---\n"
-        all_text += f"Content: {content}\n\n"
-    
-    splitter = CharacterTextSplitter(separator="\n", chunk_size=1000, chunk_overlap=200)
-    chunks = splitter.split_text(all_text)
-    documents = [Document(page_content=chunk) for chunk in chunks]
+    from post_chunker import iter_post_documents
+    documents = iter_post_documents(group_data, chunk_size=1000)
     
     try:
         embeddings = get_embeddings()
         if embeddings is None:
             return None, []
-        vectorstore = FAISS.from_documents(documents, embeddings)
+        total_hint = len(group_data["posts"]) + 1
+        progress_bar = st.sidebar.progress(0.0, text="🧮 Embedding posts...")
+        
+        def report(done, total, rate):
+            progress_bar.progress(min(done / total, 1.0), text=f"🧮 Embedded {done} chunks · {rate:.1f} chunks/s")
+        
+        vectorstore, chunks = build_vectorstore(documents, embeddings, total_hint=total_hint, progress_callback=report)
         return vectorstore, chunks
     except Exception as e:
         st.error(f"Vector store creation failed: {e}")
@@ -297,18 +505,23 @@ def process_group_data(group_data: dict):
 
 def create_chatbot(vectorstore):
     try:
+        from langchain.chains import ConversationalRetrievalChain
+        from chat_memory import make_memory
+        from question_router import route_question_condensing
+        from reranker import make_retriever
+
         llm = get_llm()
         if llm is None:
             return None
         
-        memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
+        memory = make_memory(llm)
         chain = ConversationalRetrievalChain.from_llm(
             llm=llm,
-            retriever=vectorstore.as_retriever(search_kwargs={"k": 3}),
+            retriever=make_retriever(vectorstore, k=3),
             memory=memory,
             return_source_documents=True
         )
-        return chain
+        return route_question_condensing(chain)
     except Exception as e:
         st.error(f"Failed to create chatbot: {str(e)}")
         return None
@@ -325,77 +538,99 @@ def main():
         st.info("Return to main dashboard")
         return
     
-    if not st.session_state.get('hf_api_key'):
+    if not st.session_state.get('hf_api_key') and LLM_BACKEND == "hub":
         st.error("❌ API Key not configured. Please go back to main dashboard.")
         return
     
+    preloader = start_preloader(HEAVY_MODULES)
+    
     # Initialize session state
-    if "extractor" not in st.session_state:
-        st.session_state.extractor = None
-    if "login_status" not in st.session_state:
-        st.session_state.login_status = "not_started"
-    if "group_data" not in st.session_state:
-        st.session_state.group_data = None
-    if "chatbot" not in st.session_state:
-        st.session_state.chatbot = None
-    if "chat_history" not in st.session_state:
-        st.session_state.chat_history = []
+    if "fb2_extractor" not in st.session_state:
+        st.session_state.fb2_extractor = None
+    if "fb2_login_status" not in st.session_state:
+        st.session_state.fb2_login_status = "not_started"
+    if "fb2_group_data" not in st.session_state:
+        st.session_state.fb2_group_data = None
+    if "fb2_chatbot" not in st.session_state:
+        st.session_state.fb2_chatbot = None
+    if "fb2_chat_history" not in st.session_state:
+        st.session_state.fb2_chat_history = []
     
     # Sidebar
     with st.sidebar:
-        st.success("✅ HuggingFace API Active")
+        if st.session_state.get('hf_api_key'):
+            st.success("✅ HuggingFace API Active")
+        backend_keys = list(LLM_BACKENDS)
+        st.session_state.llm_backend = st.selectbox(
+            "🧠 LLM Backend",
+            backend_keys,
+            index=backend_keys.index(LLM_BACKEND) if LLM_BACKEND in backend_keys else 0,
+            format_func=LLM_BACKENDS.get,
+            help="Run flan-t5 locally on CPU or use the Ollama server instead of remote HuggingFace calls"
+        )
+        render_queue_status()
+        render_import_report(preloader, __file__)
         
         # Login section
         st.subheader("🔐 Facebook Login")
         
-        if st.session_state.login_status == "not_started":
+        if st.session_state.fb2_login_status == "not_started":
+            # Creating the pool starts the warm browser while the user reads the page
+            get_browser_pool()
             if st.button("🚪 Start Manual Login", type="primary", use_container_width=True):
                 with st.spinner("Setting up browser..."):
                     extractor = FacebookGroupExtractor()
                     if extractor.setup_driver():
-                        st.session_state.extractor = extractor
+                        st.session_state.fb2_extractor = extractor
                         if extractor.manual_login():
-                            st.session_state.login_status = "in_progress"
+                            st.session_state.fb2_login_status = "in_progress"
                             st.rerun()
         
-        elif st.session_state.login_status == "in_progress":
+        elif st.session_state.fb2_login_status == "in_progress":
             st.info("🔄 Login in progress...")
             col1, col2 = st.columns(2)
             with col1:
                 if st.button("✅ I'm Logged In", type="primary"):
-                    if st.session_state.extractor and st.session_state.extractor.check_login_status():
-                        st.session_state.login_status = "completed"
+                    if st.session_state.fb2_extractor and st.session_state.fb2_extractor.check_login_status():
+                        st.session_state.fb2_login_status = "completed"
                         st.success("✅ Login successful!")
                         st.rerun()
             with col2:
                 if st.button("❌ Cancel"):
-                    if st.session_state.extractor:
-                        st.session_state.extractor.close()
-                    st.session_state.login_status = "not_started"
+                    if st.session_state.fb2_extractor:
+                        st.session_state.fb2_extractor.close()
+                    st.session_state.fb2_login_status = "not_started"
                     st.rerun()
         
-        elif st.session_state.login_status == "completed":
+        elif st.session_state.fb2_login_status == "completed":
             st.success("✅ Logged in to Facebook")
         
         # Group extraction
         st.subheader("📝 Group Information")
         group_url = st.text_input("Facebook Group URL", placeholder="https://www.facebook.com/groups/groupname/")
         max_scrolls = st.slider("Number of scrolls", 5, 20, 10)
+        capture_label = st.radio("Capture mode", ["DOM", "Network (GraphQL)"])
+        capture_mode = "network" if capture_label == "Network (GraphQL)" else "dom"
         
         if st.button("🚀 Extract Group Data", type="primary", use_container_width=True):
-            if st.session_state.login_status != "completed":
+            if st.session_state.fb2_login_status != "completed":
                 st.error("❌ Please login to Facebook first")
             elif not group_url or "facebook.com/groups/" not in group_url:
                 st.error("❌ Please enter a valid Facebook group URL")
             else:
                 with st.spinner("🌐 Extracting group data..."):
-                    group_data = st.session_state.extractor.extract_group_data(group_url, max_scrolls)
+                    group_data = st.session_state.fb2_extractor.extract_group_data(group_url, max_scrolls, capture_mode)
                     if group_data.get("status") == "success":
-                        st.session_state.group_data = group_data
+                        st.session_state.fb2_group_data = group_data
+                        try:
+                            inserted, updated = get_post_store().upsert_posts(group_data["group_id"], group_data["posts"])
+                            st.info(f"💾 Post history: {inserted} new, {updated} updated")
+                        except Exception as e:
+                            st.warning(f"⚠️ Could not save posts to history: {e}")
                         vectorstore, chunks = process_group_data(group_data)
                         if vectorstore:
-                            st.session_state.chatbot = create_chatbot(vectorstore)
-                            st.session_state.chat_history = []
+                            st.session_state.fb2_chatbot = create_chatbot(vectorstore)
+                            st.session_state.fb2_chat_history = []
                             st.success(f"✅ Successfully extracted {len(group_data['posts'])} posts!")
     
     # Main content
@@ -404,16 +639,16 @@ def main():
     with col1:
         st.header("📊 Status")
         
-        if st.session_state.login_status == "not_started":
+        if st.session_state.fb2_login_status == "not_started":
             st.info("🔐 Start manual login to begin")
-        elif st.session_state.login_status == "in_progress":
+        elif st.session_state.fb2_login_status == "in_progress":
             st.warning("🔄 Complete login in the browser")
-        elif st.session_state.login_status == "completed":
+        elif st.session_state.fb2_login_status == "completed":
             st.success("✅ Ready to extract group data")
             
-            if st.session_state.group_data:
-                group_info = st.session_state.group_data.get("group_info", {})
-                posts = st.session_state.group_data.get("posts", [])
+            if st.session_state.fb2_group_data:
+                group_info = st.session_state.fb2_group_data.get("group_info", {})
+                posts = st.session_state.fb2_group_data.get("posts", [])
                 
                 st.subheader("🏷️ Group Info")
                 if group_info.get("name"):
@@ -423,8 +658,8 @@ def main():
     with col2:
         st.header("💬 Chat")
         
-        if st.session_state.chatbot and st.session_state.group_data:
-            for i, chat in enumerate(st.session_state.chat_history):
+        if st.session_state.fb2_chatbot and st.session_state.fb2_group_data:
+            for i, chat in enumerate(st.session_state.fb2_chat_history):
                 with st.chat_message("user"):
                     st.write(chat["question"])
                 with st.chat_message("assistant"):
@@ -437,10 +672,11 @@ def main():
                 with st.chat_message("assistant"):
                     with st.spinner("🤔 Analyzing..."):
                         try:
-                            response = st.session_state.chatbot.invoke({"question": user_question})
+                            response = submit_chat(BACKEND_MODELS[st.session_state.get('llm_backend', LLM_BACKEND)],
+                                                   st.session_state.fb2_chatbot, {"question": user_question})
                             answer = response.get("answer", "No response generated.")
                             st.write(answer)
-                            st.session_state.chat_history.append({
+                            st.session_state.fb2_chat_history.append({
                                 "question": user_question,
                                 "answer": answer
                             })
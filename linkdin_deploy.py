@@ -1,17 +1,24 @@
 # linkdin_deploy.py
 import streamlit as st
-import requests
-from bs4 import BeautifulSoup
-from langchain_text_splitters import CharacterTextSplitter
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_community.vectorstores import FAISS
-from langchain.memory import ConversationBufferMemory
-from langchain.chains import ConversationalRetrievalChain
-from langchain_core.documents import Document
-from langchain_community.llms import HuggingFaceHub
-import re
+from llm_backends import BACKEND_MODELS, LLM_BACKEND, LLM_BACKENDS, create_llm
+from llm_broker import render_queue_status, submit_chat
+from embedding_pipeline import build_vectorstore, load_embeddings
+from import_preloader import render_import_report, start_preloader
+from linkedin_parser import parse_linkedin_html
+from linkedin_batch import (FETCH_WORKERS, HOST_INTERVAL_SECONDS, BatchCheckpoint, iter_batch_documents,
+                            load_url_file, make_record_filter, make_session, record_matches,
+                            run_batch, structured_records)
+import os
 import time
 
+# How long a fetched page, its parsed text and its vector store are reused across sessions
+LINKEDIN_CACHE_TTL = int(os.environ.get("LINKEDIN_CACHE_TTL", "3600"))
+# Imported on first use and in the background once the first page has rendered
+HEAVY_MODULES = (
+    "langchain_text_splitters", "langchain_core.documents", "vector_index", "langchain.chains",
+    "langchain_community.embeddings", "reranker", "chat_memory", "question_router", "sentence_transformers"
+)
+
 # Configure the page
 st.set_page_config(
     page_title="LinkedIn AI Analyzer",
@@ -32,111 +39,165 @@ st.markdown("""
 
 def get_embeddings():
     try:
-        embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
-        return embeddings
+        return load_embeddings()
     except Exception as e:
         st.error(f"❌ Failed to load embeddings: {e}")
         return None
 
 def get_llm():
+    backend = st.session_state.get('llm_backend', LLM_BACKEND)
     api_key = st.session_state.get('hf_api_key')
-    if not api_key:
+    if backend == "hub" and not api_key:
         st.error("❌ HuggingFace API Key not found")
         return None
     
     try:
-        llm = HuggingFaceHub(
-            repo_id="google/flan-t5-large",
-            huggingfacehub_api_token=api_key,
-            model_kwargs={"temperature": 0.7, "max_length": 500}
-        )
-        return llm
+        return create_llm(backend, api_key=api_key, max_length=500)
     except Exception as e:
-        st.error(f"❌ HuggingFace error: {e}")
+        st.error(f"❌ {LLM_BACKENDS.get(backend, backend)} error: {e}")
         return None
 
+@st.cache_resource
+def get_http_session():
+    """Pooled keep-alive session shared by every session in this process"""
+    return make_session()
+
+@st.cache_data(ttl=LINKEDIN_CACHE_TTL, max_entries=256, show_spinner=False)
+def fetch_linkedin_page(url):
+    """Page HTML, shared across sessions until the TTL expires; failed fetches raise and are not cached"""
+    response = get_http_session().get(url, timeout=15)
+    if response.status_code != 200:
+        raise RuntimeError(f"Failed to access page (Status: {response.status_code})")
+    return response.text
+
+@st.cache_data(ttl=LINKEDIN_CACHE_TTL, max_entries=256, show_spinner=False)
+def parse_linkedin_page(url, data_type):
+    """Report text for the page; pages with nothing to extract raise so the failure is not cached"""
+    text = parse_linkedin_html(fetch_linkedin_page(url), url, data_type)
+    if text.startswith("❌"):
+        raise RuntimeError(text.lstrip("❌ "))
+    return text
+
 def extract_linkedin_data(url, data_type):
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=15)
-        if response.status_code != 200:
-            return f"❌ Failed to access page (Status: {response.status_code})"
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        for script in soup(["script", "style"]):
-            script.decompose()
-        
-        text = soup.get_text()
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = ' '.join(chunk for chunk in chunks if chunk)
-        
-        paragraphs = text.split('.')
-        meaningful_content = [p.strip() for p in paragraphs if len(p.strip()) > 50]
-        
-        if not meaningful_content:
-            return "❌ No meaningful content found."
-        
-        if data_type == "profile":
-            result = "👤 LINKEDIN PROFILE DATA\n\n"
-        elif data_type == "company":
-            result = "🏢 LINKEDIN COMPANY DATA\n\n"
-        else:
-            result = "📝 LINKEDIN POST DATA\n\n"
-        
-        result += f"🔗 URL: {url}\n"
-        result += "="*50 + "\n\n"
-        
-        for i, content in enumerate(meaningful_content[:10], 1):
-            result += f"{i}. {content}\n\n"
-        
-        result += "="*50 + "\n"
-        result += f"✅ Extracted {len(meaningful_content)} content blocks\n"
-        
-        return result
-        
+        return parse_linkedin_page(url, data_type)
+    except RuntimeError as e:
+        return f"❌ {str(e)}"
     except Exception as e:
         return f"❌ Error: {str(e)}"
 
 def get_text_chunks(text):
     if not text.strip():
         return []
+    from langchain_text_splitters import CharacterTextSplitter
     splitter = CharacterTextSplitter(separator="\n", chunk_size=1000, chunk_overlap=200)
     return splitter.split_text(text)
 
-def get_vectorstore(text_chunks):
+@st.cache_resource(ttl=LINKEDIN_CACHE_TTL, max_entries=32, show_spinner=False)
+def build_url_vectorstore(url, data_type, _text_chunks):
+    """FAISS index per (url, data_type), shared read-only by every session.
+
+    The chunks are not hashed: they are derived from the cached page for the same key.
+    """
+    from langchain_core.documents import Document
+    documents = [Document(page_content=chunk, metadata={"url": url}) for chunk in _text_chunks]
+    vectorstore, _ = build_vectorstore(documents, load_embeddings(), total_hint=len(documents))
+    return vectorstore
+
+def get_vectorstore(url, data_type, text_chunks):
     if not text_chunks:
         return None
-    documents = [Document(page_content=chunk) for chunk in text_chunks]
+    try:
+        return build_url_vectorstore(url, data_type, text_chunks)
+    except Exception as e:
+        st.error(f"❌ Failed to build vector store: {e}")
+        return None
+
+def run_batch_extraction(uploaded_file, default_type, workers, host_interval, start_fresh):
+    """Fetch every URL in the uploaded file into one shared vector store"""
+    urls = load_url_file(uploaded_file.getvalue().decode("utf-8", errors="ignore"), default_type)
+    if not urls:
+        st.error("❌ No URLs found in file")
+        return None, None, []
+    
+    checkpoint = BatchCheckpoint.for_urls(urls)
+    if start_fresh:
+        checkpoint.reset()
+    resumed = checkpoint.counts()["ok"]
+    if resumed:
+        st.info(f"⏯️ Resuming: {resumed} of {len(urls)} URLs already extracted")
+    
+    progress_bar = st.progress(0.0, text="🌐 Fetching LinkedIn pages...")
+    def report(done, failed, total):
+        progress_bar.progress(done / total, text=f"🌐 {done}/{total} URLs processed · {failed} failed")
+    counts = run_batch(urls, checkpoint, report, fetch_workers=workers, host_interval=host_interval)
+    if not counts["ok"]:
+        st.error("❌ No content extracted")
+        return None, None, []
+    
     embeddings = get_embeddings()
     if embeddings is None:
-        return None
-    vectorstore = FAISS.from_documents(documents, embeddings)
-    return vectorstore
+        return None, None, []
+    embed_bar = st.progress(0.0, text="🧮 Embedding content...")
+    def report_embedding(done, total_hint, rate):
+        embed_bar.progress(min(done / total_hint, 1.0) if total_hint else 0.0,
+                           text=f"🧮 Embedded {done} chunks · {rate:.1f} chunks/s")
+    vectorstore, chunks = build_vectorstore(iter_batch_documents(checkpoint), embeddings,
+                                            total_hint=counts["ok"] * 2, progress_callback=report_embedding)
+    
+    summary = "📦 LINKEDIN BATCH DATA\n\n"
+    summary += f"✅ {counts['ok']} URLs extracted, ❌ {counts['failed']} failed\n"
+    summary += f"💾 Checkpoint: {checkpoint.path}\n"
+    records = structured_records(checkpoint)
+    summary += f"🗂️ {len(records)} structured records\n"
+    return vectorstore, summary, records
 
-def get_conversation_chain(vectorstore):
+def get_conversation_chain(vectorstore, search_filter=None):
     if vectorstore is None:
         return None
     try:
+        from langchain.chains import ConversationalRetrievalChain
+        from chat_memory import make_memory
+        from question_router import route_question_condensing
+        from reranker import make_retriever
+
         llm = get_llm()
         if llm is None:
             return None
         
-        memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
+        memory = make_memory(llm)
         chain = ConversationalRetrievalChain.from_llm(
             llm=llm,
-            retriever=vectorstore.as_retriever(search_kwargs={"k": 3}),
+            retriever=make_retriever(vectorstore, k=3, search_filter=search_filter),
             memory=memory,
             return_source_documents=True
         )
-        return chain
+        return route_question_condensing(chain)
     except Exception as e:
         st.error(f"❌ Error: {e}")
         return None
 
+def render_record_filters(records):
+    """Browse structured batch records and restrict the chat to a subset"""
+    st.markdown("### 🗂️ Records")
+    record_types = sorted({r["record_type"] for r in records})
+    industries = sorted({r["industry"] for r in records if r.get("industry")})
+    
+    chosen_types = st.multiselect("Type", record_types)
+    chosen_industries = st.multiselect("Industry", industries) if industries else []
+    min_followers = st.number_input("Min followers", min_value=0, value=0, step=1000)
+    
+    matching = [r for r in records if record_matches(r, chosen_types, chosen_industries, min_followers)]
+    st.dataframe([{k: v for k, v in r.items() if k != "description"} for r in matching], use_container_width=True)
+    
+    if st.button("🎯 Chat about these records"):
+        search_filter = make_record_filter(chosen_types, chosen_industries, min_followers)
+        conversation = get_conversation_chain(st.session_state.li_batch_vectorstore, search_filter)
+        if conversation:
+            st.session_state.li_conversation = conversation
+            st.session_state.li_chat_history = []
+            st.success(f"✅ Chat restricted to {len(matching)} records")
+
 def main():
     st.markdown("""
     <div class="main-header">
@@ -149,23 +210,36 @@ def main():
         st.info("Return to main dashboard")
         return
     
-    if not st.session_state.get('hf_api_key'):
+    if not st.session_state.get('hf_api_key') and LLM_BACKEND == "hub":
         st.error("❌ API Key not configured. Please go back to main dashboard.")
         return
     
+    preloader = start_preloader(HEAVY_MODULES)
+    
     # Initialize session state
-    if "conversation" not in st.session_state:
-        st.session_state.conversation = None
-    if "chat_history" not in st.session_state:
-        st.session_state.chat_history = []
-    if "processed" not in st.session_state:
-        st.session_state.processed = False
-    if "extracted_data" not in st.session_state:
-        st.session_state.extracted_data = ""
+    if "li_conversation" not in st.session_state:
+        st.session_state.li_conversation = None
+    if "li_chat_history" not in st.session_state:
+        st.session_state.li_chat_history = []
+    if "li_processed" not in st.session_state:
+        st.session_state.li_processed = False
+    if "li_extracted_data" not in st.session_state:
+        st.session_state.li_extracted_data = ""
     
     # Sidebar
     with st.sidebar:
-        st.success("✅ HuggingFace API Active")
+        if st.session_state.get('hf_api_key'):
+            st.success("✅ HuggingFace API Active")
+        backend_keys = list(LLM_BACKENDS)
+        st.session_state.llm_backend = st.selectbox(
+            "🧠 LLM Backend",
+            backend_keys,
+            index=backend_keys.index(LLM_BACKEND) if LLM_BACKEND in backend_keys else 0,
+            format_func=LLM_BACKENDS.get,
+            help="Run flan-t5 locally on CPU or use the Ollama server instead of remote HuggingFace calls"
+        )
+        render_queue_status()
+        render_import_report(preloader, __file__)
         
         data_type = st.selectbox("📊 Content Type", ["profile", "company", "post"])
         
@@ -182,25 +256,57 @@ def main():
                 st.warning("Please enter a LinkedIn URL")
             else:
                 with st.spinner("🔄 Extracting data..."):
+                    started = time.time()
+                    linkedin_url = linkedin_url.strip()
                     extracted_data = extract_linkedin_data(linkedin_url, data_type)
                     
                     if extracted_data and not extracted_data.startswith("❌"):
                         chunks = get_text_chunks(extracted_data)
                         if chunks:
-                            vectorstore = get_vectorstore(chunks)
+                            vectorstore = get_vectorstore(linkedin_url, data_type, chunks)
                             conversation = get_conversation_chain(vectorstore)
                             if conversation:
-                                st.session_state.conversation = conversation
-                                st.session_state.processed = True
-                                st.session_state.extracted_data = extracted_data
-                                st.session_state.chat_history = []
-                                st.success(f"✅ Ready to analyze {len(chunks)} content chunks!")
+                                st.session_state.li_conversation = conversation
+                                # A single URL replaces any earlier batch, so its record filters no longer apply
+                                st.session_state.li_batch_vectorstore = None
+                                st.session_state.li_batch_records = []
+                                st.session_state.li_processed = True
+                                st.session_state.li_extracted_data = extracted_data
+                                st.session_state.li_chat_history = []
+                                st.success(f"✅ Ready to analyze {len(chunks)} content chunks in {time.time() - started:.1f}s!")
                             else:
                                 st.error("❌ Failed to initialize AI")
                         else:
                             st.error("❌ No content extracted")
                     else:
                         st.error(extracted_data)
+        
+        st.caption(f"Pages and vector stores are reused for {LINKEDIN_CACHE_TTL // 60} min")
+        if st.button("🧹 Clear Cached Pages"):
+            fetch_linkedin_page.clear()
+            parse_linkedin_page.clear()
+            build_url_vectorstore.clear()
+            st.success("✅ Cache cleared")
+        
+        with st.expander("📦 Batch Mode"):
+            url_file = st.file_uploader("URL list (.txt or .csv)", type=["txt", "csv"])
+            workers = st.slider("Concurrent fetches", 1, 32, FETCH_WORKERS)
+            host_interval = st.number_input("Seconds between requests per host", 0.0, 10.0, HOST_INTERVAL_SECONDS, 0.5)
+            start_fresh = st.checkbox("Ignore checkpoint and start over", value=False)
+            if st.button("📦 Run Batch", type="primary"):
+                if url_file is None:
+                    st.warning("Please upload a URL file")
+                else:
+                    vectorstore, summary, records = run_batch_extraction(url_file, data_type, workers, host_interval, start_fresh)
+                    conversation = get_conversation_chain(vectorstore)
+                    if conversation:
+                        st.session_state.li_conversation = conversation
+                        st.session_state.li_batch_vectorstore = vectorstore
+                        st.session_state.li_batch_records = records
+                        st.session_state.li_processed = True
+                        st.session_state.li_extracted_data = summary
+                        st.session_state.li_chat_history = []
+                        st.success("✅ Batch ready to analyze!")
     
     # Main content
     col1, col2 = st.columns([2, 1])
@@ -208,39 +314,43 @@ def main():
     with col1:
         st.markdown("### 💬 Chat")
         
-        for i, chat in enumerate(st.session_state.chat_history):
+        for i, chat in enumerate(st.session_state.li_chat_history):
             if chat["role"] == "user":
                 st.markdown(f"**👤 You:** {chat['content']}")
             elif chat["role"] == "assistant":
                 if chat["content"]:
                     st.markdown(f"**🤖 Assistant:** {chat['content']}")
         
-        if st.session_state.processed:
+        if st.session_state.li_processed:
             user_input = st.chat_input("Ask about the LinkedIn data...")
             if user_input:
-                st.session_state.chat_history.append({"role": "user", "content": user_input})
+                st.session_state.li_chat_history.append({"role": "user", "content": user_input})
                 with st.spinner("🤔 Analyzing..."):
                     try:
-                        if st.session_state.conversation:
-                            response = st.session_state.conversation.invoke({"question": user_input})
+                        if st.session_state.li_conversation:
+                            response = submit_chat(BACKEND_MODELS[st.session_state.get('llm_backend', LLM_BACKEND)],
+                                                   st.session_state.li_conversation, {"question": user_input})
                             answer = response.get("answer", "No response generated.")
-                            st.session_state.chat_history.append({"role": "assistant", "content": answer})
+                            st.session_state.li_chat_history.append({"role": "assistant", "content": answer})
                             st.rerun()
                     except Exception as e:
-                        st.session_state.chat_history.append({"role": "assistant", "content": f"❌ Error: {str(e)}"})
+                        st.session_state.li_chat_history.append({"role": "assistant", "content": f"❌ Error: {str(e)}"})
                         st.rerun()
         else:
             st.info("👋 Enter a LinkedIn URL and click 'Extract & Analyze' to start")
     
     with col2:
-        if st.session_state.processed:
+        if st.session_state.li_processed:
             st.markdown("### 📊 Overview")
-            data = st.session_state.extracted_data
+            data = st.session_state.li_extracted_data
             chunks = get_text_chunks(data)
             
             st.metric("Content Type", data_type.title())
             st.metric("Text Chunks", len(chunks))
             st.metric("Characters", f"{len(data):,}")
+            
+            if st.session_state.get("li_batch_records"):
+                render_record_filters(st.session_state.li_batch_records)
 
 if __name__ == "__main__":
     main()
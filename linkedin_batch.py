@@ -0,0 +1,215 @@
+# linkedin_batch.py
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from linkedin_parser import infer_data_type, parse_linkedin_record, record_metadata
+
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+FETCH_WORKERS = int(os.environ.get("LINKEDIN_FETCH_WORKERS", "8"))
+PARSE_WORKERS = int(os.environ.get("LINKEDIN_PARSE_WORKERS", str(os.cpu_count() or 2)))
+HOST_INTERVAL_SECONDS = float(os.environ.get("LINKEDIN_HOST_INTERVAL", "1.0"))
+CHECKPOINT_DIR = os.environ.get("LINKEDIN_CHECKPOINT_DIR",
+                                os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "linkedin_batch"))
+
+def make_session(pool_size: int = FETCH_WORKERS, retries: int = 3) -> requests.Session:
+    """Keep-alive session with a connection pool sized to the fetch workers.
+
+    429 and 5xx responses are retried with exponential backoff, honouring Retry-After.
+    """
+    retry = Retry(total=retries, backoff_factor=1.0, status_forcelist=[429, 500, 502, 503, 504],
+                  allowed_methods=["GET"], respect_retry_after_header=True)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({'User-Agent': USER_AGENT})
+    return session
+
+class HostRateLimiter:
+    """Spaces requests to the same host at least `interval` seconds apart"""
+    def __init__(self, interval: float = HOST_INTERVAL_SECONDS):
+        self.interval = interval
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str):
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.time()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+def load_url_file(content: str, default_type: str = "profile") -> List[Tuple[str, str]]:
+    """(url, data_type) pairs from a text or CSV file, one URL per line, duplicates dropped"""
+    urls, seen = [], set()
+    for line in content.splitlines():
+        url = line.split(",")[0].strip().strip('"')
+        if not url.startswith("http") or url in seen:
+            continue
+        seen.add(url)
+        urls.append((url, infer_data_type(url, default_type)))
+    return urls
+
+class BatchCheckpoint:
+    """Append-only JSONL record of finished URLs, so an interrupted batch resumes where it stopped.
+
+    Parsed text is stored with each record; resuming re-embeds it without refetching.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.records: Dict[str, dict] = {}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        self.records[record["url"]] = record
+                    except (ValueError, KeyError):
+                        # A torn last line from a crash
+                        continue
+
+    @classmethod
+    def for_urls(cls, urls: List[Tuple[str, str]], directory: str = CHECKPOINT_DIR) -> "BatchCheckpoint":
+        """The same URL list always maps to the same checkpoint file"""
+        digest = hashlib.sha1("\n".join(url for url, _ in urls).encode()).hexdigest()[:16]
+        return cls(os.path.join(directory, f"{digest}.jsonl"))
+
+    def is_done(self, url: str) -> bool:
+        return self.records.get(url, {}).get("status") == "ok"
+
+    def record(self, url: str, data_type: str, status: str, text: str = "", error: str = "",
+               structured: Optional[dict] = None):
+        record = {"url": url, "data_type": data_type, "status": status, "text": text, "error": error,
+                  "structured": structured}
+        self.records[url] = record
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def counts(self) -> Dict[str, int]:
+        counts = {"ok": 0, "failed": 0}
+        for record in self.records.values():
+            counts[record["status"]] = counts.get(record["status"], 0) + 1
+        return counts
+
+    def reset(self):
+        self.records.clear()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+def fetch_page(session: requests.Session, limiter: HostRateLimiter, url: str) -> str:
+    limiter.wait(url)
+    response = session.get(url, timeout=15)
+    if response.status_code != 200:
+        raise RuntimeError(f"Status {response.status_code}")
+    return response.text
+
+def run_batch(urls: List[Tuple[str, str]], checkpoint: BatchCheckpoint,
+              progress_callback: Optional[Callable[[int, int, int], None]] = None,
+              fetch_workers: int = FETCH_WORKERS, parse_workers: int = PARSE_WORKERS,
+              host_interval: float = HOST_INTERVAL_SECONDS) -> Dict[str, int]:
+    """Fetch pending URLs on a thread pool and parse them on a process pool.
+
+    Results are written to the checkpoint from the calling thread as they
+    finish; progress_callback(done, failed, total) is called after each one.
+    """
+    pending = [(url, data_type) for url, data_type in urls if not checkpoint.is_done(url)]
+    total = len(urls)
+    done = total - len(pending)
+    failed = 0
+    if progress_callback:
+        progress_callback(done, failed, total)
+    if not pending:
+        return checkpoint.counts()
+
+    session = make_session(fetch_workers)
+    limiter = HostRateLimiter(host_interval)
+    fetch_pool = ThreadPoolExecutor(max_workers=fetch_workers, thread_name_prefix="linkedin-fetch")
+    parse_pool = ProcessPoolExecutor(max_workers=max(parse_workers, 1))
+    try:
+        jobs = {fetch_pool.submit(fetch_page, session, limiter, url): ("fetch", url, data_type)
+                for url, data_type in pending}
+        while jobs:
+            finished, _ = wait(jobs, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage, url, data_type = jobs.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.info(f"{stage} failed for {url}: {e}")
+                    checkpoint.record(url, data_type, "failed", error=str(e))
+                    failed += 1
+                    done += 1
+                else:
+                    if stage == "fetch":
+                        jobs[parse_pool.submit(parse_linkedin_record, result, url, data_type)] = ("parse", url, data_type)
+                        continue
+                    if result["text"].startswith("❌"):
+                        checkpoint.record(url, data_type, "failed", error=result["text"])
+                        failed += 1
+                    else:
+                        checkpoint.record(url, data_type, "ok", text=result["text"], structured=result["record"])
+                    done += 1
+                if progress_callback:
+                    progress_callback(done, failed, total)
+    finally:
+        # An aborted run (stopped script, failing callback) drops the URLs it has not started
+        fetch_pool.shutdown(cancel_futures=True)
+        parse_pool.shutdown(cancel_futures=True)
+        session.close()
+    return checkpoint.counts()
+
+def iter_batch_documents(checkpoint: BatchCheckpoint, chunk_size: int = 1000,
+                         chunk_overlap: int = 200) -> Iterator["Document"]:
+    """Chunks of every successfully parsed URL, tagged with their source URL, type and record fields"""
+    from langchain_core.documents import Document
+    from langchain_text_splitters import CharacterTextSplitter
+
+    splitter = CharacterTextSplitter(separator="\n", chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    for record in list(checkpoint.records.values()):
+        if record["status"] != "ok":
+            continue
+        metadata = {"url": record["url"], "data_type": record["data_type"]}
+        if record.get("structured"):
+            metadata.update(record_metadata(record["structured"]))
+        for chunk in splitter.split_text(record["text"]):
+            yield Document(page_content=f"[{record['url']}]\n{chunk}", metadata=dict(metadata))
+
+def structured_records(checkpoint: BatchCheckpoint) -> List[dict]:
+    """Typed records of every URL that had JSON-LD or OpenGraph metadata"""
+    return [record["structured"] for record in checkpoint.records.values()
+            if record["status"] == "ok" and record.get("structured")]
+
+def record_matches(record: dict, record_types: Optional[List[str]] = None, industries: Optional[List[str]] = None,
+                   min_followers: int = 0) -> bool:
+    """Works on both structured records and chunk metadata"""
+    if record_types and record.get("record_type") not in record_types:
+        return False
+    if industries and record.get("industry") not in industries:
+        return False
+    return (record.get("followers") or 0) >= min_followers
+
+def make_record_filter(record_types: Optional[List[str]] = None, industries: Optional[List[str]] = None,
+                       min_followers: int = 0) -> Optional[Callable[[dict], bool]]:
+    """Vector store metadata filter for the chosen record criteria, None when nothing is chosen"""
+    if not (record_types or industries or min_followers):
+        return None
+    return lambda metadata: record_matches(metadata, record_types, industries, min_followers)
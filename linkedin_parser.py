@@ -0,0 +1,278 @@
+# linkedin_parser.py
+import json
+import re
+from dataclasses import asdict, dataclass, fields
+from itertools import islice
+from typing import Iterator, Optional
+
+from bs4 import BeautifulSoup
+
+from text_normalizer import collapse_whitespace, iter_sentence_blocks
+
+DATA_TYPE_HEADERS = {
+    "profile": "👤 LINKEDIN PROFILE DATA",
+    "company": "🏢 LINKEDIN COMPANY DATA",
+    "post": "📝 LINKEDIN POST DATA"
+}
+
+MAX_CONTENT_BLOCKS = 10
+MAX_DESCRIPTION_CHARS = 1500
+FOLLOWERS_PATTERN = re.compile(r"([\d][\d,.]*)\s*([KkMm])?\s+followers")
+
+JSONLD_TYPES = {
+    "Person": "profile",
+    "Organization": "company",
+    "Corporation": "company",
+    "EducationalOrganization": "company",
+    "SocialMediaPosting": "post",
+    "DiscussionForumPosting": "post",
+    "Article": "post",
+    "NewsArticle": "post"
+}
+
+@dataclass
+class LinkedInProfile:
+    url: str
+    name: str = ""
+    headline: str = ""
+    company: str = ""
+    location: str = ""
+    followers: Optional[int] = None
+    description: str = ""
+    source: str = ""
+    record_type: str = "profile"
+
+@dataclass
+class LinkedInCompany:
+    url: str
+    name: str = ""
+    headline: str = ""
+    industry: str = ""
+    size: str = ""
+    location: str = ""
+    followers: Optional[int] = None
+    description: str = ""
+    source: str = ""
+    record_type: str = "company"
+
+@dataclass
+class LinkedInPost:
+    url: str
+    name: str = ""
+    headline: str = ""
+    author: str = ""
+    date: str = ""
+    likes: Optional[int] = None
+    comments: Optional[int] = None
+    description: str = ""
+    source: str = ""
+    record_type: str = "post"
+
+RECORD_CLASSES = {"profile": LinkedInProfile, "company": LinkedInCompany, "post": LinkedInPost}
+FIELD_LABELS = {
+    "name": "Name", "headline": "Headline", "company": "Company", "industry": "Industry",
+    "size": "Company size", "location": "Location", "followers": "Followers", "author": "Author",
+    "date": "Date", "likes": "Reactions", "comments": "Comments", "description": "About"
+}
+
+def infer_data_type(url: str, default: str = "profile") -> str:
+    """Content type from the LinkedIn URL path"""
+    if "/company/" in url or "/school/" in url:
+        return "company"
+    if "/posts/" in url or "/feed/update/" in url or "/pulse/" in url:
+        return "post"
+    if "/in/" in url:
+        return "profile"
+    return default
+
+def parse_count(value) -> Optional[int]:
+    """'12,345', '1.2K' or 3400 -> int"""
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = FOLLOWERS_PATTERN.search(f"{value} followers") if value else None
+    if not match:
+        return None
+    number = float(match.group(1).replace(",", ""))
+    multiplier = {"k": 1_000, "m": 1_000_000}.get((match.group(2) or "").lower(), 1)
+    return int(number * multiplier)
+
+def _name_of(value) -> str:
+    if isinstance(value, list):
+        value = value[0] if value else ""
+    if isinstance(value, dict):
+        return value.get("name", "")
+    return value or ""
+
+def _interaction_count(node: dict, action: str) -> Optional[int]:
+    statistics = node.get("interactionStatistic") or []
+    if isinstance(statistics, dict):
+        statistics = [statistics]
+    for stat in statistics:
+        interaction = stat.get("interactionType", "")
+        interaction = interaction.get("@type", "") if isinstance(interaction, dict) else interaction
+        if action in interaction:
+            return parse_count(stat.get("userInteractionCount"))
+    return None
+
+def _employee_range(value) -> str:
+    if isinstance(value, dict):
+        if value.get("value"):
+            return f"{value['value']} employees"
+        low, high = value.get("minValue"), value.get("maxValue")
+        if low or high:
+            return f"{low or 0}-{high} employees" if high else f"{low}+ employees"
+        return ""
+    return str(value) if value else ""
+
+def _location(value) -> str:
+    if isinstance(value, list):
+        value = value[0] if value else {}
+    if isinstance(value, dict):
+        value = value.get("address", value)
+        if isinstance(value, dict):
+            parts = [value.get("addressLocality"), value.get("addressRegion"), value.get("addressCountry")]
+            return ", ".join(_name_of(p) for p in parts if p)
+    return value if isinstance(value, str) else ""
+
+def iter_jsonld_nodes(soup) -> Iterator[dict]:
+    """Every typed JSON-LD node in the page, flattening lists and @graph"""
+    for script in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(script.string or "")
+        except ValueError:
+            continue
+        stack = [data]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, list):
+                stack.extend(item)
+            elif isinstance(item, dict):
+                if "@graph" in item:
+                    stack.append(item["@graph"])
+                if "@type" in item:
+                    yield item
+
+def _record_from_jsonld(node: dict, url: str):
+    types = node["@type"] if isinstance(node["@type"], list) else [node["@type"]]
+    record_type = next((JSONLD_TYPES[t] for t in types if t in JSONLD_TYPES), None)
+    if record_type == "profile":
+        return LinkedInProfile(
+            url=url, name=node.get("name", ""),
+            headline=node.get("jobTitle", "") if isinstance(node.get("jobTitle"), str) else _name_of(node.get("jobTitle")),
+            company=_name_of(node.get("worksFor")), location=_location(node.get("address")),
+            followers=_interaction_count(node, "Follow"), description=node.get("description", ""), source="json-ld"
+        )
+    if record_type == "company":
+        return LinkedInCompany(
+            url=url, name=node.get("name", ""), headline=node.get("slogan", ""),
+            industry=_name_of(node.get("industry") or node.get("knowsAbout")),
+            size=_employee_range(node.get("numberOfEmployees")), location=_location(node.get("address")),
+            followers=_interaction_count(node, "Follow"), description=node.get("description", ""), source="json-ld"
+        )
+    if record_type == "post":
+        return LinkedInPost(
+            url=url, name=node.get("name", ""), headline=node.get("headline", ""),
+            author=_name_of(node.get("author")), date=node.get("datePublished", ""),
+            likes=_interaction_count(node, "Like"), comments=_interaction_count(node, "Comment"),
+            description=node.get("articleBody") or node.get("text") or node.get("description", ""), source="json-ld"
+        )
+    return None
+
+def read_meta_tags(soup) -> dict:
+    """OpenGraph, article:* and description meta tags"""
+    meta = {}
+    for tag in soup.find_all("meta"):
+        key = tag.get("property") or tag.get("name")
+        if key and tag.get("content") and key not in meta:
+            meta[key] = tag["content"]
+    return meta
+
+def _fill_from_meta(record, meta: dict):
+    """Fill fields JSON-LD left empty (or build the record) from meta tags"""
+    title = meta.get("og:title") or meta.get("twitter:title", "")
+    # 'Jane Doe - Engineer at Acme | LinkedIn'
+    title_parts = [part.strip() for part in re.split(r"\s[-|–]\s", title) if part.strip() and part.strip() != "LinkedIn"]
+    description = meta.get("og:description") or meta.get("description", "")
+    if not record.name and title_parts:
+        record.name = title_parts[0]
+    if not record.headline and len(title_parts) > 1:
+        record.headline = title_parts[1]
+    if not record.description:
+        record.description = description
+    if hasattr(record, "followers") and record.followers is None:
+        match = FOLLOWERS_PATTERN.search(description)
+        record.followers = parse_count(match.group(0)) if match else None
+    if hasattr(record, "date") and not record.date:
+        record.date = meta.get("article:published_time", "")
+    if not record.source:
+        record.source = "opengraph"
+    return record
+
+def extract_structured_record(soup, url: str, data_type: str):
+    """Typed record from JSON-LD, topped up from meta tags; None when the page has neither"""
+    record = None
+    for node in iter_jsonld_nodes(soup):
+        candidate = _record_from_jsonld(node, url)
+        if candidate and candidate.name:
+            # Prefer a node of the type the URL points at (posts embed their author too)
+            if candidate.record_type == data_type:
+                record = candidate
+                break
+            record = record or candidate
+
+    meta = read_meta_tags(soup)
+    if record is None:
+        if not (meta.get("og:title") or meta.get("og:description")):
+            return None
+        record = RECORD_CLASSES.get(data_type, LinkedInPost)(url=url)
+    _fill_from_meta(record, meta)
+    record.description = collapse_whitespace(record.description)[:MAX_DESCRIPTION_CHARS]
+    return record if record.name else None
+
+def record_metadata(record: dict) -> dict:
+    """Non-empty record fields except free text, for vector store metadata filtering"""
+    return {key: value for key, value in record.items() if value not in ("", None) and key != "description"}
+
+def format_record(record) -> str:
+    result = DATA_TYPE_HEADERS.get(record.record_type, DATA_TYPE_HEADERS["post"]) + "\n\n"
+    result += f"🔗 URL: {record.url}\n"
+    result += "="*50 + "\n\n"
+    for field in fields(record):
+        value = getattr(record, field.name)
+        if field.name in FIELD_LABELS and value not in ("", None):
+            result += f"{FIELD_LABELS[field.name]}: {value:,}\n" if isinstance(value, int) else f"{FIELD_LABELS[field.name]}: {value}\n"
+    result += "\n" + "="*50 + "\n"
+    result += f"✅ Structured data from {record.source}\n"
+    return result
+
+def parse_linkedin_record(html: str, url: str, data_type: str) -> dict:
+    """{'text': report, 'record': dict or None}; structured metadata first, sentence heuristic as fallback.
+
+    Module-level and free of Streamlit so batch mode can run it in worker processes.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    record = extract_structured_record(soup, url, data_type)
+    if record is not None:
+        return {"text": format_record(record), "record": asdict(record)}
+
+    # One lazy pass over the tree; stops after the blocks we keep
+    meaningful_content = list(islice(iter_sentence_blocks(soup, min_length=50), MAX_CONTENT_BLOCKS))
+
+    if not meaningful_content:
+        return {"text": "❌ No meaningful content found.", "record": None}
+
+    result = DATA_TYPE_HEADERS.get(data_type, DATA_TYPE_HEADERS["post"]) + "\n\n"
+    result += f"🔗 URL: {url}\n"
+    result += "="*50 + "\n\n"
+
+    for i, content in enumerate(meaningful_content, 1):
+        result += f"{i}. {content}\n\n"
+
+    result += "="*50 + "\n"
+    result += f"✅ Extracted {len(meaningful_content)} content blocks\n"
+
+    return {"text": result, "record": None}
+
+def parse_linkedin_html(html: str, url: str, data_type: str) -> str:
+    """Turn a fetched LinkedIn page into the report text fed to the chunker"""
+    return parse_linkedin_record(html, url, data_type)["text"]
@@ -0,0 +1,190 @@
+# llm_backends.py
+import argparse
+import json
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+LLM_BACKEND = os.environ.get("LLM_BACKEND", "hub")
+LLM_BACKENDS = {"hub": "HuggingFace Hub", "local": "Local (CPU)", "ollama": "Ollama"}
+HUB_MODEL = "google/flan-t5-large"
+LOCAL_MODEL = os.environ.get("LOCAL_LLM_MODEL", HUB_MODEL)
+LOCAL_QUANTIZE = os.environ.get("LOCAL_LLM_INT8", "1") != "0"
+LOCAL_ONNX = os.environ.get("LOCAL_LLM_ONNX", "0") == "1"
+LOCAL_MAX_BATCH = int(os.environ.get("LOCAL_LLM_MAX_BATCH", "8"))
+LOCAL_BATCH_WAIT_MS = int(os.environ.get("LOCAL_LLM_BATCH_WAIT_MS", "20"))
+OLLAMA_BASE_URL = os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434")
+OLLAMA_MODEL = os.environ.get("OLLAMA_MODEL", "llama2")
+BACKEND_MODELS = {"hub": HUB_MODEL, "local": LOCAL_MODEL, "ollama": OLLAMA_MODEL}
+
+@lru_cache(maxsize=2)
+def load_local_pipeline(model_name: str = LOCAL_MODEL):
+    """Load a transformers generation pipeline on CPU once per process.
+
+    Uses ONNX Runtime when LOCAL_LLM_ONNX=1 and optimum is installed,
+    otherwise dynamic int8 quantisation of the linear layers.
+    """
+    from transformers import AutoConfig, AutoModelForCausalLM, AutoModelForSeq2SeqLM, AutoTokenizer, pipeline
+
+    config = AutoConfig.from_pretrained(model_name)
+    task = "text2text-generation" if config.is_encoder_decoder else "text-generation"
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+
+    model = None
+    if LOCAL_ONNX:
+        try:
+            from optimum.onnxruntime import ORTModelForCausalLM, ORTModelForSeq2SeqLM
+            ort_class = ORTModelForSeq2SeqLM if config.is_encoder_decoder else ORTModelForCausalLM
+            model = ort_class.from_pretrained(model_name, export=True)
+        except ImportError:
+            logger.warning("optimum[onnxruntime] not installed, falling back to PyTorch")
+
+    if model is None:
+        import torch
+        model_class = AutoModelForSeq2SeqLM if config.is_encoder_decoder else AutoModelForCausalLM
+        model = model_class.from_pretrained(model_name)
+        model.eval()
+        if LOCAL_QUANTIZE:
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    return pipeline(task, model=model, tokenizer=tokenizer, device=-1)
+
+class PromptBatcher:
+    """Groups prompts arriving within a short window into one pipeline call"""
+    def __init__(self, pipe, max_batch: int = LOCAL_MAX_BATCH, wait_ms: int = LOCAL_BATCH_WAIT_MS, **generate_kwargs):
+        self.pipe = pipe
+        self.max_batch = max_batch
+        self.wait_seconds = wait_ms / 1000
+        self.generate_kwargs = generate_kwargs
+        self._requests = queue.Queue()
+        threading.Thread(target=self._worker, daemon=True, name="llm-batcher").start()
+
+    def submit(self, prompt: str) -> str:
+        future = Future()
+        self._requests.put((prompt, future))
+        return future.result()
+
+    def _worker(self):
+        while True:
+            batch = [self._requests.get()]
+            try:
+                while len(batch) < self.max_batch:
+                    batch.append(self._requests.get(timeout=self.wait_seconds))
+            except queue.Empty:
+                pass
+
+            prompts = [prompt for prompt, _ in batch]
+            try:
+                outputs = self.pipe(prompts, batch_size=len(prompts), **self.generate_kwargs)
+                for (prompt, future), output in zip(batch, outputs):
+                    text = (output[0] if isinstance(output, list) else output)["generated_text"]
+                    # Causal models echo the prompt
+                    future.set_result(text[len(prompt):].strip() if text.startswith(prompt) else text.strip())
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+
+@lru_cache(maxsize=4)
+def get_batcher(model_name: str, max_length: int) -> PromptBatcher:
+    return PromptBatcher(load_local_pipeline(model_name), max_new_tokens=max_length, do_sample=False)
+
+@lru_cache(maxsize=1)
+def _batched_local_llm_class():
+    # Defined on first use so importing this module for its constants does not load LangChain
+    from langchain_core.language_models.llms import LLM
+
+    class BatchedLocalLLM(LLM):
+        """LangChain LLM backed by the shared, batched local pipeline"""
+        model_name: str = LOCAL_MODEL
+        max_length: int = 512
+
+        @property
+        def _llm_type(self) -> str:
+            return "batched-local"
+
+        def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> str:
+            text = get_batcher(self.model_name, self.max_length).submit(prompt)
+            for token in stop or []:
+                text = text.split(token)[0]
+            return text
+
+    return BatchedLocalLLM
+
+def __getattr__(name: str):
+    if name == "BatchedLocalLLM":
+        return _batched_local_llm_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def create_llm(backend: str = LLM_BACKEND, api_key: Optional[str] = None, max_length: int = 512):
+    """Build the LLM for the chosen backend: 'hub', 'local' or 'ollama'"""
+    if backend == "local":
+        # Load (or reuse) the model now so the first question does not pay for it
+        get_batcher(LOCAL_MODEL, max_length)
+        return _batched_local_llm_class()(model_name=LOCAL_MODEL, max_length=max_length)
+    if backend == "ollama":
+        from langchain_community.llms.ollama import Ollama
+        return Ollama(model=OLLAMA_MODEL, base_url=OLLAMA_BASE_URL, temperature=0.7, num_predict=max_length)
+    if backend == "hub":
+        if not api_key:
+            raise ValueError("HuggingFace API Key not found")
+        from langchain_community.llms import HuggingFaceHub
+        return HuggingFaceHub(
+            repo_id=HUB_MODEL,
+            huggingfacehub_api_token=api_key,
+            model_kwargs={"temperature": 0.7, "max_length": max_length}
+        )
+    raise ValueError(f"Unknown LLM backend: {backend}")
+
+class _StubOllamaHandler(BaseHTTPRequestHandler):
+    """Minimal Ollama API for offline runs: echoes the end of each prompt"""
+    def _send_json(self, payload: dict):
+        body = (json.dumps(payload) + "\n").encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.startswith("/api/tags"):
+            self._send_json({"models": [{"name": OLLAMA_MODEL}]})
+        elif self.path.startswith("/api/ps"):
+            self._send_json({"models": []})
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if self.path.startswith("/api/generate"):
+            prompt = request.get("prompt", "")
+            self._send_json({
+                "model": request.get("model", OLLAMA_MODEL),
+                "response": f"[stub] {prompt.strip()[-200:]}",
+                "done": True
+            })
+        else:
+            self.send_error(404)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+def run_stub_server(port: int = 11435) -> ThreadingHTTPServer:
+    """Start the stub Ollama server on a background thread; point OLLAMA_BASE_URL at it"""
+    server = ThreadingHTTPServer(("127.0.0.1", port), _StubOllamaHandler)
+    threading.Thread(target=server.serve_forever, daemon=True, name="ollama-stub").start()
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline stub of the Ollama API")
+    parser.add_argument("--port", type=int, default=11435)
+    args = parser.parse_args()
+    print(f"Stub Ollama server on http://127.0.0.1:{args.port} - set OLLAMA_BASE_URL and LLM_BACKEND=ollama")
+    ThreadingHTTPServer(("127.0.0.1", args.port), _StubOllamaHandler).serve_forever()
@@ -0,0 +1,217 @@
+# llm_broker.py
+import hashlib
+import itertools
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from llm_backends import LOCAL_MAX_BATCH, LOCAL_MODEL
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 10
+
+LLM_MAX_QUEUE = int(os.environ.get("LLM_MAX_QUEUE", "32"))
+LLM_DEFAULT_CONCURRENCY = int(os.environ.get("LLM_DEFAULT_CONCURRENCY", "1"))
+LLM_REQUEST_TIMEOUT = float(os.environ.get("LLM_REQUEST_TIMEOUT", "240"))
+
+class BrokerBusyError(RuntimeError):
+    pass
+
+class BrokerTimeoutError(TimeoutError):
+    pass
+
+def _parse_model_limits(spec: str) -> Dict[str, int]:
+    """'llama2=1,mistral=2' -> {'llama2': 1, 'mistral': 2}"""
+    limits = {}
+    for item in spec.split(","):
+        if "=" in item:
+            model, limit = item.split("=", 1)
+            try:
+                limits[model.strip()] = max(1, int(limit))
+            except ValueError:
+                logger.warning(f"Ignoring bad concurrency limit {item!r}")
+    return limits
+
+class _Request:
+    __slots__ = ("fn", "future", "key", "enqueued_at", "waiters")
+
+    def __init__(self, fn: Callable[[], Any], key: Optional[Hashable]):
+        self.fn = fn
+        self.future = Future()
+        self.key = key
+        self.enqueued_at = time.time()
+        self.waiters = 0  # callers blocked on future, guarded by the broker lock
+
+class LLMBroker:
+    """Process-wide LLM request broker shared by every Streamlit session.
+
+    Each model gets its own priority queue drained by as many worker
+    threads as its concurrency limit. Identical requests (same key) that
+    are already queued or running share one result.
+    """
+    def __init__(self, max_queue: int = LLM_MAX_QUEUE, default_concurrency: int = LLM_DEFAULT_CONCURRENCY,
+                 model_limits: Optional[Dict[str, int]] = None):
+        self.max_queue = max_queue
+        self.default_concurrency = default_concurrency
+        self.model_limits = model_limits or {}
+        self._queues: Dict[str, queue.PriorityQueue] = {}
+        self._running: Dict[str, int] = {}
+        self._inflight: Dict[Hashable, _Request] = {}
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=100)
+        self._counters = {"completed": 0, "failed": 0, "coalesced": 0, "rejected": 0, "timed_out": 0}
+
+    def _model_queue(self, model: str) -> queue.PriorityQueue:
+        # Caller holds self._lock
+        if model not in self._queues:
+            self._queues[model] = queue.PriorityQueue()
+            self._running[model] = 0
+            for i in range(self.model_limits.get(model, self.default_concurrency)):
+                threading.Thread(target=self._worker, args=(model,), daemon=True, name=f"llm-{model}-{i}").start()
+        return self._queues[model]
+
+    def _pending(self) -> int:
+        return sum(q.qsize() for q in self._queues.values())
+
+    def submit(self, model: str, fn: Callable[[], Any], key: Optional[Hashable] = None,
+               priority: int = PRIORITY_INTERACTIVE, timeout: Optional[float] = LLM_REQUEST_TIMEOUT) -> Any:
+        """Run fn through the model's queue and wait for its result.
+
+        fn runs on a broker worker thread, so it must not touch st.session_state:
+        read what it needs on the script thread first (see submit_chat).
+        """
+        with self._lock:
+            request = self._inflight.get(key) if key is not None else None
+            if request is not None:
+                self._counters["coalesced"] += 1
+            else:
+                if self._pending() >= self.max_queue:
+                    self._counters["rejected"] += 1
+                    raise BrokerBusyError(f"LLM queue is full ({self.max_queue} requests waiting)")
+                request = _Request(fn, key)
+                self._model_queue(model).put((priority, next(self._sequence), request))
+                if key is not None:
+                    self._inflight[key] = request
+            request.waiters += 1
+
+        try:
+            return request.future.result(timeout=timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self._counters["timed_out"] += 1
+                # Later identical prompts start afresh instead of joining a request that is about to be dropped
+                if key is not None and self._inflight.get(key) is request:
+                    del self._inflight[key]
+                # Drop it if still queued and nobody else waits; a running call finishes in the background
+                if request.waiters == 1:
+                    request.future.cancel()
+            raise BrokerTimeoutError(f"LLM request to {model} timed out after {timeout:.0f}s")
+        except CancelledError:
+            raise BrokerTimeoutError(f"LLM request to {model} was dropped after a timeout")
+        finally:
+            with self._lock:
+                request.waiters -= 1
+
+    def _worker(self, model: str):
+        model_queue = self._queues[model]
+        while True:
+            _, _, request = model_queue.get()
+            if not request.future.set_running_or_notify_cancel():
+                self._forget(request)
+                continue
+            with self._lock:
+                self._running[model] += 1
+                self._waits.append(time.time() - request.enqueued_at)
+            try:
+                request.future.set_result(request.fn())
+                outcome = "completed"
+            except Exception as e:
+                request.future.set_exception(e)
+                outcome = "failed"
+            with self._lock:
+                self._running[model] -= 1
+                self._counters[outcome] += 1
+            self._forget(request)
+
+    def _forget(self, request: _Request):
+        if request.key is None:
+            return
+        with self._lock:
+            if self._inflight.get(request.key) is request:
+                del self._inflight[request.key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            waits = sorted(self._waits)
+            return {
+                "queued": self._pending(),
+                "running": sum(self._running.values()),
+                "per_model": {model: {"queued": q.qsize(), "running": self._running[model]}
+                              for model, q in self._queues.items()},
+                "avg_wait_s": sum(waits) / len(waits) if waits else 0.0,
+                "p95_wait_s": waits[int(len(waits) * 0.95)] if waits else 0.0,
+                **self._counters
+            }
+
+def llm_model_key(llm) -> str:
+    """Queue name for a LangChain LLM, matching the model names the apps pass in"""
+    for attr in ("model", "repo_id", "model_name"):
+        value = getattr(llm, attr, None)
+        if isinstance(value, str) and value:
+            return value
+    return type(llm).__name__
+
+_broker = None
+_broker_lock = threading.Lock()
+
+def get_broker() -> LLMBroker:
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            # The local pipeline batches concurrent prompts itself (PromptBatcher), so it
+            # needs as many callers in flight as it can batch rather than one at a time
+            model_limits = {LOCAL_MODEL: LOCAL_MAX_BATCH}
+            model_limits.update(_parse_model_limits(os.environ.get("LLM_MODEL_CONCURRENCY", "")))
+            _broker = LLMBroker(model_limits=model_limits)
+        return _broker
+
+def chat_request_key(model: str, chain, payload: dict) -> tuple:
+    """Coalescing key for a chat turn.
+
+    Includes the chain so that only repeats within one session (for example a
+    rerun resubmitting the same question) share a result: each session's chain
+    carries its own memory and documents.
+    """
+    digest = hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+    return (model, id(chain), digest)
+
+def submit_chat(model: str, chain, payload: dict, **kwargs) -> Any:
+    """chain.invoke(payload) through the broker; pass chain already read from session_state"""
+    kwargs.setdefault("key", chat_request_key(model, chain, payload))
+    return get_broker().submit(model, lambda: chain.invoke(payload), **kwargs)
+
+def render_queue_status():
+    """Sidebar panel with LLM queue depth and wait times"""
+    import streamlit as st
+
+    stats = get_broker().stats()
+    st.markdown("### 🚦 LLM Queue")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Queued", stats["queued"])
+        st.metric("Avg Wait", f"{stats['avg_wait_s']:.1f}s")
+    with col2:
+        st.metric("Running", stats["running"])
+        st.metric("p95 Wait", f"{stats['p95_wait_s']:.1f}s")
+    st.caption(f"Completed {stats['completed']} · Coalesced {stats['coalesced']} · "
+               f"Timed out {stats['timed_out']} · Rejected {stats['rejected']}")
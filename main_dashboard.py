@@ -1,40 +1,66 @@
 # main_dashboard.py
 import streamlit as st
-import subprocess
-import sys
 import os
 import webbrowser
-import time
-import threading
+from app_supervisor import AppSupervisor
 
-def check_port_in_use(port: int) -> bool:
-    import socket
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.settimeout(1)
-        return s.connect_ex(('localhost', port)) == 0
+EXTRACTOR_APPS = {
+    "linkedin": ("linkdin_deploy.py", 8601),
+    "facebook": ("facebook_deploy.py", 8701),
+    "facebook_pro": ("let_deploy.py", 8801),
+}
+EXTRACTOR_TITLES = {
+    "linkedin": ("LinkedIn Extractor", "💼"),
+    "facebook": ("Facebook Extractor", "📘"),
+    "facebook_pro": ("Facebook Extractor 2.0", "🔥"),
+}
 
-def get_available_port(start_port: int = 8601) -> int:
-    port = start_port
-    while check_port_in_use(port):
-        port += 1
-    return port
+@st.cache_resource
+def get_supervisor() -> AppSupervisor:
+    """One supervisor per dashboard process, shared by every session and rerun"""
+    return AppSupervisor(EXTRACTOR_APPS)
 
-def run_streamlit_app_in_thread(app_file: str, port: int):
-    def run_app():
-        try:
-            subprocess.run([
-                sys.executable, "-m", "streamlit", "run", 
-                app_file, 
-                "--server.port", str(port),
-                "--server.headless", "true",
-                "--browser.serverAddress", "localhost"
-            ], check=True)
-        except subprocess.CalledProcessError as e:
-            print(f"Error running {app_file}: {e}")
-    
-    thread = threading.Thread(target=run_app, daemon=True)
-    thread.start()
-    return thread
+def launch_extractor(name: str, label: str):
+    app_file = EXTRACTOR_APPS[name][0]
+    if not st.session_state.get('hf_api_key'):
+        st.error("❌ Please enter your HuggingFace API Key first")
+    elif not os.path.exists(app_file):
+        st.error(f"❌ {app_file} file not found!")
+    elif st.session_state.get("single_process"):
+        # multipage_app.py: extractors are pages of this server
+        st.switch_page(app_file)
+    else:
+        supervisor = get_supervisor()
+        reused = supervisor.apps[name].is_alive()
+        app = supervisor.ensure_running(name)
+        with st.spinner(f"Starting {label}..."):
+            ready = supervisor.wait_ready(name)
+        if ready:
+            webbrowser.open_new_tab(f"http://localhost:{app.port}")
+            st.success(f"✅ {label} {'already running' if reused else 'launched'}!")
+        else:
+            st.error(f"❌ {label} did not become ready")
+
+def render_child_status(name: str, title: str):
+    st.markdown(f"### {title}")
+    if st.session_state.get("single_process"):
+        st.info("📄 Runs as a page of this server")
+        return
+    stats = get_supervisor().stats()[name]
+    if stats["pid"]:
+        icon = "✅" if stats["status"] == "running" else "⏳"
+        st.success(f"{icon} {stats['status'].title()} on port {stats['port']}")
+        st.caption(f"PID {stats['pid']} · RSS {stats['rss_mb']:.0f} MB · CPU {stats['cpu_percent']:.0f}% · "
+                   f"up {stats['uptime_s'] / 60:.0f} min · restarts {stats['restarts']}")
+        if st.button("⏹️ Stop", key=f"stop_{name}"):
+            get_supervisor().stop(name)
+            st.rerun()
+    elif stats["status"] == "crashed":
+        st.error(f"💥 Crashed {stats['restarts']} times, not restarting")
+    elif stats["status"] == "idle-stopped":
+        st.info("💤 Stopped after being idle")
+    else:
+        st.info("💤 Not running")
 
 def main():
     st.set_page_config(
@@ -87,14 +113,6 @@ def main():
     </div>
     """, unsafe_allow_html=True)
     
-    # Initialize session state
-    if 'linkedin_port' not in st.session_state:
-        st.session_state.linkedin_port = None
-    if 'facebook_port' not in st.session_state:
-        st.session_state.facebook_port = None
-    if 'facebook_pro_port' not in st.session_state:
-        st.session_state.facebook_pro_port = None
-    
     # Platform selection
     st.markdown("## 🚀 Launch Extractors")
     
@@ -115,19 +133,7 @@ def main():
         """, unsafe_allow_html=True)
         
         if st.button("🚀 Launch LinkedIn Extractor", key="linkedin_btn", use_container_width=True):
-            if not st.session_state.get('hf_api_key'):
-                st.error("❌ Please enter your HuggingFace API Key first")
-            else:
-                if os.path.exists("linkdin_deploy.py"):
-                    port = get_available_port(8601)
-                    st.session_state.linkedin_port = port
-                    with st.spinner(f"Starting LinkedIn extractor..."):
-                        run_streamlit_app_in_thread("linkdin_deploy.py", port)
-                        time.sleep(3)
-                        webbrowser.open_new_tab(f"http://localhost:{port}")
-                        st.success(f"✅ LinkedIn extractor launched!")
-                else:
-                    st.error("❌ linkdin_deploy.py file not found!")
+            launch_extractor("linkedin", "LinkedIn extractor")
 
     with col2:
         st.markdown("""
@@ -144,19 +150,7 @@ def main():
         """, unsafe_allow_html=True)
         
         if st.button("🚀 Launch Facebook Extractor", key="facebook_btn", use_container_width=True):
-            if not st.session_state.get('hf_api_key'):
-                st.error("❌ Please enter your HuggingFace API Key first")
-            else:
-                if os.path.exists("facebook_deploy.py"):
-                    port = get_available_port(8701)
-                    st.session_state.facebook_port = port
-                    with st.spinner(f"Starting Facebook extractor..."):
-                        run_streamlit_app_in_thread("facebook_deploy.py", port)
-                        time.sleep(3)
-                        webbrowser.open_new_tab(f"http://localhost:{port}")
-                        st.success(f"✅ Facebook extractor launched!")
-                else:
-                    st.error("❌ facebook_deploy.py file not found!")
+            launch_extractor("facebook", "Facebook extractor")
     
     with col3:
         st.markdown("""
@@ -173,19 +167,7 @@ def main():
         """, unsafe_allow_html=True)
         
         if st.button("🚀 Launch Facebook Extractor 2.0", key="facebook_pro_btn", use_container_width=True):
-            if not st.session_state.get('hf_api_key'):
-                st.error("❌ Please enter your HuggingFace API Key first")
-            else:
-                if os.path.exists("let_deploy.py"):
-                    port = get_available_port(8801)
-                    st.session_state.facebook_pro_port = port
-                    with st.spinner(f"Starting Facebook Extractor 2.0..."):
-                        run_streamlit_app_in_thread("let_deploy.py", port)
-                        time.sleep(3)
-                        webbrowser.open_new_tab(f"http://localhost:{port}")
-                        st.success(f"✅ Facebook Extractor 2.0 launched!")
-                else:
-                    st.error("❌ let_deploy.py file not found!")
+            launch_extractor("facebook_pro", "Facebook Extractor 2.0")
     
     # Status
     st.markdown("---")
@@ -194,25 +176,13 @@ def main():
     status_col1, status_col2, status_col3 = st.columns(3)
     
     with status_col1:
-        st.markdown("### 💼 LinkedIn")
-        if st.session_state.linkedin_port:
-            st.success(f"✅ Running on port {st.session_state.linkedin_port}")
-        else:
-            st.info("💤 Not running")
+        render_child_status("linkedin", "💼 LinkedIn")
     
     with status_col2:
-        st.markdown("### 📘 Facebook")
-        if st.session_state.facebook_port:
-            st.success(f"✅ Running on port {st.session_state.facebook_port}")
-        else:
-            st.info("💤 Not running")
+        render_child_status("facebook", "📘 Facebook")
     
     with status_col3:
-        st.markdown("### 🔥 Facebook 2.0")
-        if st.session_state.facebook_pro_port:
-            st.success(f"✅ Running on port {st.session_state.facebook_pro_port}")
-        else:
-            st.info("💤 Not running")
+        render_child_status("facebook_pro", "🔥 Facebook 2.0")
     
     # Instructions
     with st.expander("📋 How to Use", expanded=True):
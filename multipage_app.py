@@ -0,0 +1,22 @@
+# multipage_app.py
+"""Single-process mode: the dashboard and every extractor as pages of one server.
+
+    streamlit run multipage_app.py
+
+Pages share the process's loaded models and caches, and one session_state:
+only hf_api_key and llm_backend are meant to be shared, so each extractor
+prefixes its own keys (fb2_..., li_...).
+"""
+import os
+import streamlit as st
+from main_dashboard import EXTRACTOR_APPS, EXTRACTOR_TITLES
+
+st.session_state.single_process = True
+
+pages = [st.Page("main_dashboard.py", title="Dashboard", icon="🔍", default=True)]
+for name, (app_file, _) in EXTRACTOR_APPS.items():
+    if os.path.exists(app_file):
+        title, icon = EXTRACTOR_TITLES[name]
+        pages.append(st.Page(app_file, title=title, icon=icon, url_path=name))
+
+st.navigation(pages).run()
@@ -0,0 +1,211 @@
+# ollama_models.py
+import logging
+import os
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import psutil
+import requests
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+OLLAMA_BASE_URL = os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434")
+# Long enough to span a chat session's pauses, short enough to free RAM overnight
+OLLAMA_KEEP_ALIVE = os.environ.get("OLLAMA_KEEP_ALIVE", "30m")
+# Ollama's own default on CPU; set to match the server's OLLAMA_MAX_LOADED_MODELS
+OLLAMA_MAX_LOADED_MODELS = int(os.environ.get("OLLAMA_MAX_LOADED_MODELS", "3"))
+OLLAMA_STATUS_TTL = float(os.environ.get("OLLAMA_STATUS_TTL", "5"))
+SESSION_CLAIM_TTL = 30 * 60
+DEFAULT_MODELS = ["llama2", "mistral", "gemma", "llama3"]
+
+def _same_model(a: str, b: str) -> bool:
+    """'llama2' and 'llama2:latest' name the same model"""
+    return a.split(":latest")[0] == b.split(":latest")[0]
+
+def _is_local(base_url: str) -> bool:
+    return urlparse(base_url).hostname in ("localhost", "127.0.0.1", "::1", "0.0.0.0")
+
+class OllamaStatusService:
+    """Polls /api/tags and /api/ps on a background thread.
+
+    Streamlit reruns read the latest snapshot and never wait on Ollama;
+    the snapshot is at most `ttl` seconds old. Until the first check
+    finishes, "running" is None (unknown).
+    """
+    def __init__(self, base_url: str = OLLAMA_BASE_URL, ttl: float = OLLAMA_STATUS_TTL):
+        self.base_url = base_url
+        self.ttl = ttl
+        self._snapshot = {"running": None, "models": {}, "resident": [], "checked_at": 0.0}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        threading.Thread(target=self._run, daemon=True, name="ollama-status").start()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._snapshot)
+
+    def refresh(self) -> dict:
+        """Query Ollama now and store the result"""
+        snapshot = {"running": False, "models": {}, "resident": [], "checked_at": time.time()}
+        try:
+            response = requests.get(f"{self.base_url}/api/tags", timeout=2)
+            if response.status_code == 200:
+                snapshot["running"] = True
+                snapshot["models"] = {m["name"]: m.get("size", 0) for m in response.json().get("models", [])}
+                response = requests.get(f"{self.base_url}/api/ps", timeout=2)
+                if response.status_code == 200:
+                    snapshot["resident"] = response.json().get("models", [])
+        except Exception:
+            pass
+        with self._lock:
+            self._snapshot = snapshot
+        return snapshot
+
+    def request_refresh(self):
+        """Refresh on the background thread without waiting for the next tick"""
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self.refresh()
+            self._wake.wait(self.ttl)
+            self._wake.clear()
+
+@st.cache_resource
+def get_status_service() -> OllamaStatusService:
+    return OllamaStatusService()
+
+class OllamaModelManager:
+    """Preloads models, tracks which are resident and which sessions use them.
+
+    Sessions claim the model they have selected; before loading another
+    model we check /api/ps and report resident models other sessions
+    still rely on that Ollama would have to unload to make room.
+    """
+    def __init__(self, status: OllamaStatusService, keep_alive: str = OLLAMA_KEEP_ALIVE,
+                 max_loaded: int = OLLAMA_MAX_LOADED_MODELS):
+        self.status = status
+        self.base_url = status.base_url
+        self.keep_alive = keep_alive
+        self.max_loaded = max_loaded
+        self.local = _is_local(self.base_url)
+        self._claims: Dict[str, tuple] = {}  # session_id -> (model, last_seen)
+        self._load_state: Dict[str, str] = {}  # model -> loading / ready / failed
+        self._lock = threading.Lock()
+
+    def resident_models(self) -> List[dict]:
+        """Models currently loaded in Ollama, from the last /api/ps snapshot"""
+        return self.status.snapshot()["resident"]
+
+    def model_sizes(self) -> Dict[str, int]:
+        """Installed models and their on-disk size, from the last /api/tags snapshot"""
+        return self.status.snapshot()["models"]
+
+    def claim(self, session_id: str, model: str):
+        with self._lock:
+            self._claims[session_id] = (model, time.time())
+
+    def release(self, session_id: str):
+        with self._lock:
+            self._claims.pop(session_id, None)
+
+    def _models_in_use(self, exclude_session: Optional[str] = None) -> set:
+        cutoff = time.time() - SESSION_CLAIM_TTL
+        with self._lock:
+            return {model for session_id, (model, seen) in self._claims.items()
+                    if session_id != exclude_session and seen >= cutoff}
+
+    def eviction_risk(self, session_id: str, model: str, resident: Optional[List[dict]] = None,
+                      sizes: Optional[Dict[str, int]] = None) -> List[str]:
+        """Resident models used by other sessions that loading `model` would unload"""
+        resident = self.resident_models() if resident is None else resident
+        if any(_same_model(m["name"], model) for m in resident):
+            return []
+
+        in_use = self._models_in_use(exclude_session=session_id)
+        # Ollama unloads the model closest to expiry first
+        candidates = sorted(resident, key=lambda m: m.get("expires_at", ""))
+        needed_bytes = (self.model_sizes() if sizes is None else sizes).get(model, 0)
+        # This host's free RAM says nothing about a remote server's; only the model cap applies there
+        free_bytes = psutil.virtual_memory().available if self.local else float("inf")
+
+        evicted = []
+        loaded = len(resident)
+        for entry in candidates:
+            if loaded < self.max_loaded and needed_bytes <= free_bytes:
+                break
+            evicted.append(entry["name"])
+            loaded -= 1
+            free_bytes += entry.get("size", 0)
+        return [name for name in evicted if any(_same_model(name, m) for m in in_use)]
+
+    def load_state(self, model: str) -> Optional[str]:
+        with self._lock:
+            return self._load_state.get(model)
+
+    def preload(self, model: str):
+        """Load the model in the background with our keep_alive, so the first prompt skips the load"""
+        with self._lock:
+            if self._load_state.get(model) == "loading":
+                return
+            self._load_state[model] = "loading"
+        threading.Thread(target=self._preload, args=(model,), daemon=True, name=f"ollama-preload-{model}").start()
+
+    def _preload(self, model: str):
+        try:
+            # A generate request without a prompt only loads the model
+            response = requests.post(f"{self.base_url}/api/generate",
+                                     json={"model": model, "keep_alive": self.keep_alive}, timeout=300)
+            response.raise_for_status()
+            state = "ready"
+        except Exception as e:
+            logger.warning(f"Preloading {model} failed: {e}")
+            state = "failed"
+        with self._lock:
+            self._load_state[model] = state
+        self.status.request_refresh()
+
+@st.cache_resource
+def get_model_manager() -> OllamaModelManager:
+    return OllamaModelManager(get_status_service())
+
+def render_model_lifecycle(model: str):
+    """Claim and preload the sidebar-selected model, warning before evicting another session's model"""
+    if "ollama_session_id" not in st.session_state:
+        st.session_state.ollama_session_id = uuid.uuid4().hex
+    session_id = st.session_state.ollama_session_id
+    manager = get_model_manager()
+    resident = manager.resident_models()
+
+    if model != st.session_state.get("warm_model"):
+        at_risk = manager.eviction_risk(session_id, model, resident)
+        if at_risk and not st.button(f"⚠️ Load {model} anyway", use_container_width=True):
+            st.warning(f"Loading **{model}** would unload {', '.join(at_risk)}, "
+                       f"which another session is using.")
+            return
+        # The previous model is no longer protected on this session's behalf
+        manager.release(session_id)
+        manager.preload(model)
+        st.session_state.warm_model = model
+    manager.claim(session_id, model)
+
+    resident_names = [m["name"] for m in resident]
+    state = manager.load_state(model)
+    if any(_same_model(name, model) for name in resident_names):
+        st.caption(f"🔥 {model} is loaded (keep-alive {manager.keep_alive})")
+    elif state == "loading":
+        st.caption(f"⏳ Loading {model} into memory...")
+    elif state == "failed":
+        st.caption(f"❌ Could not preload {model}")
+    if resident_names:
+        st.caption(f"Resident models: {', '.join(resident_names)}")
+
+def release_session_model():
+    """Drop this session's model claim when the session is reset"""
+    if "ollama_session_id" in st.session_state:
+        get_model_manager().release(st.session_state.ollama_session_id)
+    st.session_state.pop("warm_model", None)
@@ -0,0 +1,61 @@
+# post_chunker.py
+from typing import Iterator, List
+
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+def _post_header(index: int, post: dict) -> str:
+    parts = [f"Post {index + 1}"]
+    if post.get("author"):
+        parts.append(f"Author: {post['author']}")
+    if post.get("created_at"):
+        parts.append(f"Posted: {post['created_at'][:10]}")
+    parts.append(f"Reactions: {post.get('reactions', 0)}")
+    parts.append(f"Has Comments: {post.get('has_comments', False)}")
+    return " | ".join(parts)
+
+def iter_post_documents(group_data: dict, chunk_size: int = 1000, chunk_overlap: int = 100) -> Iterator[Document]:
+    """Lazily yield one Document per post, split only when a single post exceeds chunk_size.
+
+    Chunks never span two posts, so retrieval returns whole posts and no
+    text is duplicated across post boundaries.
+    """
+    group_name = group_data.get("group_info", {}).get("name", "Unknown")
+    posts = group_data.get("posts", [])
+
+    yield Document(
+        page_content=f"Group: {group_name}\nTotal Posts Extracted: {len(posts)}",
+        metadata={"group": group_name, "post_index": -1, "source": "group_info"}
+    )
+
+    for i, post in enumerate(posts):
+        content = post.get("content", "").strip()
+        if not content:
+            continue
+        header = _post_header(i, post)
+        metadata = {
+            "group": group_name,
+            "post_index": i,
+            "post_id": post.get("post_id", ""),
+            "source": post.get("source", "unknown"),
+            "reactions": post.get("reactions", 0),
+            "has_comments": bool(post.get("has_comments", False))
+        }
+
+        if len(header) + 1 + len(content) <= chunk_size:
+            pieces = [content]
+        else:
+            # Overlap only between sub-chunks of the same post
+            splitter = RecursiveCharacterTextSplitter(
+                chunk_size=max(chunk_size - len(header) - 1, 200),
+                chunk_overlap=chunk_overlap
+            )
+            pieces = splitter.split_text(content)
+        for part_index, piece in enumerate(pieces):
+            yield Document(
+                page_content="\n".join([header, piece]),
+                metadata={**metadata, "part": part_index, "parts": len(pieces)}
+            )
+
+def build_post_documents(group_data: dict, chunk_size: int = 1000, chunk_overlap: int = 100) -> List[Document]:
+    return list(iter_post_documents(group_data, chunk_size, chunk_overlap))
@@ -0,0 +1,84 @@
+# post_filter.py
+import bisect
+import os
+import re
+from collections import Counter
+from typing import List, Optional
+
+SEPARATOR = "\x00"
+WORD_PATTERN = re.compile(r"\S+")
+
+def load_excluded_phrases(default: List[str]) -> List[str]:
+    """Excluded phrases for this deployment, overridable via POST_FILTER_PHRASES (comma-separated)"""
+    configured = os.environ.get("POST_FILTER_PHRASES")
+    if not configured:
+        return list(default)
+    return [phrase.strip() for phrase in configured.split(",") if phrase.strip()]
+
+class PostFilter:
+    """Rejects UI chrome and navigation text using one compiled word-boundary matcher"""
+    def __init__(self, excluded_phrases: List[str], min_length: int = 50, min_words: int = 8):
+        self.excluded_phrases = [phrase.lower() for phrase in excluded_phrases]
+        self.min_length = min_length
+        self.min_words = min_words
+        self.rejections = Counter()
+        # Longest first so 'sign up' wins over a shorter overlapping phrase
+        alternation = "|".join(re.escape(p) for p in sorted(self.excluded_phrases, key=len, reverse=True))
+        # Lookarounds rather than \b, which never matches beside a phrase's own punctuation (c++, .net)
+        self._pattern = re.compile(rf"(?<!\w)(?:{alternation})(?!\w)", re.IGNORECASE) if alternation else None
+
+    def _has_min_words(self, text: str) -> bool:
+        count = 0
+        for _ in WORD_PATTERN.finditer(text):
+            count += 1
+            if count >= self.min_words:
+                return True
+        return False
+
+    def _check_shape(self, text: str) -> Optional[str]:
+        if not text:
+            return "empty"
+        if len(text) < self.min_length:
+            return "too_short"
+        if not self._has_min_words(text):
+            return "too_few_words"
+        return None
+
+    def check(self, text: str) -> Optional[str]:
+        """Return the rejection reason for a candidate, or None if it is a valid post"""
+        reason = self._check_shape(text)
+        if reason is None and self._pattern:
+            match = self._pattern.search(text)
+            if match:
+                reason = f"excluded:{match.group(0).lower()}"
+        if reason:
+            self.rejections[reason] += 1
+        return reason
+
+    def is_valid(self, text: str) -> bool:
+        return self.check(text) is None
+
+    def check_batch(self, texts: List[str]) -> List[Optional[str]]:
+        """Evaluate a whole scroll's candidates with a single regex pass"""
+        reasons = [self._check_shape(text) for text in texts]
+        candidates = [i for i, reason in enumerate(reasons) if reason is None]
+
+        if candidates and self._pattern:
+            # Scan all surviving texts joined together, then map match offsets back
+            starts, offset = [], 0
+            for i in candidates:
+                starts.append(offset)
+                offset += len(texts[i]) + 1
+            joined = SEPARATOR.join(texts[i] for i in candidates)
+            for match in self._pattern.finditer(joined):
+                index = candidates[bisect.bisect_right(starts, match.start()) - 1]
+                if reasons[index] is None:
+                    reasons[index] = f"excluded:{match.group(0).lower()}"
+
+        for reason in reasons:
+            if reason:
+                self.rejections[reason] += 1
+        return reasons
+
+    def rejection_report(self) -> dict:
+        return dict(self.rejections.most_common())
@@ -0,0 +1,210 @@
+# post_store.py
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.environ.get("POST_STORE_PATH",
+                                 os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "posts.db"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    group_id TEXT NOT NULL,
+    post_id TEXT NOT NULL,
+    content TEXT NOT NULL,
+    author TEXT,
+    permalink TEXT,
+    source TEXT,
+    created_at TEXT,
+    posted_at TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    reactions INTEGER DEFAULT 0,
+    comments INTEGER DEFAULT 0,
+    shares INTEGER DEFAULT 0,
+    has_comments INTEGER DEFAULT 0,
+    PRIMARY KEY (group_id, post_id)
+);
+CREATE INDEX IF NOT EXISTS idx_posts_group_posted ON posts(group_id, posted_at);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(content, content='posts', content_rowid='rowid');
+CREATE TRIGGER IF NOT EXISTS posts_ai AFTER INSERT ON posts BEGIN
+    INSERT INTO posts_fts(rowid, content) VALUES (new.rowid, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS posts_ad AFTER DELETE ON posts BEGIN
+    INSERT INTO posts_fts(posts_fts, rowid, content) VALUES ('delete', old.rowid, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS posts_au AFTER UPDATE OF content ON posts BEGIN
+    INSERT INTO posts_fts(posts_fts, rowid, content) VALUES ('delete', old.rowid, old.content);
+    INSERT INTO posts_fts(rowid, content) VALUES (new.rowid, new.content);
+END;
+"""
+
+UPSERT_SQL = """
+INSERT INTO posts (group_id, post_id, content, author, permalink, source, created_at, posted_at,
+                   first_seen, last_seen, reactions, comments, shares, has_comments)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(group_id, post_id) DO UPDATE SET
+    content = excluded.content,
+    author = COALESCE(NULLIF(excluded.author, ''), posts.author),
+    permalink = COALESCE(NULLIF(excluded.permalink, ''), posts.permalink),
+    created_at = COALESCE(posts.created_at, excluded.created_at),
+    last_seen = excluded.last_seen,
+    reactions = MAX(posts.reactions, excluded.reactions),
+    comments = MAX(posts.comments, excluded.comments),
+    shares = MAX(posts.shares, excluded.shares),
+    has_comments = MAX(posts.has_comments, excluded.has_comments)
+"""
+
+POST_COLUMNS = ["group_id", "post_id", "content", "author", "permalink", "source", "created_at",
+                "posted_at", "first_seen", "last_seen", "reactions", "comments", "shares", "has_comments"]
+
+def normalize_permalink(url: str) -> str:
+    parsed = urlparse(url)
+    return f"{parsed.netloc.lower().replace('m.facebook.com', 'www.facebook.com')}{parsed.path.rstrip('/')}"
+
+def make_post_id(post: dict) -> str:
+    """Stable post ID: the Facebook ID when known, else the permalink, else a content hash"""
+    if post.get("post_id"):
+        return str(post["post_id"])
+
+    permalink = post.get("permalink")
+    if permalink:
+        match = re.search(r"/(?:posts|permalink)/(\d+)", permalink)
+        if match:
+            return match.group(1)
+        return "url:" + hashlib.sha1(normalize_permalink(permalink).encode()).hexdigest()[:20]
+
+    normalized = " ".join(post.get("content", "").lower().split())
+    return "sha1:" + hashlib.sha1(normalized.encode()).hexdigest()[:20]
+
+def fts_query(text: str) -> str:
+    """User text as an FTS5 query: every word quoted, so don't / c++ match literally"""
+    return " ".join('"' + token.replace('"', '""') + '"' for token in text.split())
+
+def make_group_id(group_url: str) -> str:
+    """Group slug or numeric ID from a facebook.com/groups/... URL"""
+    match = re.search(r"/groups/([^/?#]+)", group_url or "")
+    return match.group(1) if match else (group_url or "unknown")
+
+class PostStore:
+    """SQLite store of extracted posts keyed by (group_id, post_id)"""
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self.fts_enabled = False
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            try:
+                self._conn.executescript(FTS_SCHEMA)
+                self.fts_enabled = True
+            except sqlite3.OperationalError as e:
+                logger.warning(f"FTS5 unavailable, full-text search disabled: {e}")
+
+    def upsert_posts(self, group_id: str, posts: List[dict]) -> Tuple[int, int]:
+        """Insert new posts and refresh existing ones; returns (inserted, updated)"""
+        now = datetime.now().isoformat()
+        inserted = updated = 0
+        with self._lock, self._conn:
+            for post in posts:
+                post_id = post.get("post_id") or make_post_id(post)
+                exists = self._conn.execute(
+                    "SELECT 1 FROM posts WHERE group_id = ? AND post_id = ?", (group_id, post_id)
+                ).fetchone()
+                created_at = post.get("created_at")
+                self._conn.execute(UPSERT_SQL, (
+                    group_id, post_id, post.get("content", ""), post.get("author", ""),
+                    post.get("permalink", ""), post.get("source", ""), created_at, created_at or now,
+                    now, now, int(post.get("reactions", 0) or 0), int(post.get("comments", 0) or 0),
+                    int(post.get("shares", 0) or 0), int(bool(post.get("has_comments")))
+                ))
+                if exists:
+                    updated += 1
+                else:
+                    inserted += 1
+        return inserted, updated
+
+    def iter_posts(self, group_id: Optional[str] = None, since: Optional[str] = None,
+                   until: Optional[str] = None, batch_size: int = 500) -> Iterator[dict]:
+        """Stream posts ordered by post time without loading the whole history"""
+        clauses, params = [], []
+        if group_id:
+            clauses.append("group_id = ?")
+            params.append(group_id)
+        if since:
+            clauses.append("posted_at >= ?")
+            params.append(since)
+        if until:
+            clauses.append("posted_at < ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        # Keyset pagination keeps the lock short and memory flat
+        last_key = ("", "")
+        while True:
+            page_params = params + [last_key[0], last_key[0], last_key[1]]
+            page_where = (where + " AND " if where else "WHERE ") + "(posted_at > ? OR (posted_at = ? AND post_id > ?))"
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT {', '.join(POST_COLUMNS)} FROM posts {page_where} "
+                    f"ORDER BY posted_at, post_id LIMIT ?", page_params + [batch_size]
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield dict(row)
+            last_key = (rows[-1]["posted_at"], rows[-1]["post_id"])
+
+    def search(self, query: str, group_id: Optional[str] = None, limit: int = 50) -> List[dict]:
+        """Full-text search over post content (substring match when FTS5 is unavailable)"""
+        if not query.strip():
+            return []
+        columns = ", ".join(f"p.{column}" for column in POST_COLUMNS)
+        with self._lock:
+            if self.fts_enabled:
+                sql = (f"SELECT {columns} FROM posts_fts f JOIN posts p ON p.rowid = f.rowid "
+                       f"WHERE posts_fts MATCH ?")
+                params = [fts_query(query)]
+            else:
+                sql = f"SELECT {columns} FROM posts p WHERE p.content LIKE ?"
+                params = [f"%{query}%"]
+            if group_id:
+                sql += " AND p.group_id = ?"
+                params.append(group_id)
+            sql += " ORDER BY p.posted_at DESC LIMIT ?"
+            params.append(limit)
+            try:
+                rows = self._conn.execute(sql, params).fetchall()
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Post search failed for {query!r}: {e}")
+                return []
+        return [dict(row) for row in rows]
+
+    def list_groups(self) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT group_id, COUNT(*) AS posts, MIN(posted_at) AS oldest, MAX(posted_at) AS newest "
+                "FROM posts GROUP BY group_id ORDER BY newest DESC"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,77 @@
+# question_router.py
+import logging
+import re
+import threading
+from typing import Any, Dict, List, Optional
+
+from langchain.chains.base import Chain
+from langchain_core.callbacks import CallbackManagerForChainRun
+
+logger = logging.getLogger(__name__)
+
+# Pronouns and follow-up phrasing that only make sense with the previous turns
+FOLLOW_UP_PATTERN = re.compile(
+    r"\b(it|its|they|them|their|theirs|this|that|these|those|he|him|his|she|her|hers|"
+    r"above|previous|previously|earlier|mentioned|same|else|more|another|other|"
+    r"what about|how about|and what|why not|elaborate|expand|continue|again)\b",
+    re.IGNORECASE
+)
+# References to the analysed source itself, not to earlier turns
+SUBJECT_PATTERN = re.compile(
+    r"\b(this|that|these|the)\s+(group|groups|website|site|page|pages|profile|company|post|posts|content)\b",
+    re.IGNORECASE
+)
+MIN_SELF_CONTAINED_WORDS = 4
+
+_stats_lock = threading.Lock()
+CONDENSE_STATS = {"condensed": 0, "skipped": 0}
+
+def needs_condensation(question: str) -> bool:
+    """True when a question likely refers back to the conversation"""
+    words = question.split()
+    if len(words) < MIN_SELF_CONTAINED_WORDS:
+        return True
+    return bool(FOLLOW_UP_PATTERN.search(SUBJECT_PATTERN.sub(" ", question)))
+
+def _record(outcome: str):
+    with _stats_lock:
+        CONDENSE_STATS[outcome] += 1
+
+def condense_skip_rate() -> float:
+    with _stats_lock:
+        total = CONDENSE_STATS["condensed"] + CONDENSE_STATS["skipped"]
+        return CONDENSE_STATS["skipped"] / total if total else 0.0
+
+class RoutedQuestionGenerator(Chain):
+    """Question generator that only calls the condensing LLM for follow-up questions.
+
+    ConversationalRetrievalChain already skips condensation on the first
+    turn; this also skips it for self-contained questions later on.
+    """
+    condenser: Chain
+    output_key: str = "text"
+
+    @property
+    def input_keys(self) -> List[str]:
+        return self.condenser.input_keys
+
+    @property
+    def output_keys(self) -> List[str]:
+        return [self.output_key]
+
+    def _call(self, inputs: Dict[str, Any], run_manager: Optional[CallbackManagerForChainRun] = None) -> Dict[str, str]:
+        question = inputs["question"]
+        if not needs_condensation(question):
+            _record("skipped")
+            logger.debug(f"Skipped condensing self-contained question: {question!r}")
+            return {self.output_key: question}
+
+        _record("condensed")
+        callbacks = run_manager.get_child() if run_manager else None
+        result = self.condenser.invoke(inputs, config={"callbacks": callbacks})
+        return {self.output_key: result[self.condenser.output_keys[0]]}
+
+def route_question_condensing(chain):
+    """Swap a ConversationalRetrievalChain's question generator for the routed one"""
+    chain.question_generator = RoutedQuestionGenerator(condenser=chain.question_generator)
+    return chain
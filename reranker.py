@@ -0,0 +1,198 @@
+# reranker.py
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, List, Optional
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+logger = logging.getLogger(__name__)
+
+RERANK_ENABLED = os.environ.get("RERANK_ENABLED", "1") != "0"
+RERANK_MODEL = os.environ.get("RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+RERANK_FETCH_K = int(os.environ.get("RERANK_FETCH_K", "50"))
+RERANK_BUDGET_MS = float(os.environ.get("RERANK_BUDGET_MS", "300"))
+RERANK_BATCH_SIZE = int(os.environ.get("RERANK_BATCH_SIZE", "16"))
+SCORE_CACHE_SIZE = 20000
+
+@lru_cache(maxsize=2)
+def load_cross_encoder(model_name: str = RERANK_MODEL):
+    """Load a CPU cross-encoder once per process"""
+    from sentence_transformers import CrossEncoder
+    return CrossEncoder(model_name, device="cpu")
+
+class ScoreCache:
+    """Thread-safe LRU of cross-encoder scores keyed by (query, chunk)"""
+    def __init__(self, max_size: int = SCORE_CACHE_SIZE):
+        self.max_size = max_size
+        self._scores = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(query: str, text: str) -> str:
+        return hashlib.sha1(f"{query.strip().lower()}\x00{text}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[float]:
+        with self._lock:
+            score = self._scores.get(key)
+            if score is not None:
+                self._scores.move_to_end(key)
+            return score
+
+    def put(self, key: str, score: float):
+        with self._lock:
+            self._scores[key] = score
+            self._scores.move_to_end(key)
+            while len(self._scores) > self.max_size:
+                self._scores.popitem(last=False)
+
+SCORE_CACHE = ScoreCache()
+
+class FilteredSearch:
+    """Metadata-filtered FAISS search that applies the filter inside the index.
+
+    The docstore ids passing the filter become an IDSelector, so only those
+    vectors are scored: a selective filter neither comes back short nor
+    turns into a scan of the whole index. HNSW and IVF may still find fewer
+    than k selected vectors within their search breadth (efSearch / nprobe),
+    which is then widened fourfold per retry until k are found or the whole
+    graph / every list has been searched.
+    """
+    def __init__(self, vectorstore, search_filter):
+        self.vectorstore = vectorstore
+        self.search_filter = search_filter
+        self._ids = None
+        self._indexed = -1
+
+    def matching_ids(self):
+        """FAISS positions whose metadata passes the filter, recomputed only when vectors were added"""
+        import numpy as np
+
+        store = self.vectorstore
+        if self._indexed != store.index.ntotal:
+            passes = store._create_filter_func(self.search_filter)
+            self._ids = np.array([position for position, doc_id in store.index_to_docstore_id.items()
+                                  if passes(store.docstore.search(doc_id).metadata)], dtype="int64")
+            self._indexed = store.index.ntotal
+        return self._ids
+
+    def search(self, query: str, k: int) -> List[Document]:
+        import faiss
+        import numpy as np
+
+        store = self.vectorstore
+        index = store.index
+        ids = self.matching_ids()
+        limit = min(k, len(ids))
+        if not limit:
+            return []
+
+        vector = np.array([store._embed_query(query)], dtype="float32")
+        if store._normalize_L2:
+            faiss.normalize_L2(vector)
+        selector = faiss.IDSelectorBatch(len(ids), faiss.swig_ptr(ids))
+        if hasattr(index, "hnsw"):
+            params, breadth, widest = faiss.SearchParametersHNSW(), max(index.hnsw.efSearch, limit), index.ntotal
+        elif hasattr(index, "nprobe"):
+            params, breadth, widest = faiss.SearchParametersIVF(), index.nprobe, index.nlist
+        else:
+            params, breadth, widest = faiss.SearchParameters(), 0, 0
+        params.sel = selector
+
+        while True:
+            if hasattr(index, "hnsw"):
+                params.efSearch = breadth
+            elif hasattr(index, "nprobe"):
+                params.nprobe = breadth
+            _, positions = index.search(vector, limit, params=params)
+            found = [int(position) for position in positions[0] if position != -1]
+            if len(found) >= limit or breadth >= widest:
+                break
+            breadth = min(breadth * 4, widest)
+        return [store.docstore.search(store.index_to_docstore_id[position]) for position in found]
+
+class RerankingRetriever(BaseRetriever):
+    """Fetch fetch_k candidates from FAISS, re-rank with a cross-encoder, return the best k.
+
+    If scoring would overrun latency_budget_ms the vector-search order is
+    returned instead; scores computed so far stay cached for the next query.
+    """
+    vectorstore: Any
+    k: int = 3
+    fetch_k: int = RERANK_FETCH_K
+    latency_budget_ms: float = RERANK_BUDGET_MS
+    batch_size: int = RERANK_BATCH_SIZE
+    model_name: str = RERANK_MODEL
+    search_filter: Optional[Any] = None
+    filtered_search: Optional[Any] = None
+    stats: dict = {}
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        if self.filtered_search:
+            candidates = self.filtered_search.search(query, self.fetch_k)
+        else:
+            candidates = self.vectorstore.similarity_search(query, k=self.fetch_k)
+        if len(candidates) <= 1:
+            return candidates[:self.k]
+
+        model = load_cross_encoder(self.model_name)
+        keys = [ScoreCache.key(query, doc.page_content) for doc in candidates]
+        scores = [SCORE_CACHE.get(key) for key in keys]
+        pending = [i for i, score in enumerate(scores) if score is None]
+
+        started = time.time()
+        batch_seconds = 0.0
+        for start in range(0, len(pending), self.batch_size):
+            elapsed = time.time() - started
+            # Stop before a batch that would push us past the budget
+            if (elapsed + batch_seconds) * 1000 > self.latency_budget_ms:
+                self._record("fallback")
+                logger.info(f"Re-rank budget {self.latency_budget_ms}ms exceeded, using vector order")
+                return candidates[:self.k]
+            batch = pending[start:start + self.batch_size]
+            batch_started = time.time()
+            batch_scores = model.predict([(query, candidates[i].page_content) for i in batch],
+                                         batch_size=self.batch_size, show_progress_bar=False)
+            batch_seconds = time.time() - batch_started
+            for i, score in zip(batch, batch_scores):
+                scores[i] = float(score)
+                SCORE_CACHE.put(keys[i], scores[i])
+
+        self._record("reranked")
+        ranked = sorted(range(len(candidates)), key=lambda i: scores[i], reverse=True)
+        return [candidates[i] for i in ranked[:self.k]]
+
+    def _record(self, outcome: str):
+        self.stats[outcome] = self.stats.get(outcome, 0) + 1
+
+class FilteredRetriever(BaseRetriever):
+    """Plain vector search through a FilteredSearch, used when re-ranking is off"""
+    filtered_search: Any
+    k: int = 3
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        return self.filtered_search.search(query, self.k)
+
+def make_retriever(vectorstore, k: int = 3, search_filter=None):
+    """Two-stage re-ranking retriever, or plain vector search when disabled or unavailable.
+
+    search_filter is a FAISS metadata filter: a dict or a callable taking the metadata.
+    """
+    filtered_search = FilteredSearch(vectorstore, search_filter) if search_filter else None
+    if RERANK_ENABLED:
+        try:
+            # Load up front so the first query's budget is not spent on model loading
+            load_cross_encoder(RERANK_MODEL)
+            return RerankingRetriever(vectorstore=vectorstore, k=k, search_filter=search_filter,
+                                      filtered_search=filtered_search, stats={})
+        except Exception as e:
+            logger.warning(f"Cross-encoder unavailable, using vector order: {e}")
+    if filtered_search:
+        return FilteredRetriever(filtered_search=filtered_search, k=k)
+    return vectorstore.as_retriever(search_kwargs={"k": k})
@@ -0,0 +1,421 @@
+# site_crawler.py
+"""Website crawler core, free of Streamlit so it can run on any thread or headless.
+
+    python site_crawler.py https://example.com --max-pages 30 --depth 2
+
+Progress is published as CrawlEvents on a queue that the caller drains.
+"""
+import argparse
+import heapq
+import itertools
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+import requests
+from bs4 import BeautifulSoup
+
+from text_normalizer import normalize_node
+
+logger = logging.getLogger(__name__)
+
+CRAWL_WORKERS = int(os.environ.get("CRAWL_WORKERS", "5"))
+# Minimum gap between request starts; 0.1s matches the old ceiling of 10 pages per 1s batch pause
+CRAWL_REQUEST_INTERVAL = float(os.environ.get("CRAWL_REQUEST_INTERVAL", "0.1"))
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+INVALID_EXTENSIONS = ['.pdf', '.doc', '.docx', '.jpg', '.png', '.zip', '.exe']
+IMPORTANT_KEYWORDS = ['about', 'contact', 'services', 'products', 'blog', 'article', 'news']
+CONTENT_SELECTORS = [
+    'main', 'article', '.content', '#content', '.main-content',
+    '#main-content', '.post-content', '.entry-content',
+    '.article-content', '.blog-content', '.page-content',
+    '[role="main"]', '.main', '.body'
+]
+
+@dataclass
+class CrawlEvent:
+    kind: str  # main / page / skipped / failed / queued / log
+    url: str = ""
+    page: Optional[dict] = None
+    links: Optional[List[dict]] = None
+    message: str = ""
+    queued: int = 0
+    at: float = field(default_factory=time.time)
+
+def is_valid_url(url: str) -> bool:
+    """Enhanced URL validation"""
+    try:
+        result = urlparse(url)
+        if not all([result.scheme, result.netloc]):
+            return False
+
+        # Check for common file extensions to avoid non-HTML content
+        if any(url.lower().endswith(ext) for ext in INVALID_EXTENSIONS):
+            return False
+
+        return True
+    except:
+        return False
+
+def calculate_url_score(url: str, link_text: str = "") -> float:
+    """Calculate priority score for URL crawling"""
+    score = 0.0
+
+    # Penalize URLs with query parameters (likely dynamic content)
+    if '?' in url:
+        score -= 0.3
+
+    # Penalize long URLs
+    if len(url) > 100:
+        score -= 0.2
+
+    # Boost URLs with important keywords in path
+    if any(keyword in url.lower() for keyword in IMPORTANT_KEYWORDS):
+        score += 0.5
+
+    # Boost URLs with meaningful link text
+    if link_text:
+        text_length = len(link_text.strip())
+        if text_length > 10 and text_length < 100:
+            score += 0.3
+
+    return score
+
+def extract_links_with_scoring(soup, base_url: str) -> List[Dict]:
+    """Extract and score internal links"""
+    internal_links = set()
+    base_domain = urlparse(base_url).netloc
+
+    for link in soup.find_all('a', href=True):
+        href = link['href'].strip()
+        if not href or href.startswith(('javascript:', 'mailto:', 'tel:')):
+            continue
+
+        full_url = urljoin(base_url, href)
+
+        # Normalize URL
+        parsed = urlparse(full_url)
+        normalized_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+        if parsed.query:
+            normalized_url += '?' + parsed.query
+
+        # Check if it's an internal link and valid
+        if parsed.netloc == base_domain and is_valid_url(normalized_url):
+            link_text = link.get_text(strip=True)
+            score = calculate_url_score(normalized_url, link_text)
+
+            internal_links.add((normalized_url, score, link_text))
+
+    # Convert to list of dictionaries and sort by score
+    links_list = [{'url': url, 'score': score, 'link_text': text}
+                 for url, score, text in internal_links]
+    links_list.sort(key=lambda x: x['score'], reverse=True)
+
+    return links_list
+
+def extract_meaningful_content(soup) -> str:
+    """Advanced content extraction focusing on meaningful text"""
+    # Try priority content areas first
+    for selector in CONTENT_SELECTORS:
+        elements = soup.select(selector)
+        for element in elements:
+            text = normalize_node(element)
+            if len(text) > 200:  # Substantial content
+                return text
+
+    # Fallback: try to find the largest text block
+    body = soup.find('body')
+    if body:
+        # Remove navigation and other non-content elements
+        for unwanted in body.select('nav, header, footer, aside, .sidebar, .navigation'):
+            unwanted.decompose()
+
+        text = normalize_node(body)
+        if len(text) > 100:
+            return text
+
+    return normalize_node(soup)
+
+def generate_site_structure(website_data: Dict) -> Dict:
+    """Generate hierarchical site structure"""
+    structure = {
+        'main_page': website_data['main_url'],
+        'sections': {},
+        'page_count': website_data['total_pages'],
+        'depth': 1
+    }
+
+    # Group pages by path segments
+    for url in [website_data['main_url']] + list(website_data['pages'].keys()):
+        parsed = urlparse(url)
+        path_segments = [seg for seg in parsed.path.split('/') if seg]
+
+        current_level = structure['sections']
+        for segment in path_segments:
+            if segment not in current_level:
+                current_level[segment] = {'pages': [], 'subsections': {}}
+            current_level = current_level[segment]['subsections']
+
+    return structure
+
+def build_website_data(main_page: Dict, links: List[Dict], pages: Dict) -> Dict:
+    """Website data for the main page plus the pages crawled so far"""
+    total_pages = 1 + len(pages)
+    total_chars = len(main_page['content']) + sum(len(page.get('content', '')) for page in pages.values())
+    website_data = {
+        'main_url': main_page['url'],
+        'title': main_page['title'],
+        'meta_description': main_page['meta_description'],
+        'main_content': main_page['content'],
+        'links': links,
+        'pages': pages,
+        'structure': {},
+        'extraction_time': datetime.now().isoformat(),
+        'total_pages': total_pages,
+        'content_stats': {
+            'total_chars': total_chars,
+            'avg_content_length': total_chars / total_pages,
+            'pages_with_content': total_pages
+        }
+    }
+    website_data['structure'] = generate_site_structure(website_data)
+    return website_data
+
+class CrawlFrontier:
+    """Pending URLs (shallowest, then best scored first) and every URL ever claimed, behind one lock.
+
+    claim() checks and records a URL in one step, so a page is fetched at
+    most once however many threads discover it.
+    """
+    def __init__(self):
+        self._heap: List[tuple] = []
+        self._seen = set()
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+
+    def claim(self, url: str) -> bool:
+        with self._lock:
+            if url in self._seen:
+                return False
+            self._seen.add(url)
+            return True
+
+    def add(self, url: str, depth: int, score: float = 0.0) -> bool:
+        with self._lock:
+            if url in self._seen:
+                return False
+            self._seen.add(url)
+            heapq.heappush(self._heap, (depth, -score, next(self._order), url))
+            return True
+
+    def pop(self) -> Optional[Tuple[str, int]]:
+        with self._lock:
+            if not self._heap:
+                return None
+            depth, _, _, url = heapq.heappop(self._heap)
+            return url, depth
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._heap)
+
+class SiteCrawler:
+    """Crawls one site: the main page, then internal links up to max_pages and depth.
+
+    One instance per crawl. Fetching and parsing run on a worker pool and
+    results are collected only on the thread that called crawl(); the
+    frontier is shared with the workers and locked. Progress goes to
+    `events`; `checkpoint` is called between pages and may block (pause)
+    or raise (cancel).
+    """
+    def __init__(self, session: Optional[requests.Session] = None, max_workers: int = CRAWL_WORKERS,
+                 events: Optional[queue.Queue] = None, checkpoint: Optional[Callable[[], None]] = None,
+                 request_interval: float = CRAWL_REQUEST_INTERVAL):
+        if session is None:
+            session = requests.Session()
+            session.headers.update(REQUEST_HEADERS)
+        self.session = session
+        self.max_workers = max(max_workers, 1)
+        self.events = events if events is not None else queue.Queue()
+        self.checkpoint = checkpoint or (lambda: None)
+        self.request_interval = request_interval
+        self.frontier = CrawlFrontier()
+        self._next_request_at = 0.0
+
+    def publish(self, kind: str, url: str = "", **details):
+        self.events.put(CrawlEvent(kind, url, **details))
+
+    def fetch_page(self, url: str) -> Optional[Dict]:
+        """Extract content from a single page; None for non-HTML responses and redirects to a claimed URL"""
+        try:
+            response = self.session.get(url, timeout=15, allow_redirects=True)
+            response.raise_for_status()
+
+            # Two links that redirect to the same page must not both be kept
+            if response.url != url and not self.frontier.claim(response.url):
+                return None
+
+            # Check content type
+            content_type = response.headers.get('content-type', '').lower()
+            if 'text/html' not in content_type:
+                return None
+
+            soup = BeautifulSoup(response.content, 'html.parser')
+
+            # Remove unwanted elements
+            for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
+                element.decompose()
+
+            # Extract metadata
+            title = soup.title.string if soup.title else 'No title'
+            meta_desc = soup.find('meta', attrs={'name': 'description'})
+            meta_description = meta_desc.get('content', '') if meta_desc else ''
+
+            # Enhanced content extraction
+            content = extract_meaningful_content(soup)
+
+            return {
+                'url': url,
+                'title': title,
+                'meta_description': meta_description,
+                'content': content,
+                'raw_html': str(soup),
+                'content_length': len(content),
+                'bytes': len(response.content),
+                'status': 'success'
+            }
+
+        except Exception as e:
+            return {
+                'url': url,
+                'title': 'Error',
+                'meta_description': '',
+                'content': f'Error extracting content: {str(e)}',
+                'raw_html': '',
+                'content_length': 0,
+                'bytes': 0,
+                'status': 'error'
+            }
+
+    def crawl(self, url: str, max_pages: int = 50, depth: int = 2) -> Dict:
+        """Crawl the site and return its website data; raises on an invalid or non-HTML main page"""
+        if not is_valid_url(url):
+            raise ValueError("Invalid URL provided")
+        if not url.startswith(('http://', 'https://')):
+            url = 'https://' + url
+
+        self.publish("log", message=f"🚀 Starting extraction of up to {max_pages} pages from {url}...")
+        self.frontier.claim(url)
+        main_page = self.fetch_page(url)
+        if not main_page:
+            raise ValueError("Failed to extract main page content")
+        main_links = extract_links_with_scoring(BeautifulSoup(main_page['raw_html'], 'html.parser'), url)
+        self.publish("main", url, page=main_page, links=main_links)
+
+        pages = {}
+        try:
+            if max_pages > 1:
+                for link in main_links:
+                    self.frontier.add(link['url'], 1, link['score'])
+                pages = self._crawl_frontier(max_pages - 1, depth)
+        finally:
+            self.publish("queued", queued=0)
+        return build_website_data(main_page, main_links, pages)
+
+    def _throttle(self):
+        now = time.time()
+        if self._next_request_at > now:
+            time.sleep(self._next_request_at - now)
+        self._next_request_at = max(now, self._next_request_at) + self.request_interval
+
+    def _crawl_frontier(self, max_pages: int, depth: int) -> Dict:
+        pages = {}
+        in_flight = {}
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="site-crawl")
+        try:
+            while True:
+                self.checkpoint()
+                # Keep every worker busy without fetching more pages than can be kept
+                while len(in_flight) < self.max_workers and len(pages) + len(in_flight) < max_pages:
+                    next_url = self.frontier.pop()
+                    if next_url is None:
+                        break
+                    self._throttle()
+                    in_flight[executor.submit(self.fetch_page, next_url[0])] = next_url
+                self.publish("queued", queued=len(self.frontier) + len(in_flight))
+                if not in_flight:
+                    break
+
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    url, current_depth = in_flight.pop(future)
+                    try:
+                        page = future.result()
+                    except Exception as e:
+                        self.publish("failed", url, message=f"Failed to extract {url}: {str(e)}")
+                        continue
+                    if page is None:
+                        self.publish("skipped", url)
+                        continue
+                    self.publish("page", url, page=page)
+                    if not page['content']:
+                        continue
+                    pages[url] = page
+
+                    # Queue links for the next depth level
+                    if current_depth < depth and page['raw_html']:
+                        soup = BeautifulSoup(page['raw_html'], 'html.parser')
+                        for link in extract_links_with_scoring(soup, url):
+                            self.frontier.add(link['url'], current_depth + 1, link['score'])
+        finally:
+            # On cancel or error, do not wait for fetches still in flight
+            executor.shutdown(wait=False, cancel_futures=True)
+        return pages
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl a website headlessly and report progress")
+    parser.add_argument("url")
+    parser.add_argument("--max-pages", type=int, default=15)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=CRAWL_WORKERS)
+    parser.add_argument("--interval", type=float, default=CRAWL_REQUEST_INTERVAL, help="Seconds between request starts")
+    args = parser.parse_args()
+
+    crawler = SiteCrawler(max_workers=args.workers, request_interval=args.interval)
+    result = {}
+    started = time.time()
+    thread = threading.Thread(target=lambda: result.update(data=crawler.crawl(args.url, args.max_pages, args.depth)),
+                              daemon=True)
+    thread.start()
+    while thread.is_alive() or not crawler.events.empty():
+        try:
+            event = crawler.events.get(timeout=0.2)
+        except queue.Empty:
+            continue
+        if event.kind in ("main", "page"):
+            print(f"{event.page['status']:<8} {event.page['bytes']:>8} B  {event.url}")
+        elif event.kind in ("failed", "skipped", "log"):
+            print(f"{event.kind:<8} {event.message or event.url}")
+    if "data" in result:
+        data = result["data"]
+        elapsed = time.time() - started
+        print(f"\n{data['total_pages']} pages, {data['content_stats']['total_chars']:,} chars "
+              f"in {elapsed:.1f}s ({data['total_pages'] / elapsed:.1f} pages/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+# conftest.py
+import os
+import sys
+
+# The app modules live flat at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
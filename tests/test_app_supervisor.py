@@ -0,0 +1,78 @@
+# test_app_supervisor.py
+import threading
+
+import pytest
+
+import app_supervisor
+from app_supervisor import MAX_RESTARTS, AppSupervisor, PortRegistry
+
+class ExitedProcess:
+    pid = 0
+    returncode = 1
+
+    def poll(self):
+        return self.returncode
+
+def test_concurrent_allocations_get_distinct_ports(monkeypatch):
+    # Every port looks bindable, so only the registry keeps allocations apart
+    monkeypatch.setattr(app_supervisor, "port_is_free", lambda port: True)
+    registry = PortRegistry()
+    start = threading.Barrier(8)
+    ports = []
+
+    def allocate(i):
+        start.wait(5)
+        ports.append(registry.allocate(f"app-{i}", 8601))
+
+    threads = [threading.Thread(target=allocate, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert sorted(ports) == list(range(8601, 8609))
+    registry.release(8601)
+    assert registry.allocate("again", 8601) == 8601
+
+def test_full_range_falls_back_to_an_os_assigned_port(monkeypatch):
+    monkeypatch.setattr(app_supervisor, "port_is_free", lambda port: False)
+    ephemeral = iter([40001, 40002])
+    monkeypatch.setattr(app_supervisor, "get_ephemeral_port", lambda: next(ephemeral))
+    registry = PortRegistry()
+    assert registry.allocate("a", 8601) == 40001
+    # Already handed out, so the next OS-assigned port is used
+    assert registry.allocate("b", 8601) == 40002
+
+def test_ephemeral_port_is_bindable():
+    port = app_supervisor.get_ephemeral_port()
+    assert 0 < port < 65536
+
+@pytest.fixture
+def supervisor(monkeypatch):
+    spawned = []
+    monkeypatch.setattr(AppSupervisor, "_spawn", lambda self, app: spawned.append(app.name))
+    monkeypatch.setattr(AppSupervisor, "_monitor", lambda self: None)
+    monkeypatch.setattr(app_supervisor.atexit, "register", lambda fn: None)
+    supervisor = AppSupervisor({"web": ("website.py", 8601)}, ports=PortRegistry())
+    supervisor.spawned = spawned
+    return supervisor
+
+def test_crash_streak_resets_once_the_app_is_healthy(supervisor, monkeypatch):
+    app = supervisor.apps["web"]
+    app.process = ExitedProcess()
+    for _ in range(MAX_RESTARTS):
+        supervisor._handle_crash(app)
+    assert app.restarts == MAX_RESTARTS
+
+    monkeypatch.setattr(app_supervisor.requests, "get", lambda url, timeout: type("R", (), {"status_code": 200}))
+    supervisor._probe(app)
+    assert app.status == "running" and app.restarts == 0
+    supervisor._handle_crash(app)
+    assert app.restarts == 1 and len(supervisor.spawned) == MAX_RESTARTS + 1
+
+def test_crash_loop_stops_after_max_restarts(supervisor):
+    app = supervisor.apps["web"]
+    app.process = ExitedProcess()
+    for _ in range(MAX_RESTARTS + 1):
+        supervisor._handle_crash(app)
+    assert app.status == "crashed" and app.process is None
+    assert len(supervisor.spawned) == MAX_RESTARTS
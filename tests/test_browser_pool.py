@@ -0,0 +1,63 @@
+# test_browser_pool.py
+import time
+
+import pytest
+
+import let_deploy
+from let_deploy import WarmBrowserPool
+
+class FakeDriver:
+    def __init__(self, headless):
+        self.headless = headless
+        self.quit_calls = 0
+        self.closed = False
+
+    @property
+    def window_handles(self):
+        if self.closed:
+            raise RuntimeError("window closed")
+        return ["main"]
+
+    def quit(self):
+        self.quit_calls += 1
+
+@pytest.fixture
+def launches(monkeypatch):
+    launched = []
+
+    def launch_chrome(driver_path, headless):
+        launched.append(FakeDriver(headless))
+        return launched[-1], driver_path
+
+    monkeypatch.setattr(let_deploy, "launch_chrome", launch_chrome)
+    return launched
+
+def wait_for_idle(pool, count):
+    deadline = time.time() + 5
+    while pool._idle.qsize() < count and time.time() < deadline:
+        time.sleep(0.01)
+
+def test_warm_instances_use_the_pool_headless_setting(launches):
+    pool = WarmBrowserPool(size=1, driver_path="/bin/chromedriver", headless=True)
+    pool.refill()
+    wait_for_idle(pool, 1)
+    driver = pool.acquire("/bin/chromedriver")
+    assert driver.headless
+    assert driver is launches[0]
+    pool.shutdown()
+
+def test_released_and_dead_drivers_leave_the_pool(launches):
+    pool = WarmBrowserPool(size=1, driver_path="/bin/chromedriver")
+    pool.refill()
+    wait_for_idle(pool, 1)
+    launches[0].closed = True
+    driver = pool.acquire("/bin/chromedriver")
+    assert driver is not launches[0]
+    assert launches[0] not in pool._launched and launches[0].quit_calls == 1
+
+    pool.release(driver)
+    assert driver not in pool._launched and driver.quit_calls == 1
+    wait_for_idle(pool, 1)
+    pool.shutdown()
+    assert not pool._launched
+    assert all(driver.quit_calls == 1 for driver in launches)
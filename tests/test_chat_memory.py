@@ -0,0 +1,64 @@
+# test_chat_memory.py
+import threading
+import time
+
+import chat_memory
+from chat_memory import BoundedConversationMemory
+
+class FakeLLM:
+    model = "fake"
+
+    def __init__(self, fail=False, gate=None):
+        self.fail = fail
+        self.gate = gate
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        if self.gate:
+            self.gate.wait(5)
+        if self.fail:
+            raise RuntimeError("model down")
+        return "summary text"
+
+def _chat(memory, turns):
+    for i in range(turns):
+        memory.save_context({"question": f"question {i}"}, {"answer": f"answer {i}"})
+
+def _wait_idle(memory):
+    chat_memory._summary_executor.submit(lambda: None).result(5)
+    while memory._refreshing:
+        time.sleep(0.01)
+
+def test_private_state_is_initialised():
+    # Pydantic v1-based LangChain (< 0.3) left PrivateAttr defaults unresolved here
+    memory = BoundedConversationMemory(llm=FakeLLM(), output_key="answer")
+    with memory._lock:
+        assert memory._pending == [] and memory._generation == 0
+
+def test_overflow_is_summarised():
+    memory = BoundedConversationMemory(llm=FakeLLM(), window_turns=2, output_key="answer", return_messages=True)
+    _chat(memory, 4)
+    _wait_idle(memory)
+    assert memory.summary == "summary text"
+    assert len(memory.chat_memory.messages) == 4
+
+def test_failed_summary_keeps_pending_bounded():
+    memory = BoundedConversationMemory(llm=FakeLLM(fail=True), window_turns=1, output_key="answer", return_messages=True)
+    for i in range(40):
+        _chat(memory, 1)
+        _wait_idle(memory)
+    assert len(memory._pending) <= chat_memory.CHAT_MEMORY_MAX_PENDING
+    assert all(prompt.count("Human:") <= chat_memory.CHAT_MEMORY_MAX_PENDING for prompt in memory.llm.prompts)
+
+def test_refresh_finishing_after_clear_is_discarded():
+    gate = threading.Event()
+    memory = BoundedConversationMemory(llm=FakeLLM(gate=gate), window_turns=1, output_key="answer", return_messages=True)
+    _chat(memory, 2)
+    while not memory.llm.prompts:
+        time.sleep(0.01)
+    memory.clear()
+    gate.set()
+    _wait_idle(memory)
+    assert memory.summary == ""
+    assert memory._pending == []
@@ -0,0 +1,56 @@
+# test_embedding_pipeline.py
+import sys
+import types
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import FakeEmbeddings
+
+import embedding_pipeline
+from embedding_pipeline import build_vectorstore, load_embeddings
+from vector_index import describe_index
+
+def documents(n):
+    return (Document(page_content=f"chunk {i}", metadata={"i": i}) for i in range(n))
+
+def test_builds_in_batches_and_reports_progress():
+    progress = []
+    vectorstore, texts = build_vectorstore(documents(10), FakeEmbeddings(size=8), batch_size=4, total_hint=10,
+                                           progress_callback=lambda done, total, rate: progress.append((done, total)))
+    assert texts == [f"chunk {i}" for i in range(10)]
+    assert progress == [(4, 10), (8, 10), (10, 10)]
+    assert vectorstore.index.ntotal == 10
+    assert describe_index(vectorstore) == "Flat"
+    assert [vectorstore.docstore.search(doc_id).metadata["i"]
+            for doc_id in vectorstore.index_to_docstore_id.values()] == list(range(10))
+
+def test_empty_input_builds_nothing():
+    assert build_vectorstore(documents(0), FakeEmbeddings(size=8)) == (None, [])
+
+def test_producer_errors_reach_the_caller():
+    def broken():
+        yield Document(page_content="ok")
+        raise ValueError("bad post")
+
+    with pytest.raises(ValueError, match="bad post"):
+        build_vectorstore(broken(), FakeEmbeddings(size=8), batch_size=1)
+
+def test_too_small_for_ivfpq_falls_back_to_hnsw(monkeypatch):
+    monkeypatch.setenv("VECTOR_INDEX_TYPE", "ivfpq")
+    vectorstore, texts = build_vectorstore(documents(50), FakeEmbeddings(size=8), total_hint=50)
+    assert describe_index(vectorstore) == "HNSW"
+    assert vectorstore.index.ntotal == 50
+
+def test_cpu_threads_are_set_once_with_the_model(monkeypatch):
+    calls = []
+    fake_module = types.ModuleType("langchain_community.embeddings")
+    fake_module.HuggingFaceEmbeddings = lambda model_name: object()
+    monkeypatch.setitem(sys.modules, "langchain_community.embeddings", fake_module)
+    monkeypatch.setattr(embedding_pipeline, "use_all_cpu_cores", lambda: calls.append(1))
+    load_embeddings.cache_clear()
+    try:
+        assert load_embeddings("fake-model") is load_embeddings("fake-model")
+        build_vectorstore(documents(3), FakeEmbeddings(size=8))
+    finally:
+        load_embeddings.cache_clear()
+    assert calls == [1]
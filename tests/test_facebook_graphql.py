@@ -0,0 +1,60 @@
+# test_facebook_graphql.py
+import base64
+import json
+import os
+
+from facebook_graphql import GraphQLFeedCapture, decode_performance_entries, parse_graphql_payload, parse_har_file
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "facebook_group_feed.har")
+
+def _graphql_bodies():
+    with open(FIXTURE, encoding="utf-8") as f:
+        entries = json.load(f)["log"]["entries"]
+    return [entry["response"]["content"] for entry in entries if "/api/graphql" in entry["request"]["url"]]
+
+def test_parse_har_file_in_feed_order():
+    posts = parse_har_file(FIXTURE)
+    assert [post["post_id"] for post in posts] == ["111", "222", "333", "444"]
+
+def test_post_fields():
+    first = parse_har_file(FIXTURE)[0]
+    assert first["content"].startswith("Welcome to the group!")
+    assert first["author"] == "Alex Example"
+    assert first["permalink"] == "https://www.facebook.com/groups/example.group/posts/111/"
+    assert (first["reactions"], first["comments"], first["has_comments"]) == (12, 3, True)
+    assert first["created_at"] and first["source"] == "graphql"
+
+def test_shared_story_is_not_a_separate_post():
+    posts = {post["post_id"]: post for post in parse_har_file(FIXTURE)}
+    assert "999" not in posts
+    assert posts["222"]["author"] == "Sam Sample"
+    assert posts["222"]["shares"] == 2
+
+def test_bad_timestamp_keeps_the_post():
+    post = next(post for post in parse_har_file(FIXTURE) if post["post_id"] == "333")
+    assert post["created_at"] is None
+    assert post["timestamp"]
+
+def test_payload_with_prefix_and_ndjson():
+    body = base64.b64decode(_graphql_bodies()[1]["text"]).decode()
+    assert body.startswith("for (;;);")
+    assert [post["post_id"] for post in parse_graphql_payload(body)] == ["444"]
+
+def test_capture_survives_malformed_story():
+    malformed = json.dumps({"data": {"edges": [
+        {"node": {"__typename": "Story", "id": "1", "message": {"text": "x"}, "actors": 5}},
+        {"node": {"__typename": "Story", "id": "2", "message": {"text": "kept"}}},
+    ]}})
+
+    class Driver:
+        def execute_cdp_cmd(self, command, params):
+            return {"body": malformed, "base64Encoded": False}
+
+    capture = GraphQLFeedCapture(Driver())
+    log = [{"message": json.dumps({"message": message})} for message in (
+        {"method": "Network.responseReceived",
+         "params": {"requestId": "r1", "response": {"url": "https://www.facebook.com/api/graphql/"}}},
+        {"method": "Network.loadingFinished", "params": {"requestId": "r1"}},
+    )]
+    assert capture.process_events(decode_performance_entries(log)) == 1
+    assert "2" in capture.posts
@@ -0,0 +1,49 @@
+# test_linkedin_batch.py
+import os
+
+import pytest
+
+import linkedin_batch
+from linkedin_batch import BatchCheckpoint, load_url_file, run_batch
+
+class FailingSession:
+    closed = False
+
+    def get(self, url, timeout=None):
+        raise ConnectionError("offline")
+
+    def close(self):
+        self.closed = True
+
+def test_load_url_file_drops_duplicates_and_headers():
+    content = 'url,type\nhttps://www.linkedin.com/in/a/\n"https://www.linkedin.com/company/b/",x\nhttps://www.linkedin.com/in/a/\n'
+    assert load_url_file(content) == [("https://www.linkedin.com/in/a/", "profile"),
+                                      ("https://www.linkedin.com/company/b/", "company")]
+
+def test_checkpoint_dir_is_anchored_to_the_module():
+    if "LINKEDIN_CHECKPOINT_DIR" not in os.environ:
+        assert linkedin_batch.CHECKPOINT_DIR == os.path.join(
+            os.path.dirname(os.path.abspath(linkedin_batch.__file__)), "data", "linkedin_batch")
+
+def test_failed_fetches_are_checkpointed(tmp_path, monkeypatch):
+    session = FailingSession()
+    monkeypatch.setattr(linkedin_batch, "make_session", lambda workers: session)
+    urls = [(f"https://www.linkedin.com/in/user{i}/", "profile") for i in range(3)]
+    checkpoint = BatchCheckpoint.for_urls(urls, str(tmp_path))
+    assert run_batch(urls, checkpoint, fetch_workers=2, parse_workers=1, host_interval=0) == {"ok": 0, "failed": 3}
+    assert session.closed
+    assert BatchCheckpoint(checkpoint.path).counts() == {"ok": 0, "failed": 3}
+
+def test_aborted_batch_still_closes_the_session(tmp_path, monkeypatch):
+    session = FailingSession()
+    monkeypatch.setattr(linkedin_batch, "make_session", lambda workers: session)
+    urls = [(f"https://www.linkedin.com/in/user{i}/", "profile") for i in range(3)]
+
+    def stop_after_first(done, failed, total):
+        if done:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        run_batch(urls, BatchCheckpoint.for_urls(urls, str(tmp_path)), stop_after_first,
+                  fetch_workers=1, parse_workers=1, host_interval=0)
+    assert session.closed
@@ -0,0 +1,28 @@
+# test_linkedin_cache.py
+import os
+
+import pytest
+
+import linkdin_deploy
+from text_normalizer import FIXTURE_DIR
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+@pytest.fixture
+def pages(monkeypatch):
+    served = []
+    monkeypatch.setattr(linkdin_deploy, "fetch_linkedin_page", lambda url: served.pop(0))
+    linkdin_deploy.parse_linkedin_page.clear()
+    yield served
+    linkdin_deploy.parse_linkedin_page.clear()
+
+def test_failed_extraction_is_not_cached(pages):
+    url = "https://www.linkedin.com/in/jane-example/"
+    pages.extend(["<html><body></body></html>", read_fixture("profile_jane_example.html")])
+    assert linkdin_deploy.extract_linkedin_data(url, "profile") == "❌ No meaningful content found."
+    text = linkdin_deploy.extract_linkedin_data(url, "profile")
+    assert not text.startswith("❌")
+    # Cached now: no page left to serve
+    assert linkdin_deploy.extract_linkedin_data(url, "profile") == text
@@ -0,0 +1,60 @@
+# test_linkedin_parser.py
+import os
+
+import pytest
+
+from linkedin_parser import infer_data_type, parse_count, parse_linkedin_record, record_metadata
+from text_normalizer import FIXTURE_DIR
+
+def _parse(name, url, data_type):
+    with open(os.path.join(FIXTURE_DIR, name), encoding="utf-8") as f:
+        return parse_linkedin_record(f.read(), url, data_type)
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://www.linkedin.com/in/jane-example/", "profile"),
+    ("https://www.linkedin.com/company/example-analytics/", "company"),
+    ("https://www.linkedin.com/school/example-university/", "company"),
+    ("https://www.linkedin.com/posts/sam-sample_forecasting-activity-1/", "post"),
+    ("https://www.linkedin.com/pulse/some-article/", "post"),
+    ("https://www.linkedin.com/feed/", "profile"),
+])
+def test_infer_data_type(url, expected):
+    assert infer_data_type(url) == expected
+
+@pytest.mark.parametrize("value, expected", [(3400, 3400), ("12,345", 12345), ("1.2K", 1200), ("3M", 3000000),
+                                             ("", None), ("many", None)])
+def test_parse_count(value, expected):
+    assert parse_count(value) == expected
+
+def test_profile_from_jsonld_graph():
+    record = _parse("profile_jane_example.html", "https://www.linkedin.com/in/jane-example/", "profile")["record"]
+    assert record["record_type"] == "profile"
+    assert (record["name"], record["headline"], record["company"]) == \
+        ("Jane Example", "Staff Data Engineer", "Example Analytics")
+    assert record["location"] == "Lisbon, PT"
+    assert record["followers"] == 1234
+    assert record["description"] == "Experienced data engineer building streaming pipelines and analytics platforms."
+    assert record["source"] == "json-ld"
+
+def test_company_record():
+    parsed = _parse("company_example_analytics.html", "https://www.linkedin.com/company/example-analytics/", "company")
+    record = parsed["record"]
+    assert (record["industry"], record["size"]) == ("Software Development", "201-500 employees")
+    # Not in the JSON-LD: topped up from the description meta tag
+    assert record["followers"] == 48200
+    assert "Company size: 201-500 employees" in parsed["text"]
+    assert "description" not in record_metadata(record)
+
+def test_post_prefers_posting_over_embedded_author():
+    record = _parse("post_forecasting_engine.html",
+                    "https://www.linkedin.com/posts/sam-sample_forecasting-activity-1/", "post")["record"]
+    assert record["record_type"] == "post"
+    assert record["author"] == "Sam Sample"
+    assert (record["likes"], record["comments"]) == (312, 27)
+    assert record["date"] == "2024-03-05T09:30:00.000Z"
+
+def test_falls_back_to_sentence_blocks_without_metadata():
+    parsed = _parse("authwall_no_metadata.html", "https://www.linkedin.com/in/someone/", "profile")
+    assert parsed["record"] is None
+    assert "1. " in parsed["text"]
+    assert "Extracted 10 content blocks" in parsed["text"]
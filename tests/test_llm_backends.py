@@ -0,0 +1,67 @@
+# test_llm_backends.py
+import threading
+
+import pytest
+import requests
+
+import llm_backends
+from llm_backends import PromptBatcher, create_llm, run_stub_server
+
+@pytest.fixture(scope="module")
+def stub_url():
+    server = run_stub_server(port=0)
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+def test_stub_lists_the_configured_model(stub_url):
+    assert requests.get(f"{stub_url}/api/tags", timeout=5).json()["models"] == [{"name": llm_backends.OLLAMA_MODEL}]
+    assert requests.get(f"{stub_url}/api/ps", timeout=5).json() == {"models": []}
+    assert requests.get(f"{stub_url}/api/unknown", timeout=5).status_code == 404
+
+def test_stub_generate_echoes_prompt_tail(stub_url):
+    reply = requests.post(f"{stub_url}/api/generate", json={"model": "m", "prompt": " hello "}, timeout=5).json()
+    assert reply == {"model": "m", "response": "[stub] hello", "done": True}
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_ollama_backend_against_stub(stub_url, monkeypatch):
+    monkeypatch.setattr(llm_backends, "OLLAMA_BASE_URL", stub_url)
+    llm = create_llm("ollama", max_length=32)
+    assert llm.invoke("Question: what is the group about?") == "[stub] Question: what is the group about?"
+
+def test_create_llm_rejects_bad_config():
+    with pytest.raises(ValueError):
+        create_llm("hub", api_key=None)
+    with pytest.raises(ValueError):
+        create_llm("carrier-pigeon")
+
+class FakePipeline:
+    def __init__(self):
+        self.batches = []
+        self.release = threading.Event()
+
+    def __call__(self, prompts, batch_size, **kwargs):
+        self.release.wait(5)
+        self.batches.append(list(prompts))
+        # Causal-style output that echoes the prompt
+        return [[{"generated_text": f"{prompt} -> {prompt.upper()}"}] for prompt in prompts]
+
+def test_prompt_batcher_groups_concurrent_prompts():
+    pipe = FakePipeline()
+    batcher = PromptBatcher(pipe, max_batch=8, wait_ms=200)
+    results = {}
+    threads = [threading.Thread(target=lambda p=p: results.__setitem__(p, batcher.submit(p))) for p in "abcd"]
+    for thread in threads:
+        thread.start()
+    pipe.release.set()
+    for thread in threads:
+        thread.join(5)
+    assert results == {"a": "-> A", "b": "-> B", "c": "-> C", "d": "-> D"}
+    assert sum(len(batch) for batch in pipe.batches) == 4
+    assert len(pipe.batches) < 4
+
+def test_prompt_batcher_propagates_errors():
+    def broken(prompts, batch_size, **kwargs):
+        raise RuntimeError("out of memory")
+
+    with pytest.raises(RuntimeError, match="out of memory"):
+        PromptBatcher(broken, wait_ms=1).submit("x")
@@ -0,0 +1,113 @@
+# test_llm_broker.py
+import threading
+import time
+
+import pytest
+
+import llm_broker
+from llm_backends import LOCAL_MAX_BATCH, LOCAL_MODEL
+from llm_broker import BrokerBusyError, BrokerTimeoutError, LLMBroker, _parse_model_limits, chat_request_key
+
+def test_parse_model_limits():
+    assert _parse_model_limits("llama2=1, mistral=2,bad=x,noequals") == {"llama2": 1, "mistral": 2}
+
+def test_identical_requests_share_one_call():
+    broker = LLMBroker()
+    release = threading.Event()
+    calls = []
+
+    def generate():
+        calls.append(1)
+        release.wait(5)
+        return "answer"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(broker.submit("m", generate, key="k")))
+               for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    while broker.stats()["coalesced"] < 2:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert results == ["answer"] * 3
+    assert len(calls) == 1
+
+def test_full_queue_rejects():
+    broker = LLMBroker(max_queue=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def block():
+        started.set()
+        release.wait(5)
+
+    threading.Thread(target=broker.submit, args=("m", block)).start()
+    started.wait(5)
+    threading.Thread(target=broker.submit, args=("m", lambda: None)).start()
+    while broker.stats()["queued"] < 1:
+        time.sleep(0.01)
+    with pytest.raises(BrokerBusyError):
+        broker.submit("m", lambda: None)
+    release.set()
+
+def test_timed_out_request_is_not_joined_by_later_callers():
+    broker = LLMBroker()
+    release = threading.Event()
+    started = threading.Event()
+
+    def block():
+        started.set()
+        release.wait(5)
+
+    threading.Thread(target=broker.submit, args=("m", block)).start()
+    started.wait(5)
+    # Queued behind the blocking call, so it times out while still pending
+    with pytest.raises(BrokerTimeoutError):
+        broker.submit("m", lambda: "stale", key="k", timeout=0.05)
+
+    result = []
+    follower = threading.Thread(target=lambda: result.append(broker.submit("m", lambda: "fresh", key="k")))
+    follower.start()
+    release.set()
+    follower.join(5)
+    assert result == ["fresh"]
+
+def test_timeout_keeps_request_for_other_waiters():
+    broker = LLMBroker()
+    release = threading.Event()
+    calls = []
+
+    def generate():
+        calls.append(1)
+        release.wait(5)
+        return "answer"
+
+    result = []
+    patient = threading.Thread(target=lambda: result.append(broker.submit("m", generate, key="k")))
+    patient.start()
+    while not calls:
+        time.sleep(0.01)
+    with pytest.raises(BrokerTimeoutError):
+        broker.submit("m", generate, key="k", timeout=0.05)
+    release.set()
+    patient.join(5)
+    assert result == ["answer"]
+    assert len(calls) == 1
+
+def test_local_model_runs_a_batch_at_a_time(monkeypatch):
+    monkeypatch.setattr(llm_broker, "_broker", None)
+    monkeypatch.setenv("LLM_MODEL_CONCURRENCY", "llama2=2")
+    assert llm_broker.get_broker().model_limits == {LOCAL_MODEL: LOCAL_MAX_BATCH, "llama2": 2}
+    monkeypatch.setattr(llm_broker, "_broker", None)
+    monkeypatch.setenv("LLM_MODEL_CONCURRENCY", f"{LOCAL_MODEL}=3")
+    assert llm_broker.get_broker().model_limits == {LOCAL_MODEL: 3}
+
+def test_chat_keys_coalesce_within_a_session_only():
+    chain, other_chain = object(), object()
+    key = chat_request_key("m", chain, {"question": "hi"})
+    assert key == chat_request_key("m", chain, {"question": "hi"})
+    assert key != chat_request_key("m", chain, {"question": "hello"})
+    assert key != chat_request_key("m", other_chain, {"question": "hi"})
+    assert key != chat_request_key("other", chain, {"question": "hi"})
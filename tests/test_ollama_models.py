@@ -0,0 +1,66 @@
+# test_ollama_models.py
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import ollama_models
+from ollama_models import OllamaModelManager, OllamaStatusService
+
+GIB = 1024 ** 3
+
+def test_status_is_unknown_until_the_background_check(monkeypatch):
+    calls = []
+
+    def slow_get(url, timeout):
+        calls.append(url)
+        time.sleep(0.2)
+        raise ConnectionError("offline")
+
+    monkeypatch.setattr(ollama_models.requests, "get", slow_get)
+    service = OllamaStatusService("http://localhost:1", ttl=60)
+    assert service.snapshot()["running"] is None
+    deadline = time.time() + 5
+    while service.snapshot()["running"] is None and time.time() < deadline:
+        time.sleep(0.01)
+    assert service.snapshot()["running"] is False
+    assert calls == ["http://localhost:1/api/tags"]
+
+@pytest.mark.parametrize("base_url, expected", [
+    ("http://localhost:11434", ["llama2:latest"]),
+    ("http://gpu-box:11434", []),
+])
+def test_memory_heuristic_only_applies_to_local_servers(monkeypatch, base_url, expected):
+    monkeypatch.setattr(ollama_models.psutil, "virtual_memory", lambda: SimpleNamespace(available=GIB))
+    status = SimpleNamespace(base_url=base_url)
+    manager = OllamaModelManager(status, max_loaded=3)
+    manager.claim("other", "llama2")
+    resident = [{"name": "llama2:latest", "size": 4 * GIB, "expires_at": "1"}]
+    assert manager.eviction_risk("me", "mistral", resident, sizes={"mistral": 4 * GIB}) == expected
+
+def test_loaded_model_cap_applies_to_remote_servers():
+    manager = OllamaModelManager(SimpleNamespace(base_url="http://gpu-box:11434"), max_loaded=1)
+    manager.claim("other", "llama2")
+    resident = [{"name": "llama2:latest", "size": GIB, "expires_at": "1"}]
+    assert manager.eviction_risk("me", "mistral", resident, sizes={"mistral": GIB}) == ["llama2:latest"]
+
+class SessionState(dict):
+    __getattr__ = dict.__getitem__
+    __setattr__ = dict.__setitem__
+
+@pytest.fixture
+def session(monkeypatch):
+    manager = OllamaModelManager(SimpleNamespace(base_url="http://localhost:11434", snapshot=lambda: {"resident": [], "models": {}}))
+    monkeypatch.setattr(manager, "preload", lambda model: None)
+    fake_st = SimpleNamespace(session_state=SessionState(), caption=lambda text: None)
+    monkeypatch.setattr(ollama_models, "st", fake_st)
+    monkeypatch.setattr(ollama_models, "get_model_manager", lambda: manager)
+    return manager
+
+def test_claims_follow_the_selected_model_and_end_with_the_session(session):
+    ollama_models.render_model_lifecycle("llama2")
+    assert session._models_in_use() == {"llama2"}
+    ollama_models.render_model_lifecycle("mistral")
+    assert session._models_in_use() == {"mistral"}
+    ollama_models.release_session_model()
+    assert session._models_in_use() == set()
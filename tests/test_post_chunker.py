@@ -0,0 +1,38 @@
+# test_post_chunker.py
+from post_chunker import build_post_documents, iter_post_documents
+
+def make_group(*contents):
+    return {
+        "group_info": {"name": "Makers"},
+        "posts": [{"content": content, "author": "Ada", "post_id": f"p{i}", "reactions": i,
+                   "created_at": "2024-03-01T10:00:00"} for i, content in enumerate(contents)]
+    }
+
+def test_one_document_per_short_post():
+    documents = build_post_documents(make_group("First post about lathes.", "   ", "Second post about drills."))
+    assert documents[0].metadata == {"group": "Makers", "post_index": -1, "source": "group_info"}
+    assert "Total Posts Extracted: 3" in documents[0].page_content
+    posts = documents[1:]
+    assert [d.metadata["post_index"] for d in posts] == [0, 2]
+    assert posts[0].page_content.splitlines() == [
+        "Post 1 | Author: Ada | Posted: 2024-03-01 | Reactions: 0 | Has Comments: False",
+        "First post about lathes."
+    ]
+    assert posts[1].metadata["post_id"] == "p2"
+    assert posts[1].metadata["parts"] == 1
+
+def test_long_posts_split_without_crossing_post_boundaries():
+    long_post = " ".join(f"sentence{i} about milling machines." for i in range(200))
+    documents = build_post_documents(make_group(long_post, "Short follow-up."), chunk_size=500)
+    parts = [d for d in documents if d.metadata["post_index"] == 0]
+    assert len(parts) > 1
+    assert [d.metadata["part"] for d in parts] == list(range(len(parts)))
+    assert all(d.metadata["parts"] == len(parts) for d in parts)
+    assert all(len(d.page_content) <= 500 for d in parts)
+    assert all(d.page_content.startswith("Post 1 |") for d in parts)
+    assert not any("follow-up" in d.page_content for d in parts)
+
+def test_documents_are_produced_lazily():
+    documents = iter_post_documents(make_group("a" * 50))
+    assert next(documents).metadata["source"] == "group_info"
+    assert next(documents).metadata["post_index"] == 0
@@ -0,0 +1,35 @@
+# test_post_filter.py
+import pytest
+
+from post_filter import PostFilter, load_excluded_phrases
+
+FILLER = "this is a perfectly ordinary group post with enough words in it"
+
+@pytest.fixture
+def post_filter():
+    return PostFilter(["sign up", "login", "c++", ".net"])
+
+def test_shape_checks(post_filter):
+    assert post_filter.check("") == "empty"
+    assert post_filter.check("short") == "too_short"
+    assert post_filter.check("x" * 60) == "too_few_words"
+    assert post_filter.is_valid(FILLER)
+
+@pytest.mark.parametrize("phrase", ["Sign up", "LOGIN", "c++", ".NET"])
+def test_excluded_phrases_match(post_filter, phrase):
+    assert post_filter.check(f"{FILLER} {phrase} today") == f"excluded:{phrase.lower()}"
+
+def test_phrases_only_match_whole_words(post_filter):
+    assert post_filter.is_valid(f"{FILLER} about loginless flows and abc++ jokes")
+
+def test_check_batch_matches_check(post_filter):
+    texts = [FILLER, f"{FILLER} c++", "", f"login {FILLER}", f"{FILLER} .net"]
+    expected = [PostFilter(["sign up", "login", "c++", ".net"]).check(text) for text in texts]
+    assert post_filter.check_batch(texts) == expected
+    assert post_filter.rejection_report()["excluded:c++"] == 1
+
+def test_load_excluded_phrases(monkeypatch):
+    monkeypatch.delenv("POST_FILTER_PHRASES", raising=False)
+    assert load_excluded_phrases(["menu"]) == ["menu"]
+    monkeypatch.setenv("POST_FILTER_PHRASES", "c++, rust ,,")
+    assert load_excluded_phrases(["menu"]) == ["c++", "rust"]
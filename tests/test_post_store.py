@@ -0,0 +1,43 @@
+# test_post_store.py
+import pytest
+
+from post_store import PostStore, fts_query, make_group_id, make_post_id
+
+@pytest.fixture
+def store(tmp_path):
+    store = PostStore(str(tmp_path / "posts.db"))
+    yield store
+    store.close()
+
+def test_make_post_id_prefers_facebook_id_then_permalink_then_content():
+    assert make_post_id({"post_id": 42}) == "42"
+    assert make_post_id({"permalink": "https://www.facebook.com/groups/g/posts/123/"}) == "123"
+    by_url = make_post_id({"permalink": "https://m.facebook.com/groups/g/other/"})
+    assert by_url == make_post_id({"permalink": "https://www.facebook.com/groups/g/other"})
+    assert make_post_id({"content": "Hello  World"}) == make_post_id({"content": "hello world"})
+
+def test_make_group_id():
+    assert make_group_id("https://www.facebook.com/groups/python.dev/?ref=share") == "python.dev"
+    assert make_group_id("") == "unknown"
+
+def test_upsert_counts_inserts_and_updates(store):
+    posts = [{"post_id": "1", "content": "first", "reactions": 3}, {"post_id": "2", "content": "second"}]
+    assert store.upsert_posts("g", posts) == (2, 0)
+    assert store.upsert_posts("g", [{"post_id": "1", "content": "first", "reactions": 1}]) == (0, 1)
+    rows = list(store.iter_posts("g", batch_size=1))
+    assert [row["post_id"] for row in rows] == ["1", "2"]
+    assert rows[0]["reactions"] == 3
+
+def test_fts_query_quotes_every_token():
+    assert fts_query('c++ say "hi"') == '"c++" "say" """hi"""'
+
+@pytest.mark.parametrize("query", ["don't", "c++", 'say "hi', "NEAR(", "-minus"])
+def test_search_accepts_punctuation(store, query):
+    store.upsert_posts("g", [{"post_id": "1", "content": f"we talked about {query} today"}])
+    assert [row["post_id"] for row in store.search(query)] == ["1"]
+
+def test_search_filters_by_group(store):
+    store.upsert_posts("a", [{"post_id": "1", "content": "python jobs"}])
+    store.upsert_posts("b", [{"post_id": "2", "content": "python meetup"}])
+    assert [row["group_id"] for row in store.search("python", group_id="b")] == ["b"]
+    assert store.search("   ") == []
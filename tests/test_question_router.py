@@ -0,0 +1,52 @@
+# test_question_router.py
+from typing import Any, Dict, List
+
+import pytest
+from langchain.chains.base import Chain
+
+import question_router
+from question_router import RoutedQuestionGenerator, needs_condensation
+
+@pytest.mark.parametrize("question", [
+    "What are the most discussed topics in this group?",
+    "Which members post the most about hiring in the group?",
+    "Summarize the posts on this website about pricing",
+])
+def test_self_contained_questions(question):
+    assert not needs_condensation(question)
+
+@pytest.mark.parametrize("question", [
+    "Why?",
+    "Tell me more about it",
+    "What about the previous post?",
+    "Can you elaborate on those points please",
+])
+def test_follow_up_questions(question):
+    assert needs_condensation(question)
+
+class FakeCondenser(Chain):
+    calls: int = 0
+
+    @property
+    def input_keys(self) -> List[str]:
+        return ["question", "chat_history"]
+
+    @property
+    def output_keys(self) -> List[str]:
+        return ["text"]
+
+    def _call(self, inputs: Dict[str, Any], run_manager=None) -> Dict[str, str]:
+        self.calls += 1
+        return {"text": "standalone: " + inputs["question"]}
+
+def test_router_only_calls_condenser_for_follow_ups(monkeypatch):
+    monkeypatch.setattr(question_router, "CONDENSE_STATS", {"condensed": 0, "skipped": 0})
+    condenser = FakeCondenser()
+    router = RoutedQuestionGenerator(condenser=condenser)
+
+    self_contained = "Which members post the most about hiring in the group?"
+    assert router.invoke({"question": self_contained, "chat_history": "..."})["text"] == self_contained
+    assert router.invoke({"question": "Tell me more about it", "chat_history": "..."})["text"] == \
+        "standalone: Tell me more about it"
+    assert condenser.calls == 1
+    assert question_router.condense_skip_rate() == 0.5
@@ -0,0 +1,136 @@
+# test_reranker.py
+import time
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import Embeddings
+
+import reranker
+import vector_index
+from reranker import FilteredRetriever, FilteredSearch, RerankingRetriever, ScoreCache, make_retriever
+
+DIM = 16
+N_DOCS = 3000
+
+class LookupEmbeddings(Embeddings):
+    """Returns the stored vector of "doc-<i>" queries"""
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        return self.vectors[int(text.split("-")[1])].tolist()
+
+def build_store(index_type, vectors):
+    index = vector_index.create_index(index_type, DIM, len(vectors))
+    vector_index.train_index(index, vectors)
+    store = vector_index.empty_vectorstore(LookupEmbeddings(vectors), index)
+    store.add_embeddings([(f"doc-{i}", vector.tolist()) for i, vector in enumerate(vectors)],
+                         metadatas=[{"group": i % 100} for i in range(len(vectors))])
+    return store
+
+@pytest.fixture(scope="module")
+def vectors():
+    return np.random.default_rng(0).random((N_DOCS, DIM), dtype="float32")
+
+@pytest.mark.parametrize("index_type", vector_index.INDEX_TYPES)
+def test_selective_filter_returns_k_matches(vectors, index_type):
+    store = build_store(index_type, vectors)
+    search = FilteredSearch(store, {"group": 7})
+    docs = search.search("doc-7", 5)
+    assert len(docs) == 5
+    assert all(doc.metadata["group"] == 7 for doc in docs)
+    if index_type != "ivfpq":
+        assert docs[0].page_content == "doc-7"
+
+def test_flat_filter_matches_exhaustive_search(vectors):
+    store = build_store("flat", vectors)
+    search = FilteredSearch(store, lambda metadata: metadata["group"] < 3)
+    expected = [doc.page_content for doc in store.similarity_search("doc-1", k=4, filter={"group": [0, 1, 2]},
+                                                                    fetch_k=N_DOCS)]
+    assert [doc.page_content for doc in search.search("doc-1", 4)] == expected
+
+def test_search_caps_at_matching_documents(vectors):
+    store = build_store("flat", vectors[:200])
+    assert len(FilteredSearch(store, {"group": 5}).search("doc-5", 10)) == 2
+    assert FilteredSearch(store, {"group": 500}).search("doc-5", 10) == []
+
+def test_matching_ids_follow_added_vectors(vectors):
+    store = build_store("flat", vectors[:100])
+    search = FilteredSearch(store, {"group": 1})
+    assert search.matching_ids().tolist() == [1]
+    store.add_embeddings([("doc-101", vectors[101].tolist())], metadatas=[{"group": 1}])
+    assert search.matching_ids().tolist() == [1, 100]
+
+def test_make_retriever_filters_without_reranking(vectors, monkeypatch):
+    monkeypatch.setattr(reranker, "RERANK_ENABLED", False)
+    store = build_store("flat", vectors[:500])
+    retriever = make_retriever(store, k=3, search_filter={"group": 4})
+    assert isinstance(retriever, FilteredRetriever)
+    assert [doc.metadata["group"] for doc in retriever.invoke("doc-4")] == [4, 4, 4]
+
+class FakeCrossEncoder:
+    """Scores "doc-<i>" by i, an order unrelated to vector similarity"""
+    def __init__(self, seconds_per_batch=0.0):
+        self.seconds_per_batch = seconds_per_batch
+        self.batches = []
+
+    def predict(self, pairs, batch_size, show_progress_bar):
+        self.batches.append(len(pairs))
+        time.sleep(self.seconds_per_batch)
+        return [float(text.split("-")[1]) for _, text in pairs]
+
+@pytest.fixture
+def cross_encoder(monkeypatch):
+    model = FakeCrossEncoder()
+    monkeypatch.setattr(reranker, "load_cross_encoder", lambda name=None: model)
+    monkeypatch.setattr(reranker, "SCORE_CACHE", ScoreCache())
+    return model
+
+def vector_order(store, query, k):
+    return [doc.page_content for doc in store.similarity_search(query, k=k)]
+
+def test_candidates_are_reordered_by_the_cross_encoder(vectors, cross_encoder):
+    store = build_store("flat", vectors[:40])
+    retriever = RerankingRetriever(vectorstore=store, k=3, fetch_k=10, batch_size=4, stats={})
+    candidates = vector_order(store, "doc-5", 10)
+    expected = sorted(candidates, key=lambda text: int(text.split("-")[1]), reverse=True)[:3]
+    assert [doc.page_content for doc in retriever.invoke("doc-5")] == expected
+    assert cross_encoder.batches == [4, 4, 2]
+    assert retriever.stats == {"reranked": 1}
+
+    # Every pair is cached now, so the repeat never reaches the model
+    assert [doc.page_content for doc in retriever.invoke("doc-5")] == expected
+    assert cross_encoder.batches == [4, 4, 2]
+
+def test_over_budget_falls_back_to_vector_order(vectors, cross_encoder):
+    cross_encoder.seconds_per_batch = 0.05
+    store = build_store("flat", vectors[:40])
+    retriever = RerankingRetriever(vectorstore=store, k=3, fetch_k=10, batch_size=2, latency_budget_ms=60, stats={})
+    assert [doc.page_content for doc in retriever.invoke("doc-5")] == vector_order(store, "doc-5", 3)
+    assert retriever.stats == {"fallback": 1}
+    assert len(cross_encoder.batches) == 1
+    # The batch scored before giving up is kept for the next query
+    scored = vector_order(store, "doc-5", 2)
+    assert all(reranker.SCORE_CACHE.get(ScoreCache.key("doc-5", text)) is not None for text in scored)
+
+def test_filtered_candidates_are_reranked(vectors, cross_encoder, monkeypatch):
+    monkeypatch.setattr(reranker, "RERANK_ENABLED", True)
+    store = build_store("hnsw", vectors)
+    retriever = make_retriever(store, k=2, search_filter={"group": 3})
+    docs = retriever.invoke("doc-3")
+    assert isinstance(retriever, RerankingRetriever)
+    assert all(doc.metadata["group"] == 3 for doc in docs)
+    scores = [int(doc.page_content.split("-")[1]) for doc in docs]
+    assert scores == sorted(scores, reverse=True)
+
+def test_make_retriever_without_cross_encoder(vectors, monkeypatch):
+    def unavailable(name=None):
+        raise OSError("model not downloaded")
+
+    monkeypatch.setattr(reranker, "load_cross_encoder", unavailable)
+    retriever = make_retriever(build_store("flat", vectors[:50]), k=2)
+    assert not isinstance(retriever, RerankingRetriever)
+    assert len(retriever.invoke("doc-1")) == 2
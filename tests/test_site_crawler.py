@@ -0,0 +1,113 @@
+# test_site_crawler.py
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from crawl_jobs import CrawlCancelled, CrawlJob, CrawlJobManager
+from site_crawler import CrawlFrontier, SiteCrawler, calculate_url_score, is_valid_url
+
+ARTICLE = "<p>" + "Plenty of readable article text for the content extractor to keep. " * 5 + "</p>"
+PAGES = {
+    "/": "<a href='/about'>About us</a><a href='/blog'>Blog</a><a href='/old'>Old</a><a href='/older'>Older</a>",
+    "/about": "<a href='/about/team'>Team</a>",
+    "/blog": "",
+    "/about/team": "",
+    "/moved": "",
+}
+REDIRECTS = {"/old": "/moved", "/older": "/moved"}
+
+class SiteHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path in REDIRECTS:
+            self.send_response(302)
+            self.send_header("Location", REDIRECTS[self.path])
+            self.end_headers()
+            return
+        if self.path not in PAGES:
+            self.send_error(404)
+            return
+        body = f"<html><head><title>{self.path}</title></head><body><main>{ARTICLE}{PAGES[self.path]}</main></body></html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture(scope="module")
+def site():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SiteHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+def test_url_helpers():
+    assert is_valid_url("https://example.com/about")
+    assert not is_valid_url("https://example.com/brochure.pdf")
+    assert not is_valid_url("/relative/path")
+    assert calculate_url_score("https://example.com/about", "About our company") > \
+        calculate_url_score("https://example.com/x?page=2")
+
+def test_frontier_orders_by_depth_then_score_and_dedupes():
+    frontier = CrawlFrontier()
+    assert frontier.add("https://a/low", 1, 0.1)
+    assert frontier.add("https://a/deep", 2, 9.0)
+    assert frontier.add("https://a/high", 1, 0.8)
+    assert not frontier.add("https://a/high", 1, 5.0)
+    assert not frontier.claim("https://a/deep")
+    assert [frontier.pop() for _ in range(4)] == [("https://a/high", 1), ("https://a/low", 1), ("https://a/deep", 2), None]
+
+def test_frontier_claims_each_url_once_across_threads():
+    frontier = CrawlFrontier()
+    claimed = []
+    barrier = threading.Barrier(8)
+
+    def worker():
+        barrier.wait()
+        claimed.extend(url for url in (f"https://a/{i}" for i in range(200)) if frontier.claim(url))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(claimed) == sorted(f"https://a/{i}" for i in range(200))
+
+def test_crawl_follows_depth_and_keeps_one_copy_of_redirect_targets(site):
+    crawler = SiteCrawler(max_workers=3, request_interval=0)
+    data = crawler.crawl(site + "/", max_pages=10, depth=2)
+    paths = sorted(url[len(site):] for url in data["pages"])
+    assert [path for path in paths if path in ("/old", "/older")] in (["/old"], ["/older"])
+    assert {"/about", "/blog", "/about/team"} <= set(paths)
+    assert data["total_pages"] == 1 + len(data["pages"])
+
+def test_depth_one_skips_second_level(site):
+    data = SiteCrawler(request_interval=0).crawl(site + "/", max_pages=10, depth=1)
+    assert site + "/about/team" not in data["pages"]
+
+def test_job_counts_events_and_cancels(site):
+    manager = CrawlJobManager()
+    job = CrawlJob(site + "/", max_pages=10, depth=2)
+    done = threading.Event()
+
+    def run(job):
+        try:
+            SiteCrawler(events=job.events, checkpoint=job.checkpoint, request_interval=0).crawl(job.url, 10, 2)
+        finally:
+            done.set()
+
+    manager.start(job, run)
+    done.wait(10)
+    while job.active:
+        time.sleep(0.01)
+    snapshot = job.snapshot()
+    assert snapshot["status"] == "done"
+    assert snapshot["counters"]["fetched"] == 1 + len(job.partial()["pages"])
+
+    cancelled = CrawlJob(site + "/", max_pages=10, depth=2)
+    cancelled.cancel()
+    with pytest.raises(CrawlCancelled):
+        cancelled.checkpoint()
@@ -0,0 +1,43 @@
+# test_text_normalizer.py
+import glob
+import os
+from itertools import islice
+
+import pytest
+from bs4 import BeautifulSoup
+
+from text_normalizer import (FIXTURE_DIR, collapse_whitespace, iter_sentence_blocks, iter_words,
+                             legacy_sentence_blocks, normalize_node)
+
+FIXTURES = sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html")))
+
+def _read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+def test_fixtures_present():
+    assert FIXTURES
+
+def test_iter_words_joins_words_split_across_nodes():
+    assert list(iter_words(["Link", "edIn ", " rocks", "\n", "a", "b"])) == ["LinkedIn", "rocks", "ab"]
+
+@pytest.mark.parametrize("path", FIXTURES, ids=os.path.basename)
+def test_normalize_node_matches_get_text(path):
+    soup = BeautifulSoup(_read(path), "html.parser")
+    for tag in soup(["script", "style"]):
+        tag.decompose()
+    expected = collapse_whitespace(soup.get_text())
+    assert normalize_node(BeautifulSoup(_read(path), "html.parser")) == expected
+
+@pytest.mark.parametrize("path", FIXTURES, ids=os.path.basename)
+def test_sentence_blocks_match_legacy_extraction(path):
+    html = _read(path)
+    legacy = [collapse_whitespace(block) for block in legacy_sentence_blocks(html)]
+    assert list(iter_sentence_blocks(BeautifulSoup(html, "html.parser"))) == legacy
+
+def test_sentence_blocks_stop_early():
+    soup = BeautifulSoup(_read(FIXTURES[0]), "html.parser")
+    blocks = iter_sentence_blocks(soup)
+    assert len(list(islice(blocks, 2))) == 2
+    # The generator is suspended, not exhausted
+    assert next(blocks, None) is not None
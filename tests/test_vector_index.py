@@ -0,0 +1,63 @@
+# test_vector_index.py
+import numpy as np
+import pytest
+
+import vector_index
+from vector_index import (HNSW_MIN_VECTORS, IVFPQ_MIN_VECTORS, benchmark_index_types, choose_index_type, create_index,
+                          describe_index, ivfpq_training_size, train_index)
+
+@pytest.fixture
+def vectors():
+    return np.random.default_rng(1).random((3000, 16), dtype="float32")
+
+@pytest.mark.parametrize("n_vectors, expected", [
+    (0, "flat"),
+    (HNSW_MIN_VECTORS - 1, "flat"),
+    (HNSW_MIN_VECTORS, "hnsw"),
+    (IVFPQ_MIN_VECTORS - 1, "hnsw"),
+    (IVFPQ_MIN_VECTORS, "ivfpq"),
+])
+def test_index_type_follows_corpus_size(monkeypatch, n_vectors, expected):
+    monkeypatch.delenv("VECTOR_INDEX_TYPE", raising=False)
+    assert choose_index_type(n_vectors) == expected
+
+def test_forced_index_type(monkeypatch):
+    monkeypatch.setenv("VECTOR_INDEX_TYPE", "HNSW")
+    assert choose_index_type(10) == "hnsw"
+    monkeypatch.setenv("VECTOR_INDEX_TYPE", "unknown")
+    assert choose_index_type(10) == "flat"
+
+def test_created_indexes_are_configured():
+    hnsw = create_index("hnsw", 16, HNSW_MIN_VECTORS)
+    assert hnsw.hnsw.efSearch == vector_index.HNSW_EF_SEARCH
+    ivfpq = create_index("ivfpq", 16, IVFPQ_MIN_VECTORS)
+    assert ivfpq.nlist == vector_index._ivf_lists(IVFPQ_MIN_VECTORS)
+    assert ivfpq.nprobe == ivfpq.nlist // 16
+    assert not ivfpq.is_trained
+    assert create_index("flat", 16, 10).is_trained
+
+def test_ivfpq_training_size_covers_centroids_and_codebooks():
+    assert ivfpq_training_size(1000) == 40 * 2 ** vector_index.PQ_BITS
+    assert ivfpq_training_size(IVFPQ_MIN_VECTORS) == 40 * vector_index._ivf_lists(IVFPQ_MIN_VECTORS)
+
+def test_ivfpq_trains_and_searches(vectors):
+    index = create_index("ivfpq", 16, len(vectors))
+    train_index(index, vectors)
+    assert index.is_trained
+    index.add(vectors)
+    index.nprobe = index.nlist
+    _, neighbours = index.search(vectors[:20], 5)
+    assert sum(i in row for i, row in enumerate(neighbours)) >= 15
+    # Already trained: a second call is a no-op
+    train_index(index, vectors[:10])
+    assert index.ntotal == len(vectors)
+
+def test_describe_index():
+    store = type("Store", (), {"index": create_index("hnsw", 8, 10)})
+    assert describe_index(store) == "HNSW"
+
+def test_benchmark_skips_ivfpq_without_enough_training_data(vectors):
+    results = benchmark_index_types(vectors[:500], vectors[:10], k=3)
+    assert [r["index"] for r in results] == ["flat", "hnsw"]
+    assert results[0]["recall_at_k"] == 1.0
+    assert 0.0 <= results[1]["recall_at_k"] <= 1.0
@@ -0,0 +1,160 @@
+# vector_index.py
+import argparse
+import logging
+import math
+import os
+import time
+from typing import Dict, List, Optional
+
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+
+logger = logging.getLogger(__name__)
+
+# Corpus-size thresholds for automatic index selection
+HNSW_MIN_VECTORS = int(os.environ.get("HNSW_MIN_VECTORS", "20000"))
+IVFPQ_MIN_VECTORS = int(os.environ.get("IVFPQ_MIN_VECTORS", "200000"))
+INDEX_TYPES = ["flat", "hnsw", "ivfpq"]
+
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 64
+HNSW_EF_SEARCH = 64
+PQ_BITS = 8
+
+def choose_index_type(n_vectors: int) -> str:
+    """Flat for small corpora, HNSW for low latency, IVF-PQ for compact memory.
+
+    VECTOR_INDEX_TYPE forces a type for every corpus size.
+    """
+    forced = os.environ.get("VECTOR_INDEX_TYPE", "").lower()
+    if forced in INDEX_TYPES:
+        return forced
+    if n_vectors >= IVFPQ_MIN_VECTORS:
+        return "ivfpq"
+    if n_vectors >= HNSW_MIN_VECTORS:
+        return "hnsw"
+    return "flat"
+
+def _ivf_lists(n_vectors: int) -> int:
+    return max(1, int(4 * math.sqrt(n_vectors)))
+
+def _pq_subquantizers(dim: int) -> int:
+    for m in (64, 48, 32, 24, 16, 12, 8, 4, 2, 1):
+        if dim % m == 0 and dim // m >= 4:
+            return m
+    return 1
+
+def ivfpq_training_size(n_vectors: int) -> int:
+    """Sample size needed to train IVF centroids and PQ codebooks"""
+    return max(40 * _ivf_lists(n_vectors), 40 * (2 ** PQ_BITS))
+
+def create_index(index_type: str, dim: int, n_vectors: int):
+    if index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, HNSW_M)
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        index.hnsw.efSearch = HNSW_EF_SEARCH
+        return index
+    if index_type == "ivfpq":
+        nlist = _ivf_lists(n_vectors)
+        quantizer = faiss.IndexFlatL2(dim)
+        index = faiss.IndexIVFPQ(quantizer, dim, nlist, _pq_subquantizers(dim), PQ_BITS)
+        index.nprobe = max(1, nlist // 16)
+        return index
+    return faiss.IndexFlatL2(dim)
+
+def train_index(index, vectors: np.ndarray, seed: int = 0):
+    """Train on a random sample when the index needs it (IVF-PQ)"""
+    if index.is_trained:
+        return
+    sample_size = min(len(vectors), max(40 * getattr(index, "nlist", 1), 40 * (2 ** PQ_BITS)))
+    rng = np.random.default_rng(seed)
+    sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+    started = time.time()
+    index.train(np.ascontiguousarray(sample, dtype="float32"))
+    logger.info(f"Trained {type(index).__name__} on {sample_size} vectors in {time.time() - started:.1f}s")
+
+def empty_vectorstore(embeddings, index) -> FAISS:
+    """LangChain FAISS wrapper around a prebuilt (possibly trained) index"""
+    return FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=InMemoryDocstore(),
+        index_to_docstore_id={}
+    )
+
+def describe_index(vectorstore) -> str:
+    names = {"IndexFlatL2": "Flat", "IndexHNSWFlat": "HNSW", "IndexIVFPQ": "IVF-PQ"}
+    return names.get(type(vectorstore.index).__name__, type(vectorstore.index).__name__)
+
+def index_memory_bytes(index) -> int:
+    return int(faiss.serialize_index(index).nbytes)
+
+def benchmark_index_types(vectors: np.ndarray, queries: np.ndarray, k: int = 3,
+                          index_types: Optional[List[str]] = None) -> List[Dict]:
+    """Compare index types on recall@k against exact flat search, latency and memory"""
+    vectors = np.ascontiguousarray(vectors, dtype="float32")
+    queries = np.ascontiguousarray(queries, dtype="float32")
+    n_vectors, dim = vectors.shape
+    results = []
+    ground_truth = None
+
+    for index_type in index_types or INDEX_TYPES:
+        index = create_index(index_type, dim, n_vectors)
+        if not index.is_trained:
+            if n_vectors < ivfpq_training_size(n_vectors):
+                logger.warning(f"Skipping {index_type}: needs {ivfpq_training_size(n_vectors)} training vectors")
+                continue
+            train_index(index, vectors)
+
+        started = time.time()
+        index.add(vectors)
+        build_seconds = time.time() - started
+
+        started = time.time()
+        _, neighbours = index.search(queries, k)
+        latency_ms = (time.time() - started) * 1000 / len(queries)
+
+        if ground_truth is None:
+            if index_type == "flat":
+                ground_truth = neighbours
+            else:
+                exact = faiss.IndexFlatL2(dim)
+                exact.add(vectors)
+                _, ground_truth = exact.search(queries, k)
+        hits = sum(len(set(found) & set(expected)) for found, expected in zip(neighbours, ground_truth))
+
+        results.append({
+            "index": index_type,
+            "recall_at_k": round(hits / (len(queries) * k), 4),
+            "query_latency_ms": round(latency_ms, 3),
+            "build_seconds": round(build_seconds, 2),
+            "memory_mb": round(index_memory_bytes(index) / (1024 * 1024), 2)
+        })
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FAISS index types against the flat index")
+    parser.add_argument("--embeddings", help="Saved .npy matrix of embeddings (random vectors if omitted)")
+    parser.add_argument("--vectors", type=int, default=50000, help="Number of random vectors when no file is given")
+    parser.add_argument("--dim", type=int, default=384, help="Dimension of random vectors")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    if args.embeddings:
+        vectors = np.load(args.embeddings).astype("float32")
+    else:
+        vectors = rng.standard_normal((args.vectors, args.dim)).astype("float32")
+    queries = vectors[rng.choice(len(vectors), min(args.queries, len(vectors)), replace=False)]
+    queries = queries + rng.normal(0, 0.01, queries.shape).astype("float32")
+
+    print(f"{'index':<8}{'recall@' + str(args.k):>10}{'latency ms':>12}{'build s':>10}{'memory MB':>12}")
+    for row in benchmark_index_types(vectors, queries, args.k):
+        print(f"{row['index']:<8}{row['recall_at_k']:>10}{row['query_latency_ms']:>12}"
+              f"{row['build_seconds']:>10}{row['memory_mb']:>12}")
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,45 @@
 # website_chatbot_advanced.py
 import streamlit as st
 import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
-import re
 import time
-from typing import List, Dict, Tuple, Set
-import json
+from typing import List, Dict, Optional
 import hashlib
-import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
 import pandas as pd
-from datetime import datetime
 import os
+from crawl_jobs import CrawlJob, CrawlJobManager
+from site_crawler import SiteCrawler, build_website_data, is_valid_url
+from ollama_models import (DEFAULT_MODELS, OLLAMA_KEEP_ALIVE, get_model_manager, get_status_service,
+                           release_session_model, render_model_lifecycle)
+from llm_broker import PRIORITY_BULK, PRIORITY_INTERACTIVE, BrokerBusyError, BrokerTimeoutError, get_broker, render_queue_status
+
+# How often the crawl progress panel refreshes while a crawl runs
+CRAWL_POLL_SECONDS = float(os.environ.get("CRAWL_POLL_SECONDS", "1.0"))
 
 class AdvancedWebsiteChatbot:
+    """Summaries and Q&A over crawled website data; crawling lives in site_crawler"""
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        })
         self.extracted_data = {}
         self.chat_history = []
-        self.visited_urls = set()
-        self.url_scores = {}
-        self.content_cache = {}
+        self.model = 'llama2'
         
-    def call_ollama_api(self, prompt: str, model: str = 'llama2', max_retries: int = 3) -> str:
+    def call_ollama_api(self, prompt: str, model: str = None, max_retries: int = 3,
+                        priority: int = PRIORITY_INTERACTIVE) -> str:
+        """Ollama API call routed through the shared request broker"""
+        model = model or self.model
+        try:
+            # Identical prompts to the same model share one generation
+            return get_broker().submit(
+                model,
+                lambda: self._post_ollama_generate(prompt, model, max_retries),
+                key=(model, hashlib.sha1(prompt.encode()).hexdigest()),
+                priority=priority
+            )
+        except BrokerBusyError:
+            return "Error: The AI model is busy with other requests. Please try again shortly."
+        except BrokerTimeoutError:
+            return "Error: Request timeout. The AI model is taking too long to respond."
+
+    def _post_ollama_generate(self, prompt: str, model: str, max_retries: int) -> str:
         """Enhanced Ollama API call with retry logic and better error handling"""
         for attempt in range(max_retries):
             try:
@@ -42,6 +49,7 @@ class AdvancedWebsiteChatbot:
                         'model': model,
                         'prompt': prompt,
                         'stream': False,
+                        'keep_alive': OLLAMA_KEEP_ALIVE,
                         'options': {
                             'temperature': 0.3,
                             'top_p': 0.9,
@@ -72,319 +80,6 @@ class AdvancedWebsiteChatbot:
                 time.sleep(1)
         return "Error: Max retries exceeded"
 
-    def is_valid_url(self, url: str) -> bool:
-        """Enhanced URL validation"""
-        try:
-            result = urlparse(url)
-            if not all([result.scheme, result.netloc]):
-                return False
-            
-            # Check for common file extensions to avoid non-HTML content
-            invalid_extensions = ['.pdf', '.doc', '.docx', '.jpg', '.png', '.zip', '.exe']
-            if any(url.lower().endswith(ext) for ext in invalid_extensions):
-                return False
-                
-            return True
-        except:
-            return False
-
-    def calculate_url_score(self, url: str, link_text: str = "") -> float:
-        """Calculate priority score for URL crawling"""
-        score = 0.0
-        
-        # Penalize URLs with query parameters (likely dynamic content)
-        if '?' in url:
-            score -= 0.3
-            
-        # Penalize long URLs
-        if len(url) > 100:
-            score -= 0.2
-            
-        # Boost URLs with important keywords in path
-        important_keywords = ['about', 'contact', 'services', 'products', 'blog', 'article', 'news']
-        if any(keyword in url.lower() for keyword in important_keywords):
-            score += 0.5
-            
-        # Boost URLs with meaningful link text
-        if link_text:
-            text_length = len(link_text.strip())
-            if text_length > 10 and text_length < 100:
-                score += 0.3
-                
-        return score
-
-    def extract_website_content(self, url: str, max_pages: int = 50, depth: int = 2) -> Dict:
-        """Advanced website content extraction with multi-threading and intelligent crawling"""
-        try:
-            self.visited_urls.clear()
-            self.url_scores.clear()
-            self.content_cache.clear()
-            
-            # Validate and normalize URL
-            if not self.is_valid_url(url):
-                raise ValueError("Invalid URL provided")
-                
-            # Ensure URL has scheme
-            if not url.startswith(('http://', 'https://')):
-                url = 'https://' + url
-                
-            st.info(f"🚀 Starting extraction of up to {max_pages} pages from {url}...")
-            
-            # Extract main page first
-            main_content = self._extract_single_page(url)
-            if not main_content:
-                raise Exception("Failed to extract main page content")
-                
-            website_data = {
-                'main_url': url,
-                'title': main_content['title'],
-                'meta_description': main_content['meta_description'],
-                'main_content': main_content['content'],
-                'links': [],
-                'pages': {},
-                'structure': {},
-                'extraction_time': datetime.now().isoformat(),
-                'total_pages': 1,
-                'content_stats': {
-                    'total_chars': len(main_content['content']),
-                    'avg_content_length': len(main_content['content']),
-                    'pages_with_content': 1
-                }
-            }
-            
-            self.visited_urls.add(url)
-            
-            # Extract links from main page and score them
-            main_links = self._extract_links_with_scoring(BeautifulSoup(main_content['raw_html'], 'html.parser'), url)
-            website_data['links'] = main_links
-            
-            # Multi-threaded extraction of additional pages
-            if max_pages > 1:
-                additional_pages = self._crawl_additional_pages(main_links, max_pages - 1, depth)
-                website_data['pages'] = additional_pages
-                website_data['total_pages'] = 1 + len(additional_pages)
-                
-                # Calculate content statistics
-                total_chars = len(main_content['content'])
-                for page_content in additional_pages.values():
-                    total_chars += len(page_content.get('content', ''))
-                    
-                website_data['content_stats']['total_chars'] = total_chars
-                website_data['content_stats']['avg_content_length'] = total_chars / website_data['total_pages']
-                website_data['content_stats']['pages_with_content'] = website_data['total_pages']
-            
-            # Generate site structure
-            website_data['structure'] = self._generate_site_structure(website_data)
-            
-            return website_data
-            
-        except Exception as e:
-            st.error(f"Error extracting website content: {str(e)}")
-            return None
-
-    def _crawl_additional_pages(self, links: List[Dict], max_pages: int, depth: int) -> Dict:
-        """Crawl additional pages using multi-threading with depth control"""
-        pages = {}
-        urls_to_crawl = [(link['url'], 1) for link in links if link['url'] not in self.visited_urls]
-        
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            future_to_url = {}
-            
-            while urls_to_crawl and len(pages) < max_pages:
-                # Get next batch of URLs
-                current_batch = urls_to_crawl[:10]
-                urls_to_crawl = urls_to_crawl[10:]
-                
-                # Submit tasks
-                for url, current_depth in current_batch:
-                    if url not in self.visited_urls and len(pages) < max_pages:
-                        future = executor.submit(self._extract_single_page, url)
-                        future_to_url[future] = (url, current_depth)
-                
-                # Process completed tasks
-                for future in as_completed(future_to_url):
-                    url, current_depth = future_to_url[future]
-                    try:
-                        content = future.result(timeout=30)
-                        if content and content['content']:
-                            pages[url] = content
-                            self.visited_urls.add(url)
-                            
-                            # Extract links for next depth level if within limit
-                            if current_depth < depth and len(pages) < max_pages:
-                                soup = BeautifulSoup(content['raw_html'], 'html.parser')
-                                new_links = self._extract_links_with_scoring(soup, url)
-                                for link in new_links:
-                                    if link['url'] not in self.visited_urls and len(pages) + len(urls_to_crawl) < max_pages:
-                                        urls_to_crawl.append((link['url'], current_depth + 1))
-                        
-                    except Exception as e:
-                        st.warning(f"Failed to extract {url}: {str(e)}")
-                    
-                    # Remove processed future
-                    del future_to_url[future]
-                
-                # Be polite - delay between batches
-                time.sleep(1)
-        
-        return pages
-
-    def _extract_single_page(self, url: str) -> Dict:
-        """Extract content from a single page with enhanced error handling"""
-        try:
-            # Check cache first
-            url_hash = hashlib.md5(url.encode()).hexdigest()
-            if url_hash in self.content_cache:
-                return self.content_cache[url_hash]
-                
-            response = self.session.get(url, timeout=15, allow_redirects=True)
-            response.raise_for_status()
-            
-            # Check content type
-            content_type = response.headers.get('content-type', '').lower()
-            if 'text/html' not in content_type:
-                return None
-                
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove unwanted elements
-            for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
-                element.decompose()
-            
-            # Extract metadata
-            title = soup.title.string if soup.title else 'No title'
-            meta_desc = soup.find('meta', attrs={'name': 'description'})
-            meta_description = meta_desc.get('content', '') if meta_desc else ''
-            
-            # Enhanced content extraction
-            content = self._extract_meaningful_content(soup)
-            
-            result = {
-                'url': url,
-                'title': title,
-                'meta_description': meta_description,
-                'content': content,
-                'raw_html': str(soup),
-                'content_length': len(content),
-                'status': 'success'
-            }
-            
-            # Cache the result
-            self.content_cache[url_hash] = result
-            return result
-            
-        except Exception as e:
-            return {
-                'url': url,
-                'title': 'Error',
-                'meta_description': '',
-                'content': f'Error extracting content: {str(e)}',
-                'raw_html': '',
-                'content_length': 0,
-                'status': 'error'
-            }
-
-    def _extract_links_with_scoring(self, soup, base_url: str) -> List[Dict]:
-        """Extract and score internal links"""
-        internal_links = set()
-        base_domain = urlparse(base_url).netloc
-        
-        for link in soup.find_all('a', href=True):
-            href = link['href'].strip()
-            if not href or href.startswith(('javascript:', 'mailto:', 'tel:')):
-                continue
-                
-            full_url = urljoin(base_url, href)
-            
-            # Normalize URL
-            parsed = urlparse(full_url)
-            normalized_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-            if parsed.query:
-                normalized_url += '?' + parsed.query
-                
-            # Check if it's an internal link and valid
-            if (parsed.netloc == base_domain and 
-                self.is_valid_url(normalized_url) and
-                normalized_url not in self.visited_urls):
-                
-                link_text = link.get_text(strip=True)
-                score = self.calculate_url_score(normalized_url, link_text)
-                
-                internal_links.add((normalized_url, score, link_text))
-        
-        # Convert to list of dictionaries and sort by score
-        links_list = [{'url': url, 'score': score, 'link_text': text} 
-                     for url, score, text in internal_links]
-        links_list.sort(key=lambda x: x['score'], reverse=True)
-        
-        return links_list
-
-    def _extract_meaningful_content(self, soup) -> str:
-        """Advanced content extraction focusing on meaningful text"""
-        # Priority content areas
-        content_selectors = [
-            'main', 'article', '.content', '#content', '.main-content',
-            '#main-content', '.post-content', '.entry-content',
-            '.article-content', '.blog-content', '.page-content',
-            '[role="main"]', '.main', '.body'
-        ]
-        
-        # Try priority content areas first
-        for selector in content_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                text = self._clean_text(element.get_text())
-                if len(text) > 200:  # Substantial content
-                    return text
-        
-        # Fallback: try to find the largest text block
-        body = soup.find('body')
-        if body:
-            # Remove navigation and other non-content elements
-            for unwanted in body.select('nav, header, footer, aside, .sidebar, .navigation'):
-                unwanted.decompose()
-            
-            text = self._clean_text(body.get_text())
-            if len(text) > 100:
-                return text
-        
-        return self._clean_text(soup.get_text())
-
-    def _clean_text(self, text: str) -> str:
-        """Clean and normalize extracted text"""
-        # Replace multiple whitespaces with single space
-        text = re.sub(r'\s+', ' ', text)
-        # Remove leading/trailing whitespace
-        text = text.strip()
-        # Remove excessive line breaks
-        text = re.sub(r'\n\s*\n', '\n\n', text)
-        return text
-
-    def _generate_site_structure(self, website_data: Dict) -> Dict:
-        """Generate hierarchical site structure"""
-        structure = {
-            'main_page': website_data['main_url'],
-            'sections': {},
-            'page_count': website_data['total_pages'],
-            'depth': 1
-        }
-        
-        # Group pages by path segments
-        for url in [website_data['main_url']] + list(website_data['pages'].keys()):
-            parsed = urlparse(url)
-            path_segments = [seg for seg in parsed.path.split('/') if seg]
-            
-            current_level = structure['sections']
-            for segment in path_segments:
-                if segment not in current_level:
-                    current_level[segment] = {'pages': [], 'subsections': {}}
-                current_level = current_level[segment]['subsections']
-            
-            # Add page to appropriate section
-            # Implementation simplified for brevity
-            
-        return structure
-
     def summarize_website_content(self, website_data: Dict) -> str:
         """Create comprehensive summary with content analysis"""
         try:
@@ -425,7 +120,7 @@ class AdvancedWebsiteChatbot:
             Please provide a detailed, well-structured analysis.
             """
             
-            return self.call_ollama_api(prompt)
+            return self.call_ollama_api(prompt, priority=PRIORITY_BULK)
             
         except Exception as e:
             return f"Error generating summary: {str(e)}"
@@ -739,6 +434,7 @@ def main():
     
     # Initialize chatbot and session state
     initialize_session_state()
+    sync_crawl_job()
     
     # Sidebar
     render_sidebar(ollama_running)
@@ -746,13 +442,9 @@ def main():
     # Main content
     render_main_content(ollama_running)
 
-def check_ollama_status() -> bool:
-    """Check if Ollama is running"""
-    try:
-        response = requests.get('http://localhost:11434/api/tags', timeout=5)
-        return response.status_code == 200
-    except:
-        return False
+def check_ollama_status() -> Optional[bool]:
+    """Check if Ollama is running (cached snapshot, refreshed in the background; None until the first check)"""
+    return get_status_service().snapshot()["running"]
 
 def initialize_session_state():
     """Initialize session state variables"""
@@ -768,6 +460,10 @@ def initialize_session_state():
         st.session_state.extraction_progress = 0
     if 'current_status' not in st.session_state:
         st.session_state.current_status = "Ready"
+    if 'crawl_job_id' not in st.session_state:
+        st.session_state.crawl_job_id = None
+    if 'crawl_applied' not in st.session_state:
+        st.session_state.crawl_applied = None
 
 def render_sidebar(ollama_running: bool):
     """Render the sidebar content with dark theme"""
@@ -775,7 +471,9 @@ def render_sidebar(ollama_running: bool):
         st.markdown("### ⚙️ Configuration")
         
         # Ollama status
-        if ollama_running:
+        if ollama_running is None:
+            st.info("⏳ Checking Ollama...")
+        elif ollama_running:
             st.success("✅ Ollama is running")
         else:
             st.error("❌ Ollama not detected")
@@ -809,7 +507,7 @@ def render_sidebar(ollama_running: bool):
         
         if st.button("🚀 Extract & Analyze", use_container_width=True, type="primary"):
             if website_url:
-                if st.session_state.chatbot.is_valid_url(website_url):
+                if is_valid_url(website_url):
                     start_extraction(website_url, max_pages, crawl_depth, ollama_running)
                 else:
                     st.error("❌ Please enter a valid URL")
@@ -820,41 +518,116 @@ def render_sidebar(ollama_running: bool):
         render_status_panel(ollama_running)
         st.markdown("---")
         render_ai_models_panel()
+        st.markdown("---")
+        render_queue_status()
+
+@st.cache_resource
+def get_crawl_jobs() -> CrawlJobManager:
+    return CrawlJobManager()
+
+def run_crawl_job(chatbot: AdvancedWebsiteChatbot, job: CrawlJob, summarize: bool):
+    """Body of a crawl job thread: crawl, then summarize. No Streamlit calls in here."""
+    crawler = SiteCrawler(events=job.events, checkpoint=job.checkpoint)
+    website_data = crawler.crawl(job.url, job.max_pages, job.depth)
+    job.result = website_data
+    if summarize:
+        job.checkpoint()
+        job.status = "summarizing"
+        job.summary = chatbot.summarize_website_content(website_data)
 
 def start_extraction(url: str, max_pages: int, depth: int, ollama_running: bool):
-    """Start the website extraction process"""
-    with st.spinner("🔄 Starting extraction..."):
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        # Update progress
-        def update_progress(progress, status):
-            progress_bar.progress(progress)
-            status_text.text(f"Status: {status}")
-        
-        update_progress(10, "Initializing crawler...")
-        
-        # Extract website content
-        website_data = st.session_state.chatbot.extract_website_content(url, max_pages, depth)
-        
-        if website_data:
-            update_progress(80, "Processing extracted content...")
-            st.session_state.website_data = website_data
-            
-            # Generate summary if Ollama is running
-            if ollama_running:
-                update_progress(90, "Generating AI summary...")
-                st.session_state.summary = st.session_state.chatbot.summarize_website_content(website_data)
-            else:
-                st.session_state.summary = "⚠️ AI summary not available - Ollama is not running"
-            
-            update_progress(100, "Extraction completed!")
-            st.session_state.chat_history = []
-            st.success("✅ Website data extracted successfully!")
-            time.sleep(1)
+    """Start the website extraction as a background job and return to the page straight away"""
+    jobs = get_crawl_jobs()
+    previous = active_crawl_job()
+    if previous:
+        previous.cancel()
+    
+    chatbot = st.session_state.chatbot
+    job = jobs.start(CrawlJob(url, max_pages, depth), lambda job: run_crawl_job(chatbot, job, ollama_running))
+    
+    st.session_state.crawl_job_id = job.job_id
+    st.session_state.crawl_applied = None
+    st.session_state.website_data = None
+    st.session_state.summary = None
+    st.session_state.chat_history = []
+    st.rerun()
+
+def active_crawl_job():
+    """The session's crawl job while it is still running, else None"""
+    job = get_crawl_jobs().get(st.session_state.crawl_job_id)
+    return job if job and job.active else None
+
+def sync_crawl_job():
+    """Bring the session's crawl results into session state: partial while it runs, final once done"""
+    job = get_crawl_jobs().get(st.session_state.crawl_job_id)
+    if job is None or st.session_state.crawl_applied == job.job_id:
+        return
+    if job.status == "done":
+        st.session_state.website_data = job.result
+        st.session_state.summary = job.summary or "⚠️ AI summary not available - Ollama is not running"
+        st.session_state.crawl_applied = job.job_id
+        return
+    partial = job.partial()
+    if partial:
+        st.session_state.website_data = build_website_data(partial["main_page"], partial["links"], partial["pages"])
+    if not job.active:
+        # Cancelled or failed: keep whatever was crawled
+        st.session_state.crawl_applied = job.job_id
+
+def format_bytes(size: int) -> str:
+    return f"{size / 1024 / 1024:.1f} MB" if size >= 1024 * 1024 else f"{size / 1024:.0f} KB"
+
+@st.fragment(run_every=CRAWL_POLL_SECONDS)
+def render_crawl_progress():
+    """Live counters and controls of the running crawl, refreshed without rerunning the page"""
+    job = get_crawl_jobs().get(st.session_state.crawl_job_id)
+    if job is None:
+        return
+    if not job.active:
+        # Finished: rerun the whole page to pick up the results
+        st.rerun()
+    
+    snapshot = job.snapshot()
+    counters = snapshot["counters"]
+    st.markdown(f"### 🕷️ Crawl `{job.job_id}` · {snapshot['status']}")
+    done = counters["fetched"] + counters["failed"]
+    st.progress(min(done / job.max_pages, 1.0),
+                text=f"{done}/{job.max_pages} pages · {snapshot['elapsed']:.0f}s")
+    
+    col1, col2, col3, col4, col5 = st.columns(5)
+    col1.metric("Queued", counters["queued"])
+    col2.metric("Fetched", counters["fetched"])
+    col3.metric("Failed", counters["failed"])
+    col4.metric("Downloaded", format_bytes(counters["bytes"]))
+    col5.metric("Pages/s", f"{snapshot['pages_per_second']:.1f}")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if job.status == "paused":
+            if st.button("▶️ Resume", key="crawl_resume", use_container_width=True):
+                job.resume()
+                st.rerun(scope="fragment")
+        elif st.button("⏸️ Pause", key="crawl_pause", use_container_width=True, disabled=job.status != "running"):
+            job.pause()
+            st.rerun(scope="fragment")
+    with col2:
+        if st.button("⏹️ Cancel", key="crawl_cancel", use_container_width=True):
+            job.cancel()
+    with col3:
+        # Full rerun: summary, chat and analytics pick up the pages crawled so far
+        if st.button("🔄 Use pages so far", key="crawl_refresh", use_container_width=True):
             st.rerun()
-        else:
-            st.error("❌ Failed to extract website data")
+    
+    partial = job.partial()
+    if partial:
+        with st.expander(f"📄 Pages crawled so far ({1 + len(partial['pages'])})"):
+            rows = [partial["main_page"]] + list(partial["pages"].values())
+            st.dataframe(pd.DataFrame([{'Title': page['title'], 'URL': page['url'], 'Content Length': page['content_length'],
+                                        'Status': page['status']} for page in rows]),
+                         use_container_width=True, hide_index=True)
+    if snapshot["messages"]:
+        with st.expander("📜 Crawl log"):
+            st.text("\n".join(f"{at} {message}" for at, message in snapshot["messages"][-10:]))
 
 def render_status_panel(ollama_running: bool):
     """Render the status information panel with dark theme"""
@@ -901,8 +674,16 @@ def render_status_panel(ollama_running: bool):
 def render_ai_models_panel():
     """Render AI models information panel"""
     st.markdown("### 🧠 AI Models")
-    st.info("""
-    **Current Model:** LLaMA 2
+    installed = list(get_model_manager().model_sizes()) or DEFAULT_MODELS
+    current = st.session_state.chatbot.model
+    st.session_state.chatbot.model = st.selectbox(
+        "Select AI Model",
+        installed,
+        index=installed.index(current) if current in installed else 0
+    )
+    render_model_lifecycle(st.session_state.chatbot.model)
+    st.info(f"""
+    **Current Model:** {st.session_state.chatbot.model}
     **Capabilities:**
     - Website summarization
     - Intelligent Q&A
@@ -911,14 +692,25 @@ def render_ai_models_panel():
     """)
 
 def reset_extraction():
-    """Reset the extraction state"""
+    """Reset the extraction state, cancelling a crawl still in progress"""
+    job = active_crawl_job()
+    if job:
+        job.cancel()
+    st.session_state.crawl_job_id = None
     st.session_state.website_data = None
     st.session_state.summary = None
     st.session_state.chat_history = []
+    release_session_model()
     st.rerun()
 
 def render_main_content(ollama_running: bool):
     """Render the main content area with dark theme"""
+    job = get_crawl_jobs().get(st.session_state.crawl_job_id)
+    if job and job.active:
+        render_crawl_progress()
+    elif job and job.status == "failed":
+        st.error(f"❌ Failed to extract website data: {job.error}")
+    
     col1, col2 = st.columns([1, 1])
     
     with col1:
@@ -951,6 +743,8 @@ def render_summary_panel():
         st.markdown("#### 🤖 AI Analysis")
         if st.session_state.summary:
             st.write(st.session_state.summary)
+        elif active_crawl_job():
+            st.info("⏳ Crawl in progress - the AI analysis is generated once it finishes. You can already chat about the pages crawled so far.")
         else:
             st.info("No AI analysis available. Content extraction completed successfully.")
         